@@ -159,6 +159,12 @@ import os
 # -----BEGIN PUBLIC KEY-----
 CLERK_PEM_PUBLIC_KEY = os.environ.get("CLERK_PEM_PUBLIC_KEY", "")
 
+# Clerk JWKS endpoint, e.g. https://<your-frontend-api>/.well-known/jwks.json
+# When set, signing keys are fetched from it (and cached) by the token's
+# key ID, so key rotations need no redeploy; CLERK_PEM_PUBLIC_KEY is then
+# not used
+CLERK_JWKS_URL = os.environ.get("CLERK_JWKS_URL", "")
+
 # Authorized parties (frontend URLs that are allowed to make requests)
 # This validates the 'azp' claim in the JWT
 # Set as comma-separated string in environment, e.g.: "http://localhost:3000,https://yourdomain.com"
@@ -137,6 +137,98 @@ CREATE POLICY "Allow authenticated update on product_compat"
     ON product_compat FOR UPDATE 
     USING (true);
 
+-- =====================================================
+-- ADMIN: MISSING COMPATIBILITY FIELDS
+-- =====================================================
+-- Required fields per component type (mirrors REQUIRED_FIELDS in
+-- rigadmin/compat_service.py):
+--   cpu: cpu_socket; motherboard: mobo_socket, memory_type;
+--   ram: memory_type, memory_max_speed_mhz
+
+-- Partial indexes holding only the rows missing a required field. Most
+-- records are complete, so these stay small and the missing-field counts
+-- and lists read them instead of scanning product_compat.
+CREATE INDEX IF NOT EXISTS idx_missing_cpu_socket
+    ON product_compat(component_type)
+    WHERE component_type = 'cpu' AND cpu_socket IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_missing_mobo_socket
+    ON product_compat(component_type)
+    WHERE component_type = 'motherboard' AND mobo_socket IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_missing_memory_type
+    ON product_compat(component_type)
+    WHERE component_type IN ('motherboard', 'ram') AND memory_type IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_missing_memory_speed
+    ON product_compat(component_type)
+    WHERE component_type = 'ram' AND memory_max_speed_mhz IS NULL;
+
+-- Records missing at least one required field, per type. Each count is
+-- answered from the partial indexes above (OR'd for two-field types).
+-- Called via supabase.rpc('admin_missing_compat_counts').
+CREATE OR REPLACE FUNCTION admin_missing_compat_counts()
+RETURNS TABLE (cpu BIGINT, motherboard BIGINT, ram BIGINT)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        (SELECT COUNT(*) FROM product_compat
+          WHERE component_type = 'cpu' AND cpu_socket IS NULL),
+        (SELECT COUNT(*) FROM product_compat
+          WHERE component_type = 'motherboard'
+            AND (mobo_socket IS NULL OR memory_type IS NULL)),
+        (SELECT COUNT(*) FROM product_compat
+          WHERE component_type = 'ram'
+            AND (memory_type IS NULL OR memory_max_speed_mhz IS NULL));
+$$;
+
+-- Records missing at least one required field, with the product columns
+-- the admin list shows and which fields are missing. Queried through
+-- PostgREST like a table, so filtering, ordering, pagination and the
+-- total count all happen in the database.
+CREATE OR REPLACE VIEW admin_missing_compat
+WITH (security_invoker = true)
+AS
+SELECT
+    pc.id,
+    pc.product_id,
+    pc.component_type,
+    pc.cpu_socket,
+    pc.mobo_socket,
+    pc.memory_type,
+    pc.memory_max_speed_mhz,
+    pc.confidence,
+    pc.extraction_source,
+    p.name AS product_name,
+    p.brand AS product_brand,
+    p.category AS product_category,
+    p.image_url AS product_image_url,
+    m.missing_fields,
+    cardinality(m.missing_fields) AS missing_count
+FROM product_compat pc
+LEFT JOIN products p ON p.id = pc.product_id
+CROSS JOIN LATERAL (
+    SELECT array_remove(
+        CASE pc.component_type
+            WHEN 'cpu' THEN ARRAY[
+                CASE WHEN pc.cpu_socket IS NULL THEN 'cpu_socket' END
+            ]
+            WHEN 'motherboard' THEN ARRAY[
+                CASE WHEN pc.mobo_socket IS NULL THEN 'mobo_socket' END,
+                CASE WHEN pc.memory_type IS NULL THEN 'memory_type' END
+            ]
+            WHEN 'ram' THEN ARRAY[
+                CASE WHEN pc.memory_type IS NULL THEN 'memory_type' END,
+                CASE WHEN pc.memory_max_speed_mhz IS NULL THEN 'memory_max_speed_mhz' END
+            ]
+            ELSE ARRAY[]::TEXT[]
+        END,
+        NULL
+    ) AS missing_fields
+) m
+WHERE cardinality(m.missing_fields) > 0;
+
 -- =====================================================
 -- COMMENTS
 -- =====================================================
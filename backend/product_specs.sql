@@ -56,3 +56,235 @@ CREATE POLICY "Allow authenticated insert on product_specs"
 CREATE POLICY "Allow authenticated update on product_specs" 
     ON product_specs FOR UPDATE 
     USING (true);
+
+-- =====================================================
+-- BATCH INGESTION FUNCTION
+-- =====================================================
+-- Writes a chunk of scraped items (products, prices and specs) in one
+-- call and one transaction: either the whole chunk lands or none of it.
+-- Callers send large batches as several calls, and each call commits on
+-- its own.
+-- Called via supabase.rpc('ingest_products_atomic', {'items': [...]}).
+--
+-- Each item: {
+--   "product": {name, slug, category, category_slug, brand, image_url},
+--   "price": {retailer_id, price, currency, product_url, in_stock},
+--   "specs": {...} | null,
+--   "specs_source_url": text | null
+-- }
+-- When several items share a slug / product URL, the last one wins.
+-- Returns the product URL and product ID of every price row written.
+
+CREATE OR REPLACE FUNCTION ingest_products_atomic(items JSONB)
+RETURNS TABLE (ingested_url TEXT, ingested_product_id UUID)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO products (name, slug, category, category_slug, brand, image_url)
+    SELECT DISTINCT ON (t.item->'product'->>'slug')
+        t.item->'product'->>'name',
+        t.item->'product'->>'slug',
+        t.item->'product'->>'category',
+        t.item->'product'->>'category_slug',
+        t.item->'product'->>'brand',
+        t.item->'product'->>'image_url'
+    FROM jsonb_array_elements(items) WITH ORDINALITY AS t(item, pos)
+    ORDER BY t.item->'product'->>'slug', t.pos DESC
+    ON CONFLICT (slug) DO UPDATE SET
+        name = EXCLUDED.name,
+        category = EXCLUDED.category,
+        category_slug = EXCLUDED.category_slug,
+        brand = EXCLUDED.brand,
+        image_url = EXCLUDED.image_url;
+
+    INSERT INTO product_prices (
+        product_id, retailer_id, price, currency, product_url, in_stock, last_scraped_at
+    )
+    SELECT DISTINCT ON (t.item->'price'->>'product_url')
+        p.id,
+        (t.item->'price'->>'retailer_id')::UUID,
+        (t.item->'price'->>'price')::DECIMAL(12, 2),
+        COALESCE(t.item->'price'->>'currency', 'BDT'),
+        t.item->'price'->>'product_url',
+        COALESCE((t.item->'price'->>'in_stock')::BOOLEAN, true),
+        NOW()
+    FROM jsonb_array_elements(items) WITH ORDINALITY AS t(item, pos)
+    JOIN products p ON p.slug = t.item->'product'->>'slug'
+    ORDER BY t.item->'price'->>'product_url', t.pos DESC
+    ON CONFLICT (product_url) DO UPDATE SET
+        product_id = EXCLUDED.product_id,
+        retailer_id = EXCLUDED.retailer_id,
+        price = EXCLUDED.price,
+        currency = EXCLUDED.currency,
+        in_stock = EXCLUDED.in_stock,
+        last_scraped_at = EXCLUDED.last_scraped_at;
+
+    INSERT INTO product_specs (product_id, specs, source_url, updated_at)
+    SELECT DISTINCT ON (p.id)
+        p.id,
+        t.item->'specs',
+        t.item->>'specs_source_url',
+        NOW()
+    FROM jsonb_array_elements(items) WITH ORDINALITY AS t(item, pos)
+    JOIN products p ON p.slug = t.item->'product'->>'slug'
+    WHERE jsonb_typeof(t.item->'specs') = 'object'
+      AND t.item->'specs' <> '{}'::JSONB
+    ORDER BY p.id, t.pos DESC
+    ON CONFLICT (product_id) DO UPDATE SET
+        specs = EXCLUDED.specs,
+        source_url = EXCLUDED.source_url,
+        updated_at = EXCLUDED.updated_at;
+
+    RETURN QUERY
+    SELECT pp.product_url, pp.product_id
+    FROM product_prices pp
+    WHERE pp.product_url IN (
+        SELECT t.item->'price'->>'product_url'
+        FROM jsonb_array_elements(items) AS t(item)
+    );
+END;
+$$;
+
+-- =====================================================
+-- ADMIN PRODUCT CREATION FUNCTION
+-- =====================================================
+-- Creates a product from the admin panel with its first retailer price
+-- and optional specs, in one call and one transaction. If a product with
+-- the same slug exists, the price (and specs) are added to it instead.
+-- Called via supabase.rpc('admin_create_product', {...}).
+--
+-- p_product: {name, slug, category, category_slug, brand, image_url}
+-- p_price:   {retailer_id, price, currency, product_url, in_stock}
+-- p_specs:   {...} | null (replaces existing specs when non-empty)
+--
+-- Returns {"status": ..., "product": {...}} where status is one of
+-- 'created', 'added_to_existing', 'retailer_not_found' or
+-- 'duplicate_retailer' (the product already has a price from this
+-- retailer); the last two carry no product and write nothing.
+
+CREATE OR REPLACE FUNCTION admin_create_product(
+    p_product JSONB,
+    p_price JSONB,
+    p_specs JSONB DEFAULT NULL
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_retailer_id UUID := (p_price->>'retailer_id')::UUID;
+    v_product products%ROWTYPE;
+    v_status TEXT := 'created';
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM retailers WHERE id = v_retailer_id) THEN
+        RETURN jsonb_build_object('status', 'retailer_not_found');
+    END IF;
+
+    SELECT * INTO v_product FROM products WHERE slug = p_product->>'slug';
+
+    IF FOUND THEN
+        IF EXISTS (
+            SELECT 1 FROM product_prices
+            WHERE product_id = v_product.id AND retailer_id = v_retailer_id
+        ) THEN
+            RETURN jsonb_build_object('status', 'duplicate_retailer');
+        END IF;
+        v_status := 'added_to_existing';
+    ELSE
+        INSERT INTO products (name, slug, category, category_slug, brand, image_url)
+        VALUES (
+            p_product->>'name',
+            p_product->>'slug',
+            p_product->>'category',
+            p_product->>'category_slug',
+            p_product->>'brand',
+            p_product->>'image_url'
+        )
+        RETURNING * INTO v_product;
+    END IF;
+
+    INSERT INTO product_prices (
+        product_id, retailer_id, price, currency, product_url, in_stock
+    )
+    VALUES (
+        v_product.id,
+        v_retailer_id,
+        (p_price->>'price')::DECIMAL(12, 2),
+        COALESCE(p_price->>'currency', 'BDT'),
+        p_price->>'product_url',
+        COALESCE((p_price->>'in_stock')::BOOLEAN, true)
+    );
+
+    IF jsonb_typeof(p_specs) = 'object' AND p_specs <> '{}'::JSONB THEN
+        INSERT INTO product_specs (product_id, specs, updated_at)
+        VALUES (v_product.id, p_specs, NOW())
+        ON CONFLICT (product_id) DO UPDATE SET
+            specs = EXCLUDED.specs,
+            source_url = NULL,
+            updated_at = EXCLUDED.updated_at;
+    END IF;
+
+    RETURN jsonb_build_object('status', v_status, 'product', to_jsonb(v_product));
+END;
+$$;
+
+-- =====================================================
+-- ADMIN BULK PRODUCT CREATION FUNCTION
+-- =====================================================
+-- Creates a batch of new products from the admin panel, each with its
+-- first retailer price and optional specs, in one call and one
+-- transaction. Products are plain inserts: an existing slug or product
+-- URL fails the whole batch instead of updating another product.
+-- Called via supabase.rpc('admin_bulk_create_products', {'p_items': [...]}).
+--
+-- Each item: {
+--   "product": {name, slug, category, category_slug, brand, image_url},
+--   "price": {retailer_id, price, currency, product_url, in_stock},
+--   "specs": {...} | null
+-- }
+-- Slugs and product URLs must be unique within the batch.
+-- Returns the created product rows.
+
+CREATE OR REPLACE FUNCTION admin_bulk_create_products(p_items JSONB)
+RETURNS SETOF products
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO products (name, slug, category, category_slug, brand, image_url)
+    SELECT
+        t.item->'product'->>'name',
+        t.item->'product'->>'slug',
+        t.item->'product'->>'category',
+        t.item->'product'->>'category_slug',
+        t.item->'product'->>'brand',
+        t.item->'product'->>'image_url'
+    FROM jsonb_array_elements(p_items) AS t(item);
+
+    INSERT INTO product_prices (
+        product_id, retailer_id, price, currency, product_url, in_stock
+    )
+    SELECT
+        p.id,
+        (t.item->'price'->>'retailer_id')::UUID,
+        (t.item->'price'->>'price')::DECIMAL(12, 2),
+        COALESCE(t.item->'price'->>'currency', 'BDT'),
+        t.item->'price'->>'product_url',
+        COALESCE((t.item->'price'->>'in_stock')::BOOLEAN, true)
+    FROM jsonb_array_elements(p_items) AS t(item)
+    JOIN products p ON p.slug = t.item->'product'->>'slug';
+
+    INSERT INTO product_specs (product_id, specs, updated_at)
+    SELECT p.id, t.item->'specs', NOW()
+    FROM jsonb_array_elements(p_items) AS t(item)
+    JOIN products p ON p.slug = t.item->'product'->>'slug'
+    WHERE jsonb_typeof(t.item->'specs') = 'object'
+      AND t.item->'specs' <> '{}'::JSONB;
+
+    RETURN QUERY
+    SELECT p.*
+    FROM products p
+    WHERE p.slug IN (
+        SELECT t.item->'product'->>'slug'
+        FROM jsonb_array_elements(p_items) AS t(item)
+    );
+END;
+$$;
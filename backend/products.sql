@@ -85,6 +85,8 @@ CREATE INDEX IF NOT EXISTS idx_product_prices_product ON product_prices(product_
 CREATE INDEX IF NOT EXISTS idx_product_prices_retailer ON product_prices(retailer_id);
 CREATE INDEX IF NOT EXISTS idx_product_prices_url ON product_prices(product_url);
 CREATE INDEX IF NOT EXISTS idx_product_prices_price ON product_prices(price);
+-- Serves "all prices for a product, cheapest first" without a sort step
+CREATE INDEX IF NOT EXISTS idx_product_prices_product_price ON product_prices(product_id, price);
 
 CREATE INDEX IF NOT EXISTS idx_retailers_slug ON retailers(slug);
 CREATE INDEX IF NOT EXISTS idx_retailers_active ON retailers(is_active);
@@ -120,6 +122,82 @@ CREATE TRIGGER update_retailers_updated_at
     FOR EACH ROW
     EXECUTE FUNCTION update_updated_at_column();
 
+-- =====================================================
+-- CATEGORY COUNTS FUNCTION
+-- =====================================================
+-- Listing (product_prices row) count per category in one GROUP BY,
+-- for the category sidebar. Called via
+-- supabase.rpc('get_category_listing_counts').
+
+CREATE OR REPLACE FUNCTION get_category_listing_counts()
+RETURNS TABLE (category_slug TEXT, listing_count BIGINT)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT p.category_slug::TEXT, COUNT(*)
+    FROM product_prices pp
+    JOIN products p ON p.id = pp.product_id
+    GROUP BY p.category_slug;
+$$;
+
+-- Listing count per retailer, for the retailer filter. Called via
+-- supabase.rpc('get_retailer_listing_counts').
+
+CREATE OR REPLACE FUNCTION get_retailer_listing_counts()
+RETURNS TABLE (retailer_id UUID, listing_count BIGINT)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT pp.retailer_id, COUNT(*)
+    FROM product_prices pp
+    GROUP BY pp.retailer_id;
+$$;
+
+-- Distinct non-empty brand spellings, optionally within one category, for
+-- the brand filter. Ordered by each spelling's first product ID, the order
+-- a scan of products by ID would first meet them in. Called via
+-- supabase.rpc('get_distinct_brands', {'p_category_slug': slug | null}).
+
+CREATE OR REPLACE FUNCTION get_distinct_brands(p_category_slug TEXT DEFAULT NULL)
+RETURNS TABLE (brand TEXT)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT p.brand::TEXT
+    FROM products p
+    WHERE p.brand IS NOT NULL
+      AND p.brand <> ''
+      AND (p_category_slug IS NULL OR p.category_slug = p_category_slug)
+    GROUP BY p.brand
+    ORDER BY MIN(p.id::TEXT);
+$$;
+
+-- =====================================================
+-- ADMIN BULK PRICE UPDATE FUNCTION
+-- =====================================================
+-- Applies many price edits for one product in a single UPDATE ... FROM.
+-- Called via supabase.rpc('admin_bulk_update_prices',
+-- {'p_product_id': id, 'p_rows': [{price_id, price?, in_stock?, product_url?}]}).
+-- Omitted (null) fields keep their value; rows of other products are not
+-- touched. Returns the updated price rows.
+
+CREATE OR REPLACE FUNCTION admin_bulk_update_prices(p_product_id UUID, p_rows JSONB)
+RETURNS SETOF product_prices
+LANGUAGE sql
+AS $$
+    UPDATE product_prices pp SET
+        price = COALESCE(v.price, pp.price),
+        in_stock = COALESCE(v.in_stock, pp.in_stock),
+        product_url = COALESCE(v.product_url, pp.product_url),
+        updated_at = NOW(),
+        last_scraped_at = NOW()
+    FROM jsonb_to_recordset(p_rows)
+        AS v(price_id UUID, price DECIMAL(12, 2), in_stock BOOLEAN, product_url TEXT)
+    WHERE pp.id = v.price_id
+      AND pp.product_id = p_product_id
+    RETURNING pp.*;
+$$;
+
 -- =====================================================
 -- ROW LEVEL SECURITY (Optional)
 -- =====================================================
@@ -6,12 +6,113 @@ user selections (e.g., compatible motherboards for a selected CPU).
 """
 
 import logging
-from typing import Dict, Any, List, Optional
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Any, List, Optional
+
+from cachetools import TTLCache
 
 from products.repositories import compat_repository, product_repository
+from products.repositories.compat_repository import CompatFilter, CompatSnapshot
 
 logger = logging.getLogger(__name__)
 
+# Runs the lenient-mode "unknown" lookups alongside the matching query when
+# they go to the database
+_lookup_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="compat-lookup")
+
+# Compat filters by (selection kind, product ID, mode). Compatibility data
+# only changes on scrapes and admin edits, so a filter is reused for a few
+# minutes and dropped on any in-process write.
+_compat_filter_cache = TTLCache(maxsize=1024, ttl=300)
+_compat_filter_cache_lock = threading.Lock()
+
+# In-memory copy of product_compat that serves the read lookups; reloaded
+# once it is older than this, or after an in-process write
+COMPAT_SNAPSHOT_TTL = 300.0
+# After a failed load, lookups go to the repository for this long before
+# the next load is attempted
+COMPAT_SNAPSHOT_RETRY_DELAY = 30.0
+_compat_snapshot = None
+# Bumped by every invalidation: a load that started before one may be
+# missing that write, so it is discarded
+_compat_snapshot_generation = 0
+_compat_snapshot_retry_at = 0.0
+# Guards the three globals above; never held across a load
+_compat_snapshot_lock = threading.Lock()
+# Held by the one thread loading a snapshot
+_compat_reload_lock = threading.Lock()
+
+
+def invalidate_compat_cache() -> None:
+    """Drop cached compat filters and data (call after product_compat writes)."""
+    global _compat_snapshot, _compat_snapshot_generation
+    with _compat_filter_cache_lock:
+        _compat_filter_cache.clear()
+    with _compat_snapshot_lock:
+        _compat_snapshot = None
+        _compat_snapshot_generation += 1
+
+
+def _lookup_async(reader, lookup: Callable, **kwargs) -> Future:
+    """
+    Start a reader lookup on _lookup_pool.
+    
+    Lookups on the in-memory snapshot run inline instead: they never wait
+    on the network, so the thread hop would only add overhead.
+    """
+    if not isinstance(reader, CompatSnapshot):
+        return _lookup_pool.submit(lookup, **kwargs)
+    future = Future()
+    try:
+        future.set_result(lookup(**kwargs))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def _motherboard_filter(
+    cpu_compat: Optional[Dict[str, Any]],
+    unknown_below: Optional[float],
+) -> Optional[CompatFilter]:
+    """Motherboards matching a CPU's compat record."""
+    if not cpu_compat:
+        return None
+    cpu_socket = cpu_compat.get('cpu_socket')
+    if not cpu_socket:
+        # Same fallback as get_compatible_motherboards: all motherboards
+        return CompatFilter('motherboard')
+    return CompatFilter(
+        'motherboard',
+        (('mobo_socket', 'eq', cpu_socket), ('confidence', 'gte', 0.70)),
+        unknown_below,
+    )
+
+
+def _ram_filter(
+    mobo_compat: Optional[Dict[str, Any]],
+    unknown_below: Optional[float],
+) -> Optional[CompatFilter]:
+    """RAM matching a motherboard's compat record."""
+    if not mobo_compat or not mobo_compat.get('memory_type'):
+        return None
+    conditions = (
+        ('memory_type', 'eq', mobo_compat['memory_type']),
+        ('confidence', 'gte', 0.70),
+    )
+    max_speed = mobo_compat.get('memory_max_speed_mhz')
+    if max_speed:
+        conditions += (('memory_max_speed_mhz', 'lte', max_speed),)
+    return CompatFilter('ram', conditions, unknown_below)
+
+
+# Selection kind -> builder of the filter for the parts it constrains
+_COMPAT_FILTER_BUILDERS = {
+    'cpu': _motherboard_filter,
+    'motherboard': _ram_filter,
+}
+
 
 class CompatibilityService:
     """
@@ -30,6 +131,52 @@ class CompatibilityService:
         self.compat_repo = compat_repo or compat_repository
         self.product_repo = product_repo or product_repository
     
+    def _reader(self):
+        """
+        Source for compat read queries: the in-memory snapshot when one is
+        loaded, otherwise the repository.
+        
+        One thread reloads an expired snapshot while the others keep using
+        the old one; requests only wait when there is no snapshot at all.
+        After a failed load the repository serves lookups until
+        COMPAT_SNAPSHOT_RETRY_DELAY has passed.
+        """
+        global _compat_snapshot, _compat_snapshot_retry_at
+        snapshot = _compat_snapshot
+        if snapshot is not None and snapshot.age() < COMPAT_SNAPSHOT_TTL:
+            return snapshot
+        if time.monotonic() < _compat_snapshot_retry_at:
+            return snapshot or self.compat_repo
+        if not _compat_reload_lock.acquire(blocking=snapshot is None):
+            return snapshot
+        try:
+            # Another thread may have loaded (or failed to) while this one
+            # waited for the lock
+            with _compat_snapshot_lock:
+                snapshot = _compat_snapshot
+                generation = _compat_snapshot_generation
+                retry_at = _compat_snapshot_retry_at
+            if snapshot is not None and snapshot.age() < COMPAT_SNAPSHOT_TTL:
+                return snapshot
+            if time.monotonic() < retry_at:
+                return snapshot or self.compat_repo
+            
+            loaded = self.compat_repo.load_snapshot()
+            with _compat_snapshot_lock:
+                if generation != _compat_snapshot_generation:
+                    # Invalidated while loading; serve this request from the
+                    # repository and let the next one load again
+                    return self.compat_repo
+                if loaded is None:
+                    _compat_snapshot_retry_at = (
+                        time.monotonic() + COMPAT_SNAPSHOT_RETRY_DELAY
+                    )
+                    return snapshot or self.compat_repo
+                _compat_snapshot = loaded
+                return loaded
+        finally:
+            _compat_reload_lock.release()
+    
     def get_compatible_motherboards(
         self,
         cpu_id: str,
@@ -52,8 +199,10 @@ class CompatibilityService:
                 "error": optional error message
             }
         """
+        reader = self._reader()
+        
         # Get CPU's compatibility record
-        cpu_compat = self.compat_repo.get_by_product_id(cpu_id)
+        cpu_compat = reader.get_by_product_id(cpu_id)
         
         if not cpu_compat:
             return {
@@ -70,7 +219,7 @@ class CompatibilityService:
             # Fallback: When CPU socket is unknown, return ALL motherboards
             # This provides a better UX than showing "no motherboards found"
             # for CPUs where socket data couldn't be extracted from retailer sites
-            all_motherboards = self.compat_repo.find_all_motherboards()
+            all_motherboards = reader.find_all_motherboards()
             
             return {
                 "warning": "CPU socket information not available - showing all motherboards",
@@ -84,8 +233,18 @@ class CompatibilityService:
                 "unknown": [],
             }
         
+        # The unknown-socket lookup doesn't depend on the socket match,
+        # so in lenient mode both queries run at the same time
+        unknown_future = None
+        if mode != 'strict':
+            unknown_future = _lookup_async(
+                reader,
+                reader.find_motherboards_unknown_socket,
+                max_confidence=0.70,
+            )
+        
         # Query compatible motherboards
-        compatible = self.compat_repo.find_motherboards_by_socket(
+        compatible = reader.find_motherboards_by_socket(
             socket=cpu_socket,
             min_confidence=0.70,
         )
@@ -104,9 +263,7 @@ class CompatibilityService:
             }
         else:
             # Lenient mode: include unknown motherboards
-            unknown = self.compat_repo.find_motherboards_unknown_socket(
-                max_confidence=0.70,
-            )
+            unknown = unknown_future.result()
             return {
                 "cpu": {
                     "id": cpu_id,
@@ -139,8 +296,10 @@ class CompatibilityService:
                 "unknown": [...product_ids...],
             }
         """
+        reader = self._reader()
+        
         # Get motherboard's compatibility record
-        mobo_compat = self.compat_repo.get_by_product_id(motherboard_id)
+        mobo_compat = reader.get_by_product_id(motherboard_id)
         
         if not mobo_compat:
             return {
@@ -168,8 +327,17 @@ class CompatibilityService:
         
         max_speed = mobo_compat.get('memory_max_speed_mhz')
         
+        # As above, the unknown-type lookup runs alongside the type match
+        unknown_future = None
+        if mode != 'strict':
+            unknown_future = _lookup_async(
+                reader,
+                reader.find_ram_unknown_type,
+                max_confidence=0.70,
+            )
+        
         # Query compatible RAM
-        compatible = self.compat_repo.find_ram_by_type(
+        compatible = reader.find_ram_by_type(
             memory_type=memory_type,
             max_speed=max_speed,
             min_confidence=0.70,
@@ -189,9 +357,7 @@ class CompatibilityService:
                 "unknown": [],
             }
         else:
-            unknown = self.compat_repo.find_ram_unknown_type(
-                max_confidence=0.70,
-            )
+            unknown = unknown_future.result()
             return {
                 "motherboard": {
                     "id": motherboard_id,
@@ -205,6 +371,46 @@ class CompatibilityService:
                 "unknown": unknown,
             }
     
+    def get_compat_filter(
+        self,
+        cpu_id: Optional[str] = None,
+        motherboard_id: Optional[str] = None,
+        mode: str = 'strict',
+    ) -> Optional[CompatFilter]:
+        """
+        Build a filter selecting the products compatible with a selection.
+        
+        Matches the same products as get_compatible_motherboards /
+        get_compatible_ram (compatible, plus unknown in lenient mode), but
+        as a constraint the product query applies itself, so listing
+        compatible products takes one request instead of two. Filters are
+        cached per selection and mode for a few minutes.
+        
+        Args:
+            cpu_id: Product ID of the selected CPU (-> motherboards)
+            motherboard_id: Product ID of the selected motherboard (-> RAM)
+            mode: 'strict' or 'lenient'
+        
+        Returns:
+            CompatFilter, or None when nothing can be compatible
+        """
+        kind, product_id = ('cpu', cpu_id) if cpu_id else ('motherboard', motherboard_id)
+        key = (kind, product_id, mode)
+        with _compat_filter_cache_lock:
+            cached = _compat_filter_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        compat = self._reader().get_by_product_id(product_id)
+        unknown_below = 0.70 if mode == 'lenient' else None
+        compat_filter = _COMPAT_FILTER_BUILDERS[kind](compat, unknown_below)
+        
+        # A missing record may be a failed lookup, so only hits are kept
+        if compat_filter is not None:
+            with _compat_filter_cache_lock:
+                _compat_filter_cache[key] = compat_filter
+        return compat_filter
+    
     def get_component_compatibility_info(
         self,
         product_id: str,
@@ -220,7 +426,7 @@ class CompatibilityService:
         Returns:
             Compatibility data or None
         """
-        return self.compat_repo.get_by_product_id(product_id)
+        return self._reader().get_by_product_id(product_id)
     
     def save_compatibility_data(
         self,
@@ -241,6 +447,7 @@ class CompatibilityService:
         """
         try:
             result = self.compat_repo.upsert(product_id, compat_data)
+            invalidate_compat_cache()
             return result is not None
         except Exception as e:
             logger.error(f"Error saving compat data for {product_id}: {e}")
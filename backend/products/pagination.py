@@ -0,0 +1,37 @@
+"""
+Cursor helpers for keyset pagination.
+
+A cursor is an opaque, URL-safe token holding the sort value and ID of the
+last row on a page. The next page starts strictly after that row, so the
+database seeks to it through the sort index instead of scanning and
+discarding an OFFSET worth of rows.
+"""
+
+import base64
+import binascii
+import json
+from typing import Any, Tuple
+
+
+def encode_cursor(value: Any, row_id: str) -> str:
+    """Encode the sort value and ID of a page's last row as a cursor."""
+    payload = json.dumps({"v": value, "id": str(row_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, str]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Returns:
+        (sort_value, row_id) tuple
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return payload["v"], str(payload["id"])
+    except (binascii.Error, UnicodeError, ValueError, TypeError, KeyError) as e:
+        raise ValueError("Invalid cursor") from e
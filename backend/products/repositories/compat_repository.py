@@ -6,11 +6,151 @@ context-aware component filtering.
 """
 
 import logging
-from typing import Dict, Any, Optional, List
+import time
+from collections import defaultdict
+from typing import Dict, Any, Optional, List, NamedTuple, Tuple
 
 logger = logging.getLogger(__name__)
 
 
+class CompatFilter(NamedTuple):
+    """
+    A compatibility constraint on a product query.
+    
+    Applied through the product's product_compat row (see
+    apply_compat_filter), so the database filters and paginates compatible
+    products in one request instead of first returning their IDs.
+    """
+    
+    component_type: str
+    # (column, operator, value) conditions a confident match must meet
+    conditions: Tuple[Tuple[str, str, Any], ...] = ()
+    # Lenient mode: also match rows with confidence below this
+    unknown_below: Optional[float] = None
+
+
+def postgrest_quote(value: Any) -> str:
+    """Double-quote a filter value so PostgREST reserved characters are kept."""
+    return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def apply_compat_filter(query, compat_filter: CompatFilter, path: str = "product_compat"):
+    """
+    Filter a query by the product_compat rows embedded at *path*.
+    
+    The query must embed product_compat with !inner at *path* (e.g.
+    "product_compat" from products, "products.product_compat" from
+    product_prices) so non-matching products are dropped.
+    """
+    query = query.eq(f"{path}.component_type", compat_filter.component_type)
+    if compat_filter.unknown_below is None:
+        for column, operator, value in compat_filter.conditions:
+            query = query.filter(f"{path}.{column}", operator, value)
+        return query
+    
+    if not compat_filter.conditions:
+        # Every row of this type matches already
+        return query
+    matched = ",".join(
+        f"{column}.{operator}.{postgrest_quote(value)}"
+        for column, operator, value in compat_filter.conditions
+    )
+    return query.or_(
+        f"and({matched}),confidence.lt.{compat_filter.unknown_below}",
+        reference_table=path,
+    )
+
+
+class CompatSnapshot:
+    """
+    In-memory copy of the product_compat table.
+    
+    Answers the same read queries as CompatibilityRepository, with the
+    same matching rules (NULL never satisfies a comparison), from a dict
+    per product and a list per component type. The table is small and
+    only changes on scrapes and admin edits, so serving the PC-builder
+    lookups from memory removes their database round trips.
+    """
+    
+    def __init__(self, records: List[Dict[str, Any]]):
+        self.loaded_at = time.monotonic()
+        self._by_product = {r['product_id']: r for r in records}
+        self._by_type = defaultdict(list)
+        for record in self._by_product.values():
+            self._by_type[record.get('component_type')].append(record)
+    
+    def age(self) -> float:
+        """Seconds since the snapshot was loaded."""
+        return time.monotonic() - self.loaded_at
+    
+    def _ids(self, component_type: str, **conditions) -> List[str]:
+        """IDs of one component type's records meeting every condition."""
+        ids = []
+        for record in self._by_type.get(component_type, ()):
+            for column, (operator, value) in conditions.items():
+                field = record.get(column)
+                if field is None or not _SNAPSHOT_OPERATORS[operator](field, value):
+                    break
+            else:
+                ids.append(record['product_id'])
+        return ids
+    
+    def get_by_product_id(self, product_id: str) -> Optional[Dict]:
+        return self._by_product.get(product_id)
+    
+    def find_by_socket(
+        self,
+        socket: str,
+        component_type: str,
+        min_confidence: float = 0.70,
+    ) -> List[str]:
+        socket_field = 'cpu_socket' if component_type == 'cpu' else 'mobo_socket'
+        return self._ids(
+            component_type,
+            **{socket_field: ('eq', socket), 'confidence': ('gte', min_confidence)},
+        )
+    
+    def find_motherboards_by_socket(
+        self,
+        socket: str,
+        min_confidence: float = 0.70,
+    ) -> List[str]:
+        return self.find_by_socket(socket, 'motherboard', min_confidence)
+    
+    def find_motherboards_unknown_socket(self, max_confidence: float = 0.70) -> List[str]:
+        return self._ids('motherboard', confidence=('lt', max_confidence))
+    
+    def find_all_motherboards(self) -> List[str]:
+        return self._ids('motherboard')
+    
+    def find_ram_by_type(
+        self,
+        memory_type: str,
+        max_speed: Optional[int] = None,
+        min_confidence: float = 0.70,
+    ) -> List[str]:
+        conditions = {
+            'memory_type': ('eq', memory_type),
+            'confidence': ('gte', min_confidence),
+        }
+        if max_speed:
+            conditions['memory_max_speed_mhz'] = ('lte', max_speed)
+        return self._ids('ram', **conditions)
+    
+    def find_ram_unknown_type(self, max_confidence: float = 0.70) -> List[str]:
+        return self._ids('ram', confidence=('lt', max_confidence))
+
+
+# Comparison operators used by CompatSnapshot queries. Confidence is
+# NUMERIC, so it is compared as a float whatever form the API returned.
+_SNAPSHOT_OPERATORS = {
+    'eq': lambda field, value: field == value,
+    'gte': lambda field, value: float(field) >= value,
+    'lte': lambda field, value: float(field) <= value,
+    'lt': lambda field, value: float(field) < value,
+}
+
+
 class CompatibilityRepository:
     """
     Repository for product_compat table operations.
@@ -69,6 +209,37 @@ class CompatibilityRepository:
             logger.error(f"Error upserting compat for {product_id}: {e}")
             return None
     
+    def load_snapshot(self, chunk_size: int = 1000) -> Optional[CompatSnapshot]:
+        """
+        Read the whole product_compat table into a CompatSnapshot.
+        
+        Rows are fetched in ordered ranges, since PostgREST caps the rows
+        of a single response.
+        
+        Returns:
+            The snapshot, or None on failure
+        """
+        try:
+            records = []
+            offset = 0
+            while True:
+                result = (
+                    self.client.table('product_compat')
+                    .select('*')
+                    .order('id')
+                    .range(offset, offset + chunk_size - 1)
+                    .execute()
+                )
+                rows = result.data or []
+                records.extend(rows)
+                if len(rows) < chunk_size:
+                    return CompatSnapshot(records)
+                offset += chunk_size
+            
+        except Exception as e:
+            logger.error(f"Error loading compat snapshot: {e}")
+            return None
+    
     def get_by_product_id(self, product_id: str) -> Optional[Dict]:
         """
         Get compatibility data for a specific product.
@@ -11,9 +11,19 @@ Follows clean architecture principles:
 """
 
 import logging
-from typing import Optional, List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional, List, Iterable, Callable, Tuple
 from datetime import datetime, timezone
 
+from cachetools import TTLCache
+
+from products.repositories.compat_repository import (
+    CompatFilter,
+    apply_compat_filter,
+    postgrest_quote,
+)
 from products.repositories.exceptions import (
     ProductRepositoryError,
     ProductNotFoundError,
@@ -31,8 +41,9 @@ class SimpleCache:
     """
     Simple in-memory cache with TTL for reducing repeated queries.
     
-    Used for data that doesn't change frequently (like category counts)
-    to reduce load on Supabase during rapid page refreshes.
+    Used for data that doesn't change frequently (like category counts,
+    brands and retailer counts) to reduce load on Supabase during rapid
+    page refreshes.
     """
     
     def __init__(self):
@@ -50,17 +61,20 @@ class SimpleCache:
         Returns:
             Cached value or None if expired/missing
         """
-        if key not in self._cache:
+        # One lookup, so a clear() from another thread can't remove the
+        # entry between a membership check and the read
+        value = self._cache.get(key)
+        if value is None:
             return None
         
         elapsed = time.time() - self._timestamps.get(key, 0)
         if elapsed > ttl_seconds:
             # Expired
-            del self._cache[key]
-            del self._timestamps[key]
+            self._cache.pop(key, None)
+            self._timestamps.pop(key, None)
             return None
         
-        return self._cache[key]
+        return value
     
     def set(self, key: str, value):
         """Store value in cache with current timestamp."""
@@ -80,6 +94,175 @@ class SimpleCache:
 # Global cache instance
 _cache = SimpleCache()
 
+# Retailers by slug. Retailers are seeded by SQL and almost never change, so
+# this is kept apart from _cache: listing invalidation after every product
+# write would otherwise drop it. Misses are not cached.
+_retailer_cache = TTLCache(maxsize=256, ttl=300)
+_retailer_cache_lock = threading.Lock()
+
+
+def _postgrest_array(values: List[str]) -> str:
+    """
+    Format values as a PostgREST array literal, e.g. {"ASUS","be quiet!"}.
+    
+    Each value is double-quoted so commas and braces inside it are kept.
+    """
+    return "{" + ",".join(postgrest_quote(v) for v in values) + "}"
+
+
+def _apply_keyset(query, column: str, desc: bool, after: Tuple[Any, str]):
+    """
+    Order a query by (column, id) and keep only rows after a cursor row.
+    
+    Args:
+        query: PostgREST query builder
+        column: Sort column on the queried table
+        desc: Whether the sort is descending
+        after: (sort_value, id) of the last row already returned, or None
+    """
+    query = query.order(column, desc=desc).order("id", desc=desc)
+    if after is None:
+        return query
+    value, last_id = after
+    op = "lt" if desc else "gt"
+    value = postgrest_quote(value)
+    return query.or_(
+        f"{column}.{op}.{value},and({column}.eq.{value},id.{op}.{postgrest_quote(last_id)})"
+    )
+
+
+# Filtered totals only move when products are written, and every write
+# clears them, so a short TTL only bounds staleness from other processes
+COUNT_CACHE_TTL = 60.0
+
+# Exact totals by table and filter set. Keys come from request filters
+# (search text, brands, price range, ...), so the cache is bounded.
+_count_cache = TTLCache(maxsize=2048, ttl=COUNT_CACHE_TTL)
+_count_cache_lock = threading.Lock()
+
+
+def _cached_count(cache_key: str, build_query: Callable) -> int:
+    """
+    Return an exact row count, reusing it for COUNT_CACHE_TTL seconds.
+    
+    Args:
+        cache_key: Key identifying the table and filters being counted
+        build_query: Returns the filtered count query (head=True) to run
+                     on a cache miss
+    """
+    with _count_cache_lock:
+        cached = _count_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    response = build_query().execute()
+    count = response.count if response and response.count else 0
+    with _count_cache_lock:
+        _count_cache[cache_key] = count
+    return count
+
+
+def _page_without_count(rows: List[dict], page: int, page_size: int, keyset: bool) -> tuple:
+    """
+    Trim a page fetched with one extra row and build its pagination metadata.
+    
+    The extra row only signals that another page follows, which replaces
+    the count query when the caller does not need totals.
+    """
+    pagination = {
+        "page_size": page_size,
+        "has_next": len(rows) > page_size,
+        "has_prev": keyset or page > 1,
+    }
+    if not keyset:
+        pagination = {"page": page, **pagination}
+    return rows[:page_size], pagination
+
+
+def _iter_rows(build_query, chunk_size: int = 1000) -> Iterable[dict]:
+    """
+    Yield every row of a query, fetching it one range at a time.
+    
+    PostgREST caps how many rows a single response may hold, so whole-table
+    scans are read in ordered chunks; callers can aggregate as rows arrive
+    instead of holding the full result.
+    
+    Args:
+        build_query: Callable returning a fresh, ordered select query
+        chunk_size: Rows per request (keep at or below the API's max rows)
+    """
+    offset = 0
+    while True:
+        response = build_query().range(offset, offset + chunk_size - 1).execute()
+        rows = response.data if response and response.data else []
+        yield from rows
+        if len(rows) < chunk_size:
+            return
+        offset += chunk_size
+
+
+# Bulk writes are split into chunks; this many chunk requests are kept in
+# flight at once (well under the shared httpx connection pool size)
+MAX_CONCURRENT_BATCHES = 4
+
+
+def _run_batches(
+    run_batch: Callable[[List[dict]], List[dict]],
+    rows: List[dict],
+    batch_size: int = 100,
+) -> List[dict]:
+    """
+    Send rows in fixed-size chunks, overlapping the chunk requests.
+    
+    Each chunk is independent (an idempotent upsert or a read), so their
+    round trips run concurrently on a small thread pool. Results are
+    concatenated in chunk order; the first failing chunk's exception is
+    re-raised.
+    
+    Args:
+        run_batch: Executes one chunk and returns its returned rows
+        rows: All rows to send
+        batch_size: Rows per request
+    """
+    batches = [rows[i:i + batch_size] for i in range(0, len(rows), batch_size)]
+    if len(batches) <= 1:
+        return run_batch(batches[0]) if batches else []
+    
+    all_results = []
+    workers = min(MAX_CONCURRENT_BATCHES, len(batches))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for data in executor.map(run_batch, batches):
+            all_results.extend(data)
+    return all_results
+
+
+def call_optional_rpc(owner, flag_name: str, fn_name: str, params: dict, fallback: str):
+    """
+    Call a database function that may not be installed.
+    
+    If PostgREST cannot find the function, *owner*'s *flag_name* attribute
+    is cleared so later calls go straight to the fallback, and None is
+    returned. Any other error is raised.
+    
+    Args:
+        owner: Object with a Supabase client and the availability flag
+        flag_name: Attribute recording whether the function is available
+        fn_name: Database function to call
+        params: Named arguments of the function
+        fallback: What the caller does instead, for the log message
+        
+    Returns:
+        The RPC response, or None if the function is not installed
+    """
+    try:
+        return owner.client.rpc(fn_name, params).execute()
+    except Exception as e:
+        # PGRST202: PostgREST could not find the function
+        if getattr(e, "code", None) != "PGRST202":
+            raise
+        logger.warning(f"{fn_name} is missing; {fallback}")
+        setattr(owner, flag_name, False)
+        return None
+
 
 class ProductRepository:
     """
@@ -92,6 +275,24 @@ class ProductRepository:
     TABLE_NAME = "products"
     _client = None
     
+    # sort_by -> (column, descending) for the orderings done by the DB
+    KEYSET_SORTS = {
+        "newest": ("created_at", True),
+        "name_asc": ("name", False),
+        "name_desc": ("name", True),
+    }
+    
+    # Cleared if the ingest_products_atomic function turns out to be missing
+    atomic_ingest_available = True
+    # Cleared if the admin_create_product function turns out to be missing
+    admin_create_rpc_available = True
+    # Cleared if the admin_bulk_create_products function turns out to be missing
+    admin_bulk_create_rpc_available = True
+    # Cleared if the get_category_listing_counts function turns out to be missing
+    category_counts_rpc_available = True
+    # Cleared if the get_distinct_brands function turns out to be missing
+    distinct_brands_rpc_available = True
+    
     @property
     def client(self):
         """Lazy-load the Supabase client on first access."""
@@ -154,6 +355,83 @@ class ProductRepository:
                 original_error=e
             ) from e
     
+    def get_by_slugs(self, slugs: List[str], columns: str = "id, slug") -> List[dict]:
+        """
+        Retrieve the products matching any of the given slugs.
+        
+        Slugs are looked up in chunks (to keep request URLs short) whose
+        requests overlap.
+        
+        Args:
+            slugs: Product slugs
+            columns: Columns to select
+            
+        Returns:
+            Matching product records (missing slugs are skipped)
+        """
+        if not slugs:
+            return []
+        
+        def fetch_batch(batch):
+            response = (
+                self.client
+                .table(self.TABLE_NAME)
+                .select(columns)
+                .in_("slug", batch)
+                .execute()
+            )
+            return response.data if response and response.data else []
+        
+        try:
+            return _run_batches(fetch_batch, slugs)
+        except Exception as e:
+            logger.error(f"Failed to fetch products by slugs: {e}")
+            raise ProductRepositoryError(
+                "Failed to fetch products by slugs",
+                original_error=e
+            ) from e
+    
+    def get_with_prices(
+        self,
+        field: str,
+        value: str,
+        price_columns: str,
+        with_specs: bool = False,
+    ) -> Optional[dict]:
+        """
+        Retrieve one product with its price rows embedded, in one request.
+        
+        Args:
+            field: Unique column to look the product up by ('id' or 'slug')
+            value: Value of that column
+            price_columns: Columns to select from each price row
+            with_specs: Also embed the product_specs row
+            
+        Returns:
+            Product data dict with 'product_prices' (cheapest first) and,
+            with_specs, 'product_specs', or None if not found
+        """
+        select_fields = f"*, product_prices({price_columns})"
+        if with_specs:
+            select_fields += ", product_specs(specs)"
+        try:
+            response = (
+                self.client
+                .table(self.TABLE_NAME)
+                .select(select_fields)
+                .eq(field, value)
+                .order("price", foreign_table="product_prices")
+                .maybe_single()
+                .execute()
+            )
+            return response.data if response else None
+        except Exception as e:
+            logger.error(f"Failed to fetch product with prices by {field} '{value}': {e}")
+            raise ProductRepositoryError(
+                f"Failed to fetch product with prices by {field}: {value}",
+                original_error=e
+            ) from e
+    
     def get_by_category(self, category_slug: str, limit: int = 100) -> List[dict]:
         """
         Retrieve products by category.
@@ -220,12 +498,28 @@ class ProductRepository:
         min_price: Optional[float] = None,
         max_price: Optional[float] = None,
         retailers: Optional[List[str]] = None,
+        brands: Optional[List[str]] = None,
+        with_prices_only: bool = False,
+        after: Optional[Tuple[Any, str]] = None,
+        include_count: bool = True,
+        compat_filter: Optional[CompatFilter] = None,
     ) -> dict:
         """
         Retrieve products with pagination, filtering, and sorting.
         
-        Uses offset-based pagination which works well with Supabase.
-        Returns both the products and pagination metadata.
+        Uses offset-based pagination by default. When *after* is given (the
+        sort value and ID of the previous page's last product), keyset
+        pagination is used instead: the page starts right after that row,
+        no OFFSET rows are scanned and no count query is made.
+        
+        The total count is cached per filter set for COUNT_CACHE_TTL
+        seconds. With include_count=False it is skipped entirely: one extra
+        row is fetched to set has_next, and total_count / total_pages are
+        left out of the metadata.
+        
+        With with_prices_only, only products that have at least one price
+        row matching min_price / max_price / retailers are returned (and
+        counted). The price filters are ignored otherwise.
         
         Args:
             page: Page number (1-indexed)
@@ -237,62 +531,91 @@ class ProductRepository:
             min_price: Optional minimum price filter
             max_price: Optional maximum price filter
             retailers: Optional list of retailer slugs to filter by
+            brands: Optional list of exact brand names (case-insensitive)
+            with_prices_only: Skip products without a matching price row
+            after: Optional (sort_value, id) cursor row for keyset pagination
+            include_count: Whether to return total_count / total_pages
+            compat_filter: Optional compatibility constraint (joined in the DB)
             
         Returns:
             Dict with 'products' list and 'pagination' metadata
         """
-        try:
-            # Calculate offset
-            offset = (page - 1) * page_size
-            
-            # Build base query for counting
-            count_query = self.client.table(self.TABLE_NAME).select("*", count="exact")
-            
-            # Apply filters to count query
-            if category_slug:
-                count_query = count_query.eq("category_slug", category_slug)
-            if brand:
-                count_query = count_query.ilike("brand", f"%{brand}%")
-            if search:
-                # Search in name using case-insensitive pattern matching
-                count_query = count_query.or_(f"name.ilike.%{search}%,brand.ilike.%{search}%")
-            if product_ids and len(product_ids) > 0:
-                count_query = count_query.in_("id", product_ids)
-            
-            # Get total count
-            count_response = count_query.execute()
-            total_count = count_response.count if count_response else 0
-            
-            # Build query for fetching products
-            query = (
-                self.client
-                .table(self.TABLE_NAME)
-                .select("*")
-            )
-            
-            # Apply sorting based on sort_by parameter
-            if sort_by == "name_asc":
-                query = query.order("name", desc=False)
-            elif sort_by == "name_desc":
-                query = query.order("name", desc=True)
+        # ilike without wildcards is a case-insensitive equality check
+        brands_filter = _postgrest_array(brands) if brands else None
+        
+        # Empty inner embeds filter on related rows without returning them
+        select_fields = "*"
+        if with_prices_only:
+            if retailers:
+                select_fields = "*, product_prices!inner(retailers!inner())"
             else:
-                # Default: newest first
-                query = query.order("created_at", desc=True)
-            
-            # Apply pagination
-            query = query.range(offset, offset + page_size - 1)
-            
-            # Apply same filters to data query
+                select_fields = "*, product_prices!inner()"
+        if compat_filter:
+            select_fields += ", product_compat!inner()"
+        
+        def apply_filters(query):
             if category_slug:
                 query = query.eq("category_slug", category_slug)
             if brand:
                 query = query.ilike("brand", f"%{brand}%")
+            if brands_filter:
+                query = query.filter("brand", "ilike(any)", brands_filter)
             if search:
+                # Search in name using case-insensitive pattern matching
                 query = query.or_(f"name.ilike.%{search}%,brand.ilike.%{search}%")
             if product_ids and len(product_ids) > 0:
                 query = query.in_("id", product_ids)
+            if with_prices_only:
+                if min_price is not None:
+                    query = query.gte("product_prices.price", min_price)
+                if max_price is not None:
+                    query = query.lte("product_prices.price", max_price)
+                if retailers:
+                    query = query.in_("product_prices.retailers.slug", retailers)
+            if compat_filter:
+                query = apply_compat_filter(query, compat_filter)
+            return query
+        
+        # Sorting by (column, id) gives every row a stable position for cursors
+        column, desc = self.KEYSET_SORTS.get(sort_by, self.KEYSET_SORTS["newest"])
+        
+        try:
+            query = _apply_keyset(
+                apply_filters(self.client.table(self.TABLE_NAME).select(select_fields)),
+                column,
+                desc,
+                after,
+            )
             
-            response = query.execute()
+            # Keyset pages start right after the cursor row
+            offset = 0 if after is not None else (page - 1) * page_size
+            
+            if after is not None or not include_count:
+                response = query.range(offset, offset + page_size).execute()
+                products, pagination = _page_without_count(
+                    response.data if response and response.data else [],
+                    page,
+                    page_size,
+                    keyset=after is not None,
+                )
+                return {"products": products, "pagination": pagination}
+            
+            # head=True sends a HEAD request, so only the count comes back
+            # instead of a body of rows to decode
+            total_count = _cached_count(
+                "count:products:" + repr((
+                    category_slug, brand, brands, search, product_ids,
+                    with_prices_only, min_price, max_price, retailers, compat_filter,
+                )),
+                lambda: apply_filters(
+                    self.client.table(self.TABLE_NAME).select(
+                        select_fields, count="exact", head=True
+                    )
+                ),
+            )
+            
+            # Apply pagination
+            response = query.range(offset, offset + page_size - 1).execute()
             products = response.data if response and response.data else []
             
             # Calculate pagination metadata
@@ -344,53 +667,17 @@ class ProductRepository:
                 return cached
         
         try:
-            # Get all products with their category slugs
-            products_response = (
-                self.client
-                .table(self.TABLE_NAME)
-                .select("id, category_slug")
-                .execute()
-            )
-            
-            if not products_response or not products_response.data:
-                return {}
-            
-            # Build a map of product_id -> category_slug
-            product_categories = {
-                p["id"]: p.get("category_slug", "")
-                for p in products_response.data
-            }
-            
-            # Get all price listings
-            prices_response = (
-                self.client
-                .table("product_prices")
-                .select("product_id")
-                .execute()
-            )
-            
-            if not prices_response or not prices_response.data:
-                return {"": 0}
-            
-            # Count listings per category
-            counts = {}
-            total = 0
-            for price in prices_response.data:
-                product_id = price.get("product_id")
-                category_slug = product_categories.get(product_id, "")
-                if category_slug:
-                    counts[category_slug] = counts.get(category_slug, 0) + 1
-                total += 1
-            
-            # Add total count
-            counts[""] = total
+            counts = None
+            if self.category_counts_rpc_available:
+                counts = self._get_category_counts_grouped()
+            if counts is None:
+                counts = self._get_category_counts_streamed()
             
             # Cache the result
             _cache.set(cache_key, counts)
             
             return counts
             
-            
         except Exception as e:
             logger.error(f"Failed to get category counts: {e}")
             raise ProductRepositoryError(
@@ -398,38 +685,104 @@ class ProductRepository:
                 original_error=e
             ) from e
     
+    def _get_category_counts_grouped(self) -> Optional[dict]:
+        """
+        Count listings per category with one GROUP BY in the database.
+        
+        Returns:
+            Counts in get_category_counts' format, or None if the
+            get_category_listing_counts function is not installed
+        """
+        response = call_optional_rpc(
+            self, "category_counts_rpc_available", "get_category_listing_counts", {},
+            "counting listings row by row",
+        )
+        if response is None:
+            return None
+        
+        counts = {}
+        total = 0
+        for row in response.data or []:
+            if row["category_slug"]:
+                counts[row["category_slug"]] = row["listing_count"]
+            total += row["listing_count"]
+        counts[""] = total
+        return counts
+    
+    def _get_category_counts_streamed(self) -> dict:
+        """Count listings per category by streaming every price row."""
+        # Stream price listings with their product's category embedded,
+        # counting as rows arrive
+        counts = {}
+        total = 0
+        for price in _iter_rows(
+            lambda: (
+                self.client
+                .table("product_prices")
+                .select("products!inner(category_slug)")
+                .order("id")
+            )
+        ):
+            category_slug = (price.get("products") or {}).get("category_slug")
+            if category_slug:
+                counts[category_slug] = counts.get(category_slug, 0) + 1
+            total += 1
+        
+        # Add total count
+        counts[""] = total
+        return counts
+    
     def invalidate_category_counts_cache(self):
         """Invalidate the category counts cache (call after product changes)."""
         _cache.clear("category_counts")
     
-    def get_available_brands(self, category_slug: Optional[str] = None) -> List[str]:
+    def invalidate_listing_caches(self):
+        """
+        Invalidate every cached filter-sidebar result.
+        
+        Clears category counts, brands, retailer counts and list totals;
+        call after products or prices are added, changed or removed.
+        """
+        _cache.clear()
+        with _count_cache_lock:
+            _count_cache.clear()
+    
+    def get_available_brands(
+        self,
+        category_slug: Optional[str] = None,
+        use_cache: bool = True,
+        cache_ttl: float = 60.0,
+    ) -> List[str]:
         """
         Get list of unique brands, optionally filtered by category.
         
         Args:
             category_slug: Optional category to filter brands by
+            use_cache: Whether to use cached results (default True)
+            cache_ttl: Cache time-to-live in seconds (default 60)
             
         Returns:
             List of unique brand names sorted alphabetically
         """
+        cache_key = f"brands:{category_slug or ''}"
+        
+        if use_cache:
+            cached = _cache.get(cache_key, cache_ttl)
+            if cached is not None:
+                return cached
+        
         try:
-            query = self.client.table(self.TABLE_NAME).select("brand")
-            
-            if category_slug:
-                query = query.eq("category_slug", category_slug)
+            distinct_brands = None
+            if self.distinct_brands_rpc_available:
+                distinct_brands = self._get_distinct_brands_grouped(category_slug)
+            if distinct_brands is None:
+                distinct_brands = self._get_distinct_brands_streamed(category_slug)
             
-            response = query.execute()
-            
-            if not response or not response.data:
-                return []
-            
-            # Extract unique brands and filter out None/empty values
             # Use case-insensitive deduplication to avoid duplicates like "Sparkle" and "sparkle"
             brands_dict = {}
-            for item in response.data:
-                brand = item.get("brand")
-                if brand and brand.strip():
-                    brand_cleaned = brand.strip()
+            for brand in distinct_brands:
+                brand_cleaned = brand.strip()
+                if brand_cleaned:
                     brand_lower = brand_cleaned.lower()
                     # Keep the first occurrence (or prefer capitalized version)
                     if brand_lower not in brands_dict:
@@ -439,7 +792,9 @@ class ProductRepository:
                         brands_dict[brand_lower] = brand_cleaned
             
             # Return sorted list of unique brand names
-            return sorted(list(brands_dict.values()))
+            brands = sorted(brands_dict.values())
+            _cache.set(cache_key, brands)
+            return brands
             
         except Exception as e:
             logger.error(f"Failed to get available brands: {e}")
@@ -448,6 +803,44 @@ class ProductRepository:
                 original_error=e
             ) from e
     
+    def _get_distinct_brands_grouped(self, category_slug: Optional[str]) -> Optional[list]:
+        """
+        Get the distinct brand spellings with one DISTINCT in the database.
+        
+        Returns:
+            Brand names, or None if the get_distinct_brands function is not
+            installed
+        """
+        response = call_optional_rpc(
+            self, "distinct_brands_rpc_available", "get_distinct_brands",
+            {"p_category_slug": category_slug}, "reading brands row by row",
+        )
+        if response is None:
+            return None
+        
+        return [row["brand"] for row in response.data or []]
+    
+    def _get_distinct_brands_streamed(self, category_slug: Optional[str]) -> list:
+        """Get the distinct brand spellings by streaming every product row."""
+        def build_query():
+            # Null and empty brands are dropped by the DB, not in Python
+            query = (
+                self.client
+                .table(self.TABLE_NAME)
+                .select("brand")
+                .not_.is_("brand", "null")
+                .neq("brand", "")
+                .order("id")
+            )
+            if category_slug:
+                query = query.eq("category_slug", category_slug)
+            return query
+        
+        # Most rows repeat a handful of brands; collapse exact duplicates
+        # first (keeping first-seen order) so the case-insensitive pass in
+        # get_available_brands only looks at distinct spellings
+        return list(dict.fromkeys(item["brand"] for item in _iter_rows(build_query)))
+    
     def create(self, product_data: dict) -> dict:
         """
         Create a new product in the database.
@@ -480,6 +873,40 @@ class ProductRepository:
                 original_error=e
             ) from e
     
+    def create_many(self, products_data: List[dict]) -> List[dict]:
+        """
+        Create many products with one multi-row insert.
+        
+        A single statement, so either every row is inserted or none is.
+        Unlike upsert_many_by_slug, an existing slug is an error rather
+        than an update of that product.
+        
+        Args:
+            products_data: List of product dicts (keep it to a few hundred)
+            
+        Returns:
+            The created product records
+        """
+        if not products_data:
+            return []
+        
+        try:
+            response = (
+                self.client
+                .table(self.TABLE_NAME)
+                .insert(products_data)
+                .execute()
+            )
+            created = response.data if response and response.data else []
+            logger.info(f"Created {len(created)} products")
+            return created
+        except Exception as e:
+            logger.error(f"Failed to create {len(products_data)} products: {e}")
+            raise ProductCreationError(
+                f"Failed to create {len(products_data)} products",
+                original_error=e
+            ) from e
+    
     def update(self, product_id: str, update_data: dict) -> Optional[dict]:
         """
         Update an existing product by ID.
@@ -513,10 +940,76 @@ class ProductRepository:
                 original_error=e
             ) from e
     
+    def delete(self, product_id: str) -> Optional[dict]:
+        """
+        Delete a product by ID. Prices, specs and compat rows cascade.
+        
+        Args:
+            product_id: The product's UUID
+            
+        Returns:
+            The deleted product data or None if not found
+        """
+        try:
+            response = (
+                self.client
+                .table(self.TABLE_NAME)
+                .delete()
+                .eq("id", product_id)
+                .execute()
+            )
+            if response and response.data:
+                logger.info(f"Deleted product ID: {product_id}")
+                return response.data[0]
+            return None
+        except Exception as e:
+            logger.error(f"Failed to delete product '{product_id}': {e}")
+            raise ProductRepositoryError(
+                f"Failed to delete product ID: {product_id}",
+                original_error=e
+            ) from e
+    
+    def delete_many(self, product_ids: List[str]) -> int:
+        """
+        Delete products by ID. Prices, specs and compat rows cascade.
+        
+        Args:
+            product_ids: The products' UUIDs
+            
+        Returns:
+            Number of products deleted
+        """
+        if not product_ids:
+            return 0
+        
+        BATCH_SIZE = 100
+        deleted = 0
+        try:
+            for i in range(0, len(product_ids), BATCH_SIZE):
+                response = (
+                    self.client
+                    .table(self.TABLE_NAME)
+                    .delete()
+                    .in_("id", product_ids[i:i + BATCH_SIZE])
+                    .execute()
+                )
+                deleted += len(response.data) if response and response.data else 0
+            logger.info(f"Deleted {deleted} products")
+            return deleted
+        except Exception as e:
+            logger.error(f"Failed to delete {len(product_ids)} products: {e}")
+            raise ProductRepositoryError(
+                f"Failed to delete {len(product_ids)} products",
+                original_error=e
+            ) from e
+    
     def upsert_by_slug(self, product_data: dict) -> dict:
         """
         Create or update a product by slug.
         
+        A single ON CONFLICT (slug) round trip instead of a lookup followed
+        by an insert or update.
+        
         Args:
             product_data: Dict containing product fields (must include 'slug')
             
@@ -528,18 +1021,192 @@ class ProductRepository:
             raise ProductCreationError("Product data must include 'slug' for upsert")
         
         try:
-            existing = self.get_by_slug(slug)
-            if existing:
-                return self.update(existing["id"], product_data)
-            return self.create(product_data)
-        except (ProductCreationError, ProductUpdateError):
+            response = (
+                self.client
+                .table(self.TABLE_NAME)
+                .upsert(product_data, on_conflict="slug")
+                .execute()
+            )
+            if response and response.data:
+                return response.data[0]
+            raise ProductCreationError(f"Upsert returned no data for product: {slug}")
+        except ProductCreationError:
             raise
         except Exception as e:
             logger.error(f"Failed to upsert product by slug '{slug}': {e}")
             raise ProductCreationError(
-                f"Failed to upsert product: {slug}",
+                f"Failed to upsert product: {slug}",
+                original_error=e
+            ) from e
+    
+    def upsert_many_by_slug(self, products_data: List[dict]) -> List[dict]:
+        """
+        Create or update many products by slug using bulk upserts.
+        
+        Each chunk is a single ON CONFLICT (slug) round trip instead of a
+        lookup plus insert/update per product. Slugs must be unique within
+        the list (Postgres rejects a chunk that touches one row twice).
+        
+        Args:
+            products_data: List of product dicts (each must include 'slug')
+            
+        Returns:
+            List of created or updated product records
+        """
+        if not products_data:
+            return []
+        
+        def upsert_batch(batch):
+            response = (
+                self.client
+                .table(self.TABLE_NAME)
+                .upsert(batch, on_conflict="slug")
+                .execute()
+            )
+            return response.data if response and response.data else []
+        
+        try:
+            all_results = _run_batches(upsert_batch, products_data)
+            
+            logger.info(f"Upserted {len(all_results)} products")
+            return all_results
+        except Exception as e:
+            logger.error(f"Failed to bulk upsert {len(products_data)} products: {e}")
+            raise ProductCreationError(
+                f"Failed to bulk upsert {len(products_data)} products",
+                original_error=e
+            ) from e
+    
+    def ingest_many_atomic(self, items: List[dict]) -> Optional[List[str]]:
+        """
+        Write products, prices and specs for a batch via one RPC call each chunk.
+        
+        Calls the ingest_products_atomic function (product_specs.sql), which
+        upserts all three tables inside a single transaction, so a chunk
+        either lands completely or not at all. Each chunk commits on its
+        own: if one fails, the chunks before it stay written. If the
+        function is not installed, this repository stops trying it for the
+        rest of the process.
+        
+        Args:
+            items: Dicts with 'product', 'price' (without product_id),
+                   'specs' and 'specs_source_url'
+            
+        Returns:
+            Product URLs of the price rows that were written, or None if the
+            function is not installed
+        """
+        if not items:
+            return []
+        
+        # Chunks run one after another: concurrent transactions touching
+        # the same products could deadlock
+        BATCH_SIZE = 500
+        saved_urls = []
+        
+        for i in range(0, len(items), BATCH_SIZE):
+            chunk = items[i:i + BATCH_SIZE]
+            try:
+                response = call_optional_rpc(
+                    self, "atomic_ingest_available", "ingest_products_atomic",
+                    {"items": chunk}, "ingesting with bulk upserts",
+                )
+            except Exception as e:
+                logger.error(
+                    f"Failed to atomically ingest items {i}-{i + len(chunk) - 1} "
+                    f"of {len(items)} ({len(saved_urls)} listings already written): {e}"
+                )
+                raise ProductCreationError(
+                    f"Failed to atomically ingest items {i}-{i + len(chunk) - 1} of {len(items)}",
+                    original_error=e
+                ) from e
+            if response is None:
+                return None
+            if response.data:
+                saved_urls.extend(row["ingested_url"] for row in response.data)
+        
+        logger.info(f"Atomically ingested {len(saved_urls)} listings")
+        return saved_urls
+    
+    def create_with_price_atomic(
+        self,
+        product_data: dict,
+        price_data: dict,
+        specs: Optional[dict] = None,
+    ) -> Optional[dict]:
+        """
+        Create a product with its first price and specs via one RPC call.
+        
+        Calls the admin_create_product function (product_specs.sql), which
+        checks the retailer and slug and writes all three tables in a single
+        transaction. If a product with the same slug exists, the price is
+        added to it instead.
+        
+        Args:
+            product_data: Product fields (must include 'slug')
+            price_data: Price fields without product_id
+            specs: Specifications dict, or None
+            
+        Returns:
+            {"status", "product"} as returned by the function, or None if
+            the function is not installed
+        """
+        try:
+            response = call_optional_rpc(
+                self, "admin_create_rpc_available", "admin_create_product",
+                {"p_product": product_data, "p_price": price_data, "p_specs": specs},
+                "creating step by step",
+            )
+        except Exception as e:
+            logger.error(f"Failed to create product '{product_data.get('slug')}': {e}")
+            raise ProductCreationError(
+                f"Failed to create product: {product_data.get('slug')}",
+                original_error=e
+            ) from e
+        
+        if response is None:
+            return None
+        if not response.data:
+            raise ProductCreationError(
+                f"admin_create_product returned no data for: {product_data.get('slug')}"
+            )
+        return response.data
+    
+    def create_many_atomic(self, items: List[dict]) -> Optional[List[dict]]:
+        """
+        Create new products with their first prices and specs via one RPC call.
+        
+        Calls the admin_bulk_create_products function (product_specs.sql),
+        which inserts all three tables inside a single transaction: an
+        existing slug or product URL fails the whole call and writes
+        nothing.
+        
+        Args:
+            items: Dicts with 'product', 'price' (without product_id) and
+                   'specs'; slugs and product URLs must be unique
+            
+        Returns:
+            The created product records, or None if the function is not
+            installed
+        """
+        if not items:
+            return []
+        
+        try:
+            response = call_optional_rpc(
+                self, "admin_bulk_create_rpc_available", "admin_bulk_create_products",
+                {"p_items": items}, "creating step by step",
+            )
+        except Exception as e:
+            logger.error(f"Failed to atomically create {len(items)} products: {e}")
+            raise ProductCreationError(
+                f"Failed to create {len(items)} products",
                 original_error=e
             ) from e
+        
+        if response is None:
+            return None
+        return response.data or []
 
 
 class RetailerRepository:
@@ -550,6 +1217,9 @@ class RetailerRepository:
     TABLE_NAME = "retailers"
     _client = None
     
+    # Cleared if the get_retailer_listing_counts function turns out to be missing
+    listing_counts_rpc_available = True
+    
     @property
     def client(self):
         """Lazy-load the Supabase client on first access."""
@@ -578,7 +1248,12 @@ class RetailerRepository:
             ) from e
     
     def get_by_slug(self, slug: str) -> Optional[dict]:
-        """Retrieve a retailer by slug."""
+        """Retrieve a retailer by slug (cached per process)."""
+        with _retailer_cache_lock:
+            cached = _retailer_cache.get(slug)
+        if cached is not None:
+            return cached
+        
         try:
             response = (
                 self.client
@@ -588,7 +1263,11 @@ class RetailerRepository:
                 .maybe_single()
                 .execute()
             )
-            return response.data if response else None
+            retailer = response.data if response else None
+            if retailer:
+                with _retailer_cache_lock:
+                    _retailer_cache[slug] = retailer
+            return retailer
         except Exception as e:
             logger.error(f"Failed to fetch retailer by slug '{slug}': {e}")
             raise ProductRepositoryError(
@@ -596,6 +1275,43 @@ class RetailerRepository:
                 original_error=e
             ) from e
     
+    def get_by_slugs(self, slugs: List[str]) -> List[dict]:
+        """Retrieve all retailers matching any of the given slugs."""
+        if not slugs:
+            return []
+        
+        found = []
+        uncached = []
+        with _retailer_cache_lock:
+            for slug in slugs:
+                cached = _retailer_cache.get(slug)
+                if cached is not None:
+                    found.append(cached)
+                else:
+                    uncached.append(slug)
+        if not uncached:
+            return found
+        
+        try:
+            response = (
+                self.client
+                .table(self.TABLE_NAME)
+                .select("*")
+                .in_("slug", uncached)
+                .execute()
+            )
+            fetched = response.data if response and response.data else []
+            with _retailer_cache_lock:
+                for retailer in fetched:
+                    _retailer_cache[retailer["slug"]] = retailer
+            return found + fetched
+        except Exception as e:
+            logger.error(f"Failed to fetch retailers by slugs: {e}")
+            raise ProductRepositoryError(
+                "Failed to fetch retailers by slugs",
+                original_error=e
+            ) from e
+    
     def get_all(self, active_only: bool = True) -> List[dict]:
         """Retrieve all retailers."""
         try:
@@ -611,7 +1327,12 @@ class RetailerRepository:
                 original_error=e
             ) from e
     
-    def get_all_with_counts(self, active_only: bool = True) -> List[dict]:
+    def get_all_with_counts(
+        self,
+        active_only: bool = True,
+        use_cache: bool = True,
+        cache_ttl: float = 60.0,
+    ) -> List[dict]:
         """
         Retrieve all retailers with their product listing counts.
         
@@ -620,10 +1341,19 @@ class RetailerRepository:
         
         Args:
             active_only: If True, only return active retailers
+            use_cache: Whether to use cached results (default True)
+            cache_ttl: Cache time-to-live in seconds (default 60)
             
         Returns:
             List of retailer dicts with 'product_count' field
         """
+        cache_key = f"retailers_with_counts:{active_only}"
+        
+        if use_cache:
+            cached = _cache.get(cache_key, cache_ttl)
+            if cached is not None:
+                return cached
+        
         try:
             # Get all retailers
             query = self.client.table(self.TABLE_NAME).select("*")
@@ -636,21 +1366,11 @@ class RetailerRepository:
                 return []
             
             # Get counts from product_prices for each retailer
-            # Supabase doesn't support GROUP BY easily, so we fetch and count
-            prices_response = (
-                self.client
-                .table("product_prices")
-                .select("retailer_id")
-                .execute()
-            )
-            prices = prices_response.data if prices_response and prices_response.data else []
-            
-            # Count products per retailer
-            counts = {}
-            for price in prices:
-                rid = price.get("retailer_id")
-                if rid:
-                    counts[rid] = counts.get(rid, 0) + 1
+            counts = None
+            if self.listing_counts_rpc_available:
+                counts = self._get_listing_counts_grouped()
+            if counts is None:
+                counts = self._get_listing_counts_streamed()
             
             # Attach counts to retailers
             for retailer in retailers:
@@ -659,6 +1379,7 @@ class RetailerRepository:
             # Sort by product_count descending (most products first)
             retailers.sort(key=lambda r: r.get("product_count", 0), reverse=True)
             
+            _cache.set(cache_key, retailers)
             return retailers
             
         except Exception as e:
@@ -668,6 +1389,58 @@ class RetailerRepository:
                 original_error=e
             ) from e
 
+    
+    def _get_listing_counts_grouped(self) -> Optional[dict]:
+        """
+        Count listings per retailer with one GROUP BY in the database.
+        
+        Returns:
+            Dict mapping retailer ID to listing count, or None if the
+            get_retailer_listing_counts function is not installed
+        """
+        response = call_optional_rpc(
+            self, "listing_counts_rpc_available", "get_retailer_listing_counts", {},
+            "counting listings row by row",
+        )
+        if response is None:
+            return None
+        
+        return {
+            row["retailer_id"]: row["listing_count"]
+            for row in response.data or []
+            if row["retailer_id"]
+        }
+    
+    def _get_listing_counts_streamed(self) -> dict:
+        """Count listings per retailer by streaming every price row."""
+        counts = {}
+        for price in _iter_rows(
+            lambda: (
+                self.client
+                .table("product_prices")
+                .select("retailer_id")
+                .order("id")
+            )
+        ):
+            rid = price.get("retailer_id")
+            if rid:
+                counts[rid] = counts.get(rid, 0) + 1
+        return counts
+
+
+def _violates_retailer_fk(error: Exception) -> bool:
+    """
+    Whether a foreign key violation on product_prices is on retailer_id.
+    
+    Read from the error's structured fields: Postgres puts the key in its
+    detail ('Key (retailer_id)=(...) is not present ...') and the
+    constraint name (product_prices_retailer_id_fkey) in its message.
+    """
+    details = getattr(error, "details", None) or ""
+    if details.startswith("Key ("):
+        return details.startswith("Key (retailer_id)=")
+    return "_retailer_id_fkey" in (getattr(error, "message", None) or "")
+
 
 class PriceRepository:
     """
@@ -677,6 +1450,20 @@ class PriceRepository:
     TABLE_NAME = "product_prices"
     _client = None
     
+    # Only the columns the product listing endpoints read from a price row
+    LISTING_COLUMNS = "product_id, price, in_stock, product_url, retailers(name, slug)"
+    # Listing columns plus the price row ID, for the product detail page
+    DETAIL_COLUMNS = "id, " + LISTING_COLUMNS
+    
+    # sort_by -> (column, descending) for listing sorts on this table's columns
+    KEYSET_SORTS = {
+        "price_asc": ("price", False),
+        "price_desc": ("price", True),
+    }
+    
+    # Cleared if the admin_bulk_update_prices function turns out to be missing
+    bulk_update_rpc_available = True
+    
     @property
     def client(self):
         """Lazy-load the Supabase client on first access."""
@@ -704,14 +1491,65 @@ class PriceRepository:
                 original_error=e
             ) from e
     
-    def get_by_product_id(self, product_id: str) -> List[dict]:
-        """Retrieve all price records for a product."""
+    def get_by_product_urls(
+        self,
+        product_urls: List[str],
+        columns: str = "product_url",
+    ) -> List[dict]:
+        """
+        Retrieve the price records matching any of the given product URLs.
+        
+        URLs are looked up in chunks (to keep request URLs short) whose
+        requests overlap.
+        
+        Args:
+            product_urls: Product URLs at retailers
+            columns: Columns to select
+            
+        Returns:
+            Matching price records (missing URLs are skipped)
+        """
+        if not product_urls:
+            return []
+        
+        def fetch_batch(batch):
+            response = (
+                self.client
+                .table(self.TABLE_NAME)
+                .select(columns)
+                .in_("product_url", batch)
+                .execute()
+            )
+            return response.data if response and response.data else []
+        
+        try:
+            return _run_batches(fetch_batch, product_urls, batch_size=50)
+        except Exception as e:
+            logger.error(f"Failed to fetch prices by product URLs: {e}")
+            raise ProductRepositoryError(
+                "Failed to fetch prices by product URLs",
+                original_error=e
+            ) from e
+    
+    def get_by_product_id(
+        self,
+        product_id: str,
+        columns: str = "*, retailers(*)",
+    ) -> List[dict]:
+        """
+        Retrieve all price records for a product, cheapest first.
+        
+        Args:
+            product_id: Product UUID
+            columns: PostgREST select expression (defaults to full rows)
+        """
         try:
             response = (
                 self.client
                 .table(self.TABLE_NAME)
-                .select("*, retailers(*)")
+                .select(columns)
                 .eq("product_id", product_id)
+                .order("price")
                 .execute()
             )
             return response.data if response and response.data else []
@@ -722,7 +1560,14 @@ class PriceRepository:
                 original_error=e
             ) from e
     
-    def get_by_product_ids(self, product_ids: List[str]) -> List[dict]:
+    def get_by_product_ids(
+        self,
+        product_ids: Iterable[str],
+        columns: str = "*, retailers(*)",
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        retailers: Optional[List[str]] = None,
+    ) -> List[dict]:
         """
         Retrieve all price records for multiple products.
         
@@ -734,11 +1579,17 @@ class PriceRepository:
         "JSON could not be generated" errors.
         
         Args:
-            product_ids: List of product UUIDs
+            product_ids: Product UUIDs (any iterable; duplicates are ignored)
+            columns: PostgREST select expression (defaults to full rows)
+            min_price: Optional minimum price filter
+            max_price: Optional maximum price filter
+            retailers: Optional list of retailer slugs to filter by
             
         Returns:
             List of price records with retailer data
         """
+        # Materialize once (order-preserving dedupe) so batches can be sliced
+        product_ids = list(dict.fromkeys(product_ids))
         if not product_ids:
             return []
         
@@ -747,16 +1598,26 @@ class PriceRepository:
         BATCH_SIZE = 100
         all_results = []
         
+        if retailers:
+            # Filtering on an embedded table needs an inner join
+            columns = columns.replace("retailers(", "retailers!inner(")
+        
         try:
             for i in range(0, len(product_ids), BATCH_SIZE):
                 batch = product_ids[i:i + BATCH_SIZE]
-                response = (
+                query = (
                     self.client
                     .table(self.TABLE_NAME)
-                    .select("*, retailers(*)")
+                    .select(columns)
                     .in_("product_id", batch)
-                    .execute()
                 )
+                if min_price is not None:
+                    query = query.gte("price", min_price)
+                if max_price is not None:
+                    query = query.lte("price", max_price)
+                if retailers:
+                    query = query.in_("retailers.slug", retailers)
+                response = query.execute()
                 if response and response.data:
                     all_results.extend(response.data)
             
@@ -768,6 +1629,38 @@ class PriceRepository:
                 original_error=e
             ) from e
     
+    def get_listing_prices_by_product_ids(
+        self,
+        product_ids: Iterable[str],
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        retailers: Optional[List[str]] = None,
+    ) -> List[dict]:
+        """
+        Retrieve slim price rows for multiple products.
+        
+        Same as get_by_product_ids but only selects LISTING_COLUMNS, which
+        keeps list responses small: no timestamps, IDs or full retailer rows
+        are transferred and decoded just to be thrown away. Price range and
+        retailer filters are applied by the database.
+        
+        Args:
+            product_ids: Product UUIDs (any iterable; duplicates are ignored)
+            min_price: Optional minimum price filter
+            max_price: Optional maximum price filter
+            retailers: Optional list of retailer slugs to filter by
+            
+        Returns:
+            List of price records with retailer name and slug
+        """
+        return self.get_by_product_ids(
+            product_ids,
+            columns=self.LISTING_COLUMNS,
+            min_price=min_price,
+            max_price=max_price,
+            retailers=retailers,
+        )
+    
     def create(self, price_data: dict) -> dict:
         """Create a new price record."""
         try:
@@ -786,25 +1679,87 @@ class PriceRepository:
         except PriceCreationError:
             raise
         except Exception as e:
+            # 23503: foreign_key_violation, on either the product or the retailer
+            if getattr(e, "code", None) == "23503":
+                missing_error = (
+                    RetailerNotFoundError if _violates_retailer_fk(e) else ProductNotFoundError
+                )
+                raise missing_error(
+                    f"Price references a missing row: {price_data.get('product_url')}",
+                    original_error=e
+                ) from e
             logger.error(f"Failed to create price record: {e}")
             raise PriceCreationError(
                 f"Failed to create price for URL: {price_data.get('product_url')}",
                 original_error=e
             ) from e
     
-    def update(self, price_id: str, update_data: dict) -> Optional[dict]:
-        """Update an existing price record by ID."""
+    def create_many(self, prices_data: List[dict]) -> List[dict]:
+        """
+        Create many price records with one multi-row insert.
+        
+        A single statement, so either every row is inserted or none is.
+        Unlike upsert_many_by_url, an existing product URL is an error
+        rather than being moved to another product.
+        
+        Args:
+            prices_data: List of price dicts (keep it to a few hundred)
+            
+        Returns:
+            The created price records
+        """
+        if not prices_data:
+            return []
+        
+        try:
+            response = (
+                self.client
+                .table(self.TABLE_NAME)
+                .insert(prices_data)
+                .execute()
+            )
+            all_results = response.data if response and response.data else []
+            
+            logger.info(f"Created {len(all_results)} price records")
+            return all_results
+        except Exception as e:
+            logger.error(f"Failed to create {len(prices_data)} price records: {e}")
+            raise PriceCreationError(
+                f"Failed to create {len(prices_data)} price records",
+                original_error=e
+            ) from e
+    
+    def update(
+        self,
+        price_id: str,
+        update_data: dict,
+        product_id: Optional[str] = None,
+    ) -> Optional[dict]:
+        """
+        Update an existing price record by ID.
+        
+        Args:
+            price_id: Price record UUID
+            update_data: Dict containing fields to update
+            product_id: If given, only a price record of this product is
+                        updated
+            
+        Returns:
+            The updated price record or None if not found
+        """
         try:
             update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
             update_data["last_scraped_at"] = datetime.now(timezone.utc).isoformat()
             
-            response = (
+            query = (
                 self.client
                 .table(self.TABLE_NAME)
                 .update(update_data)
                 .eq("id", price_id)
-                .execute()
             )
+            if product_id is not None:
+                query = query.eq("product_id", product_id)
+            response = query.execute()
             if response and response.data:
                 logger.info(f"Updated price record ID: {price_id}")
                 return response.data[0]
@@ -816,10 +1771,50 @@ class PriceRepository:
                 original_error=e
             ) from e
     
+    def update_many(self, product_id: str, rows: List[dict]) -> Optional[List[dict]]:
+        """
+        Update many price records of one product via one RPC call.
+        
+        Calls the admin_bulk_update_prices function (products.sql), a single
+        UPDATE ... FROM over the given rows. Rows of other products are
+        ignored.
+        
+        Args:
+            product_id: Product UUID the price records belong to
+            rows: Dicts with 'price_id' and any of 'price', 'in_stock',
+                  'product_url' (price IDs must be unique)
+            
+        Returns:
+            The updated price records, or None if the function is not
+            installed
+        """
+        if not rows:
+            return []
+        
+        try:
+            response = call_optional_rpc(
+                self, "bulk_update_rpc_available", "admin_bulk_update_prices",
+                {"p_product_id": product_id, "p_rows": rows}, "updating one by one",
+            )
+        except Exception as e:
+            logger.error(f"Failed to bulk update {len(rows)} prices of '{product_id}': {e}")
+            raise ProductRepositoryError(
+                f"Failed to bulk update prices of product: {product_id}",
+                original_error=e
+            ) from e
+        
+        if response is None:
+            return None
+        return response.data or []
+    
     def upsert_by_url(self, price_data: dict) -> dict:
         """
         Create or update a price record by product URL.
         
+        A single ON CONFLICT (product_url) round trip instead of a lookup
+        followed by an insert or update. The row is stamped with
+        last_scraped_at for staleness detection.
+        
         Args:
             price_data: Dict containing price fields (must include 'product_url')
             
@@ -831,11 +1826,17 @@ class PriceRepository:
             raise PriceCreationError("Price data must include 'product_url' for upsert")
         
         try:
-            existing = self.get_by_product_url(product_url)
-            if existing:
-                return self.update(existing["id"], price_data)
-            return self.create(price_data)
-        except (PriceCreationError, PriceUpdateError):
+            row = {**price_data, "last_scraped_at": datetime.now(timezone.utc).isoformat()}
+            response = (
+                self.client
+                .table(self.TABLE_NAME)
+                .upsert(row, on_conflict="product_url")
+                .execute()
+            )
+            if response and response.data:
+                return response.data[0]
+            raise PriceCreationError(f"Upsert returned no data for price: {product_url}")
+        except PriceCreationError:
             raise
         except Exception as e:
             logger.error(f"Failed to upsert price by URL '{product_url}': {e}")
@@ -844,6 +1845,47 @@ class PriceRepository:
                 original_error=e
             ) from e
 
+    def upsert_many_by_url(self, prices_data: List[dict]) -> List[dict]:
+        """
+        Create or update many price records by product URL using bulk upserts.
+        
+        Every row is stamped with last_scraped_at so staleness detection
+        treats bulk-ingested prices the same as individually upserted ones.
+        Product URLs must be unique within the list.
+        
+        Args:
+            prices_data: List of price dicts (each must include 'product_url')
+            
+        Returns:
+            List of created or updated price records
+        """
+        if not prices_data:
+            return []
+        
+        now = datetime.now(timezone.utc).isoformat()
+        rows = [{**price_data, "last_scraped_at": now} for price_data in prices_data]
+        
+        def upsert_batch(batch):
+            response = (
+                self.client
+                .table(self.TABLE_NAME)
+                .upsert(batch, on_conflict="product_url")
+                .execute()
+            )
+            return response.data if response and response.data else []
+        
+        try:
+            all_results = _run_batches(upsert_batch, rows)
+            
+            logger.info(f"Upserted {len(all_results)} price records")
+            return all_results
+        except Exception as e:
+            logger.error(f"Failed to bulk upsert {len(rows)} price records: {e}")
+            raise PriceCreationError(
+                f"Failed to bulk upsert {len(rows)} price records",
+                original_error=e
+            ) from e
+
     def get_listings_paginated(
         self,
         page: int = 1,
@@ -856,6 +1898,9 @@ class PriceRepository:
         min_price: Optional[float] = None,
         max_price: Optional[float] = None,
         retailers: Optional[List[str]] = None,
+        after: Optional[Tuple[Any, str]] = None,
+        include_count: bool = True,
+        compat_filter: Optional[CompatFilter] = None,
     ) -> dict:
         """
         Get product listings (price records with product data) with DB-level pagination.
@@ -865,6 +1910,15 @@ class PriceRepository:
         fetching all products then all prices, this queries the prices 
         table directly with product data joined.
         
+        For the price sorts, *after* (the price and ID of the previous
+        page's last listing) switches to keyset pagination: the page starts
+        right after that row and no count query is made. Other sorts order
+        by a joined product column and always use offsets.
+        
+        The total count is cached per filter set for COUNT_CACHE_TTL
+        seconds; include_count=False skips it and fetches one extra row to
+        set has_next instead.
+        
         Args:
             page: Page number (1-indexed)
             page_size: Number of listings per page
@@ -875,6 +1929,9 @@ class PriceRepository:
             min_price: Optional minimum price filter
             max_price: Optional maximum price filter
             retailers: Optional list of retailer slugs to filter by
+            after: Optional (price, id) cursor row for keyset pagination
+            include_count: Whether to return total_count / total_pages
+            compat_filter: Optional compatibility constraint (joined in the DB)
             
         Returns:
             Dict with 'listings' and 'pagination' metadata
@@ -893,64 +1950,42 @@ class PriceRepository:
                     },
                 }
 
-            offset = (page - 1) * page_size
-            
-            # Select prices with product and retailer data joined
-            select_fields = "*, products!inner(*), retailers!inner(*)"
-            
-            # Build count query with same filters
-            count_query = self.client.table(self.TABLE_NAME).select(
-                "id, products!inner(category_slug, name, brand), retailers!inner(slug)", 
-                count="exact"
+            # Select the price fields a listing card shows, with the full
+            # product and just the retailer's name/slug joined
+            # An empty compat embed only filters, it adds nothing to the rows
+            compat_embed = ", product_compat!inner()" if compat_filter else ""
+            select_fields = (
+                "id, price, in_stock, product_url, "
+                f"products!inner(*{compat_embed}), retailers!inner(name, slug)"
             )
             
-            # Apply filters to count query
-            if category_slug:
-                count_query = count_query.eq("products.category_slug", category_slug)
-            if brands and len(brands) > 0:
-                count_query = count_query.in_("products.brand", brands)
-            if search:
-                count_query = count_query.or_(
-                    f"products.name.ilike.%{search}%,products.brand.ilike.%{search}%"
-                )
-            if product_ids and len(product_ids) > 0:
-                count_query = count_query.in_("product_id", product_ids)
-            if min_price is not None:
-                count_query = count_query.gte("price", min_price)
-            if max_price is not None:
-                count_query = count_query.lte("price", max_price)
-            if retailers and len(retailers) > 0:
-                count_query = count_query.in_("retailers.slug", retailers)
-            
-            count_response = count_query.execute()
-            total_count = count_response.count if count_response else 0
-            
-            # Build data query
-            query = self.client.table(self.TABLE_NAME).select(select_fields)
-            
-            # Apply same filters to data query
-            if category_slug:
-                query = query.eq("products.category_slug", category_slug)
-            if brands and len(brands) > 0:
-                query = query.in_("products.brand", brands)
-            if search:
-                query = query.or_(
-                    f"products.name.ilike.%{search}%,products.brand.ilike.%{search}%"
-                )
-            if product_ids and len(product_ids) > 0:
-                query = query.in_("product_id", product_ids)
-            if min_price is not None:
-                query = query.gte("price", min_price)
-            if max_price is not None:
-                query = query.lte("price", max_price)
-            if retailers and len(retailers) > 0:
-                query = query.in_("retailers.slug", retailers)
+            def apply_filters(query):
+                if category_slug:
+                    query = query.eq("products.category_slug", category_slug)
+                if brands and len(brands) > 0:
+                    query = query.in_("products.brand", brands)
+                if search:
+                    query = query.or_(
+                        f"products.name.ilike.%{search}%,products.brand.ilike.%{search}%"
+                    )
+                if product_ids and len(product_ids) > 0:
+                    query = query.in_("product_id", product_ids)
+                if min_price is not None:
+                    query = query.gte("price", min_price)
+                if max_price is not None:
+                    query = query.lte("price", max_price)
+                if retailers and len(retailers) > 0:
+                    query = query.in_("retailers.slug", retailers)
+                if compat_filter:
+                    query = apply_compat_filter(query, compat_filter, "products.product_compat")
+                return query
+            
+            query = apply_filters(self.client.table(self.TABLE_NAME).select(select_fields))
             
             # Apply sorting
-            if sort_by == "price_asc":
-                query = query.order("price", desc=False)
-            elif sort_by == "price_desc":
-                query = query.order("price", desc=True)
+            keyset = self.KEYSET_SORTS.get(sort_by)
+            if keyset:
+                query = _apply_keyset(query, *keyset, after)
             elif sort_by == "name_asc":
                 query = query.order("name", desc=False, foreign_table="products")
             elif sort_by == "name_desc":
@@ -959,10 +1994,38 @@ class PriceRepository:
                 # Default: newest first by product created_at
                 query = query.order("created_at", desc=True, foreign_table="products")
             
-            # Apply pagination
-            query = query.range(offset, offset + page_size - 1)
+            # Keyset pages start right after the cursor row
+            use_keyset = bool(keyset) and after is not None
+            offset = 0 if use_keyset else (page - 1) * page_size
+            
+            if use_keyset or not include_count:
+                response = query.range(offset, offset + page_size).execute()
+                listings, pagination = _page_without_count(
+                    response.data if response and response.data else [],
+                    page,
+                    page_size,
+                    keyset=use_keyset,
+                )
+                return {"listings": listings, "pagination": pagination}
+            
+            # Count with the same filters (HEAD: count only, no rows)
+            total_count = _cached_count(
+                "count:listings:" + repr((
+                    category_slug, brands, search, product_ids,
+                    min_price, max_price, retailers, compat_filter,
+                )),
+                lambda: apply_filters(
+                    self.client.table(self.TABLE_NAME).select(
+                        f"id, products!inner(category_slug, name, brand{compat_embed}), "
+                        "retailers!inner(slug)",
+                        count="exact",
+                        head=True,
+                    )
+                ),
+            )
             
-            response = query.execute()
+            # Apply pagination
+            response = query.range(offset, offset + page_size - 1).execute()
             listings = response.data if response and response.data else []
             
             total_pages = (total_count + page_size - 1) // page_size if total_count > 0 else 0
@@ -1012,41 +2075,30 @@ class PriceRepository:
             Number of records marked as out-of-stock
         """
         try:
-            # First, find stale records that need updating
-            # (Supabase doesn't return count on update, so we need to query first)
             cutoff_iso = scrape_cutoff_time.isoformat()
             
+            # One set-based UPDATE with the staleness filters; the returned
+            # rows tell us how many were changed
+            update_data = {
+                "in_stock": False,
+                "updated_at": datetime.now(timezone.utc).isoformat(),
+            }
             response = (
                 self.client
                 .table(self.TABLE_NAME)
-                .select("id")
+                .update(update_data)
                 .eq("retailer_id", retailer_id)
                 .eq("in_stock", True)
                 .lt("last_scraped_at", cutoff_iso)
                 .execute()
             )
             
-            stale_records = response.data if response and response.data else []
+            stale_count = len(response.data) if response and response.data else 0
             
-            if not stale_records:
+            if not stale_count:
                 logger.debug(f"No stale records found for retailer {retailer_id}")
                 return 0
             
-            stale_count = len(stale_records)
-            stale_ids = [r["id"] for r in stale_records]
-            
-            # Update all stale records to in_stock = false
-            update_data = {
-                "in_stock": False,
-                "updated_at": datetime.now(timezone.utc).isoformat(),
-            }
-            
-            # Batch update in chunks to avoid issues with large lists
-            BATCH_SIZE = 100
-            for i in range(0, len(stale_ids), BATCH_SIZE):
-                batch = stale_ids[i:i + BATCH_SIZE]
-                self.client.table(self.TABLE_NAME).update(update_data).in_("id", batch).execute()
-            
             logger.info(
                 f"Marked {stale_count} products as out-of-stock for retailer {retailer_id} "
                 f"(scraped before {cutoff_iso})"
@@ -1188,6 +2240,52 @@ class ProductSpecsRepository:
                 original_error=e
             ) from e
     
+    def upsert_many(self, specs_data: List[dict]) -> List[dict]:
+        """
+        Create or update specs for many products in bulk.
+        
+        Args:
+            specs_data: List of dicts with 'product_id', 'specs' and
+                        optional 'source_url'. Product IDs must be unique.
+            
+        Returns:
+            The created/updated specs records
+        """
+        if not specs_data:
+            return []
+        
+        now = datetime.now(timezone.utc).isoformat()
+        rows = [
+            {
+                "product_id": record["product_id"],
+                "specs": record["specs"],
+                "source_url": record.get("source_url"),
+                "updated_at": now,
+            }
+            for record in specs_data
+        ]
+        
+        def upsert_batch(batch):
+            response = (
+                self.client
+                .table(self.TABLE_NAME)
+                .upsert(batch, on_conflict="product_id")
+                .execute()
+            )
+            return response.data if response and response.data else []
+        
+        try:
+            all_results = _run_batches(upsert_batch, rows)
+            
+            logger.debug(f"Upserted specs for {len(all_results)} products")
+            return all_results
+        except Exception as e:
+            logger.error(f"Failed to bulk upsert specs for {len(rows)} products: {e}")
+            raise ProductCreationError(
+                f"Failed to bulk upsert specs",
+                original_error=e
+            ) from e
+    
     def delete_by_product_id(self, product_id: str) -> bool:
         """
         Delete specs for a product.
@@ -5,10 +5,84 @@ These serializers handle input validation and output formatting
 for the products API endpoints.
 """
 
+import copy
+import re
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from django.core.validators import URLValidator
 from rest_framework import serializers
 
+from products.pagination import decode_cursor
+from products.renderers import OrjsonRenderer
+
+
+# Plain http(s) URLs with an ASCII host name: a strict subset of what
+# URLValidator accepts, matched by one anchored regex. Anything else
+# (other schemes, IPs, IDNs, user info, trailing dots) takes the full check.
+_SIMPLE_URL_RE = re.compile(
+    r"https?://"
+    r"(?P<host>[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?"
+    r"(?:\.[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?)*"
+    r"\.[a-z]{2,63})"
+    r"(?::[0-9]{1,5})?"
+    r"(?:[/?#][^\s]*)?",
+    re.IGNORECASE,
+)
+
+
+class FastURLValidator(URLValidator):
+    """
+    URLValidator with a fast path for ordinary product and image URLs.
+    
+    URLValidator splits the URL, runs its large Unicode-aware regex and
+    then re-parses the host; scraped and imported URLs are nearly all plain
+    http(s) links, which one small regex proves valid. Values it does not
+    match are checked by URLValidator, so the accepted set is unchanged.
+    """
+    
+    def __call__(self, value):
+        if isinstance(value, str) and len(value) <= self.max_length:
+            match = _SIMPLE_URL_RE.fullmatch(value)
+            if match and len(match.group("host")) <= 253:
+                return
+        super().__call__(value)
+
+
+class FastURLField(serializers.URLField):
+    """URLField validated with FastURLValidator; for bulk input payloads."""
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.validators = [
+            FastURLValidator(message=self.error_messages["invalid"])
+            if type(validator) is URLValidator else validator
+            for validator in self.validators
+        ]
+
+
+class CachedFieldsMixin:
+    """
+    Build a serializer's fields once per class instead of per instance.
+    
+    Serializer.get_fields() deep-copies every declared field (including
+    nested serializers) each time a serializer is created, i.e. on every
+    response. Read-only output serializers can share one deep copy per
+    class and hand each instance shallow copies, which are enough for
+    binding the field to its new parent.
+    """
+    
+    _fields_cache = {}
+    
+    def get_fields(self):
+        cls = self.__class__
+        cached = self._fields_cache.get(cls)
+        if cached is None:
+            cached = super().get_fields()
+            self._fields_cache[cls] = cached
+        return {name: copy.copy(field) for name, field in cached.items()}
+
 
-class RetailerSerializer(serializers.Serializer):
+class RetailerSerializer(CachedFieldsMixin, serializers.Serializer):
     """Serializer for retailer data in product responses."""
     
     id = serializers.UUIDField(read_only=True)
@@ -19,7 +93,7 @@ class RetailerSerializer(serializers.Serializer):
     product_count = serializers.IntegerField(read_only=True, required=False, default=0)
 
 
-class ProductPriceSerializer(serializers.Serializer):
+class ProductPriceSerializer(CachedFieldsMixin, serializers.Serializer):
     """Serializer for product price from a retailer."""
     
     priceId = serializers.CharField(required=False, allow_blank=True, help_text="Price record UUID")
@@ -30,7 +104,7 @@ class ProductPriceSerializer(serializers.Serializer):
     url = serializers.URLField(help_text="Product URL at retailer")
 
 
-class ProductSerializer(serializers.Serializer):
+class ProductSerializer(CachedFieldsMixin, serializers.Serializer):
     """Serializer for product listing responses."""
     
     id = serializers.UUIDField(read_only=True)
@@ -48,24 +122,174 @@ class ProductSerializer(serializers.Serializer):
     in_stock_count = serializers.IntegerField(read_only=True, required=False, default=0)
 
 
-class ProductListQuerySerializer(serializers.Serializer):
-    """Serializer for product list query parameters."""
-    
-    category = serializers.CharField(required=False)
-    brand = serializers.CharField(required=False)
-    search = serializers.CharField(required=False)
-    sort = serializers.CharField(required=False)  # Sort option: newest, name_asc, name_desc, price_asc, price_desc
-    cpu_id = serializers.CharField(required=False)
-    motherboard_id = serializers.CharField(required=False)
-    compat_mode = serializers.ChoiceField(required=False, choices=["strict", "lenient"])
-    min_price = serializers.IntegerField(required=False, min_value=0)
-    max_price = serializers.IntegerField(required=False, min_value=0)
-    retailers = serializers.CharField(required=False)  # Comma-separated retailer slugs
-    in_stock = serializers.BooleanField(required=False)
-    grouped = serializers.BooleanField(required=False, default=True)  # Group all retailers under one product (default: True for browsing)
+def _project_product(product: dict) -> dict:
+    return {
+        "id": product["id"],
+        "listing_id": product.get("listing_id"),
+        "name": product["name"],
+        "slug": product["slug"],
+        "category": product["category"],
+        "categorySlug": product["category_slug"],
+        "brand": product.get("brand"),
+        "image": product.get("image_url"),
+        "specs": product.get("specs", {}),
+        "retailers": [
+            {
+                "name": entry.name,
+                "price": float(entry.price),
+                "inStock": bool(entry.inStock),
+                "url": entry.url,
+            }
+            for entry in product["retailers"]
+        ],
+        "total_retailers": product.get("total_retailers", 1),
+        "in_stock_count": product.get("in_stock_count", 0),
+    }
+
+
+def serialize_product_list(products: List[dict]) -> List[dict]:
+    """
+    Render list-endpoint products in ProductSerializer's output shape.
+    
+    The list endpoints return hundreds of field values per page in a fixed
+    shape the service layer already builds (JSON-decoded columns plus
+    RetailerEntry tuples), so they are projected directly instead of
+    running each value through a DRF Field. The output must stay identical
+    to ProductSerializer(products, many=True).data; single-product
+    endpoints keep using the serializer.
+    """
+    return [_project_product(product) for product in products]
+
+
+# Same encoding as the products API's non-streamed responses
+_stream_encode = OrjsonRenderer.encode
+
+
+def stream_product_list(products: List[dict], pagination: dict) -> Iterator[bytes]:
+    """
+    Encode a product list response incrementally.
+    
+    Yields the same document as Response({"products": ..., "pagination":
+    ...}) would render, one product at a time, so the first bytes go out
+    before the whole page is encoded and the page is never held as one
+    encoded string.
+    """
+    yield b'{"products":['
+    for index, product in enumerate(products):
+        chunk = _stream_encode(_project_product(product))
+        yield chunk if index == 0 else b"," + chunk
+    yield b'],"pagination":' + _stream_encode(pagination) + b"}"
+
+
+# Same convention as DRF's IntegerField: "5.0" is accepted as 5
+_TRAILING_DECIMAL_ZEROS = re.compile(r"\.0*\s*$")
+# Separator of comma-separated list params, whitespace included
+_CSV_SEPARATOR = re.compile(r"\s*,\s*")
+
+
+def _parse_text(value: str) -> str:
+    value = value.strip()
+    if not value:
+        raise ValueError("This field may not be blank.")
+    return value
+
+
+def _parse_csv(value: str) -> List[str]:
+    return [item for item in _CSV_SEPARATOR.split(_parse_text(value)) if item]
+
+
+def _parse_bool(value: str) -> bool:
+    value = value.lower()
+    if value in serializers.BooleanField.TRUE_VALUES:
+        return True
+    if value in serializers.BooleanField.FALSE_VALUES:
+        return False
+    raise ValueError("Must be a valid boolean.")
+
+
+def _int_parser(min_value: int, max_value: Optional[int] = None) -> Callable[[str], int]:
+    def parse(value: str) -> int:
+        try:
+            number = int(_TRAILING_DECIMAL_ZEROS.sub("", value))
+        except ValueError:
+            raise ValueError("A valid integer is required.") from None
+        if number < min_value:
+            raise ValueError(f"Ensure this value is greater than or equal to {min_value}.")
+        if max_value is not None and number > max_value:
+            raise ValueError(f"Ensure this value is less than or equal to {max_value}.")
+        return number
+    return parse
+
+
+def _parse_compat_mode(value: str) -> str:
+    if value not in ("strict", "lenient"):
+        raise ValueError(f'"{value}" is not a valid choice.')
+    return value
+
+
+def _parse_cursor(value: str):
+    try:
+        return decode_cursor(_parse_text(value))
+    except ValueError:
+        raise ValueError("Invalid cursor") from None
+
+
+# Product list query parameters and their parsers. Built once at import so
+# the hot list endpoint does one dict lookup per parameter instead of
+# running a DRF serializer's field pipeline on every request.
+PRODUCT_LIST_PARAM_PARSERS: Dict[str, Callable[[str], Any]] = {
+    "category": _parse_text,
+    "brand": _parse_csv,  # Comma-separated brand names, as a list
+    "search": _parse_text,
+    "sort": _parse_text,  # Sort option: newest, name_asc, name_desc, price_asc, price_desc
+    "cpu_id": _parse_text,
+    "motherboard_id": _parse_text,
+    "compat_mode": _parse_compat_mode,  # 'strict' or 'lenient'
+    "min_price": _int_parser(min_value=0),
+    "max_price": _int_parser(min_value=0),
+    "retailers": _parse_csv,  # Comma-separated retailer slugs, as a list
+    "in_stock": _parse_bool,
+    "grouped": _parse_bool,  # Group all retailers under one product
     # Pagination parameters
-    page = serializers.IntegerField(required=False, default=1, min_value=1)
-    page_size = serializers.IntegerField(required=False, default=24, min_value=1, max_value=100)
+    "page": _int_parser(min_value=1),
+    "page_size": _int_parser(min_value=1, max_value=100),
+    "cursor": _parse_cursor,  # Opaque next_cursor from a previous page, decoded
+    "include_count": _parse_bool,  # False skips total_count/total_pages
+    "stream": _parse_bool,  # Stream the response body product by product
+}
+
+PRODUCT_LIST_PARAM_DEFAULTS: Dict[str, Any] = {
+    "in_stock": False,
+    "grouped": True,  # Default: True for browsing
+    "page": 1,
+    "page_size": 24,
+    "include_count": True,
+    "stream": False,
+}
+
+
+def parse_product_list_params(query_params) -> Tuple[Dict[str, Any], Dict[str, List[str]]]:
+    """
+    Validate product list query parameters.
+    
+    Unknown and empty parameters are ignored; the last value of a repeated
+    parameter wins, as with request.query_params.get().
+    
+    Returns:
+        (params, errors) where errors maps parameter names to messages in
+        the same shape as serializer.errors
+    """
+    params = dict(PRODUCT_LIST_PARAM_DEFAULTS)
+    errors = {}
+    for name, value in query_params.items():
+        parse = PRODUCT_LIST_PARAM_PARSERS.get(name)
+        if parse is None or value == "":
+            continue
+        try:
+            params[name] = parse(value)
+        except ValueError as e:
+            errors[name] = [str(e)]
+    return params, errors
 
 
 class PaginatedProductListSerializer(serializers.Serializer):
@@ -84,10 +308,10 @@ class ScrapedProductSerializer(serializers.Serializer):
     
     name = serializers.CharField(max_length=500)
     price = serializers.FloatField(min_value=0)
-    product_url = serializers.URLField()
+    product_url = FastURLField()
     retailer_slug = serializers.CharField(max_length=100)
     category = serializers.CharField(max_length=100)
-    image_url = serializers.URLField(required=False, allow_null=True)
+    image_url = FastURLField(required=False, allow_null=True)
     brand = serializers.CharField(max_length=100, required=False, allow_null=True)
     in_stock = serializers.BooleanField(default=True)
     specs = serializers.JSONField(default=dict, required=False)
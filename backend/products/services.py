@@ -12,10 +12,19 @@ Follows clean architecture principles:
 
 import logging
 import re
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
 from datetime import datetime, timezone
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, NamedTuple
+from cachetools import TTLCache
 from slugify import slugify
 
+from products.pagination import encode_cursor
+from products.repositories.compat_repository import CompatFilter
+
 from products.repositories.supabase import (
     product_repository,
     retailer_repository,
@@ -32,6 +41,134 @@ from products.repositories.exceptions import (
 
 logger = logging.getLogger(__name__)
 
+# Precompiled once; _normalize_text runs for every scraped item
+_WHITESPACE_RE = re.compile(r'\s+')
+
+KNOWN_BRANDS = (
+    "AMD", "Intel", "NVIDIA", "ASUS", "MSI", "Gigabyte",
+    "Corsair", "G.Skill", "Kingston", "Samsung", "Western Digital",
+    "Seagate", "Crucial", "NZXT", "Cooler Master", "be quiet!",
+    "Noctua", "EVGA", "Zotac", "Sapphire", "PowerColor",
+    "ASRock", "Biostar", "Thermaltake", "Seasonic", "Lian Li",
+    "Phanteks", "Fractal Design", "LG", "BenQ", "Dell", "HP",
+    "Acer", "ViewSonic", "Logitech", "Razer", "SteelSeries",
+    "HyperX", "Team", "PNY", "Adata", "Patriot", "Antec",
+    "DeepCool", "Arctic", "XPG", "Toshiba", "WD",
+)
+
+# Uppercased brand -> canonical spelling
+_BRAND_BY_UPPER = {brand.upper(): brand for brand in KNOWN_BRANDS}
+
+# All known brands as one alternation, so a name is scanned once instead of
+# once per brand. Longest names go first so "Western Digital" beats "WD".
+# Lookarounds (not \b) keep brands like "be quiet!" matchable.
+_BRAND_RE = re.compile(
+    r'(?<![A-Za-z0-9])(?:'
+    + '|'.join(re.escape(b) for b in sorted(KNOWN_BRANDS, key=len, reverse=True))
+    + r')(?![A-Za-z0-9])',
+    re.IGNORECASE,
+)
+
+
+@lru_cache(maxsize=256)
+def slugify_category(category: str) -> str:
+    """Slugify a category name; there are only a handful of distinct ones."""
+    return slugify(category, lowercase=True)
+
+
+@lru_cache(maxsize=4096)
+def slugify_product_name(name: str) -> str:
+    """Slugify a product name; names repeat across retailers, re-scrapes and edits."""
+    return slugify(name, lowercase=True, max_length=200)
+
+
+class RetailerEntry(NamedTuple):
+    """
+    One retailer's offer in a product's 'retailers' list.
+    
+    Built for every price row on every listing page, so it is a tuple
+    rather than a dict. ProductPriceSerializer reads the fields as
+    attributes, which DRF does for any non-mapping instance.
+    """
+    name: str
+    price: float
+    inStock: bool
+    url: str
+
+
+def _format_retailer_entry(price: dict) -> RetailerEntry:
+    """
+    Shape a price row (with embedded retailer) into a 'retailers' entry.
+    
+    PostgREST already returns the DECIMAL price column as a JSON number, and
+    ProductPriceSerializer's FloatField coerces it on output, so the value is
+    passed through as-is.
+    """
+    retailer_data = price.get("retailers") or {}
+    return RetailerEntry(
+        retailer_data.get("name", "Unknown"),
+        price["price"],
+        price.get("in_stock", True),
+        price["product_url"],
+    )
+
+
+def _format_retailer_entries(prices: List[dict]) -> List[RetailerEntry]:
+    """Shape a product's price rows into its 'retailers' list."""
+    return [_format_retailer_entry(price) for price in prices]
+
+
+def _set_next_cursor(pagination: Dict[str, Any], rows: List[dict], column: str) -> None:
+    """Add a next_cursor pointing after the last row to pagination metadata."""
+    if pagination.get("has_next") and rows:
+        last = rows[-1]
+        pagination["next_cursor"] = encode_cursor(last[column], last["id"])
+
+
+def _group_prices_by_product(prices: List[dict]) -> Dict[str, List[dict]]:
+    """Bucket price rows by their product_id."""
+    prices_by_product = defaultdict(list)
+    for price in prices:
+        prices_by_product[price["product_id"]].append(price)
+    return prices_by_product
+
+
+# Storefront product payloads (product + formatted retailers). Prices only
+# change when the scraper or an admin writes, so entries live for a few
+# minutes and are dropped on any in-process write.
+_product_cache = TTLCache(maxsize=1024, ttl=300)
+_product_cache_lock = threading.Lock()
+
+
+def _get_cached_product(key):
+    with _product_cache_lock:
+        return _product_cache.get(key)
+
+
+def _set_cached_product(key, value):
+    with _product_cache_lock:
+        _product_cache[key] = value
+
+
+def _empty_pagination(page: int, page_size: int, include_count: bool = True) -> dict:
+    """Pagination metadata for a listing with no products."""
+    if include_count:
+        return {
+            "page": page,
+            "page_size": page_size,
+            "total_count": 0,
+            "total_pages": 0,
+            "has_next": False,
+            "has_prev": False,
+        }
+    return {"page": page, "page_size": page_size, "has_next": False, "has_prev": False}
+
+
+def invalidate_product_cache() -> None:
+    """Drop every cached product payload (call after product or price writes)."""
+    with _product_cache_lock:
+        _product_cache.clear()
+
 
 class ProductIngestionService:
     """
@@ -41,6 +178,11 @@ class ProductIngestionService:
     and persisting them to the database with proper normalization.
     """
     
+    REQUIRED_FIELDS = ("name", "price", "product_url", "retailer_slug", "category")
+    
+    # Upper bound on concurrent per-item ingests in the fallback path
+    MAX_INGEST_WORKERS = 8
+    
     def __init__(
         self,
         product_repo=None,
@@ -53,7 +195,11 @@ class ProductIngestionService:
         self.price_repo = price_repo or price_repository
         self.specs_repo = specs_repo or product_specs_repository
     
-    def ingest_scraped_product(self, scraped_data: Dict[str, Any]) -> Optional[dict]:
+    def ingest_scraped_product(
+        self,
+        scraped_data: Dict[str, Any],
+        retailer_cache: Optional[Dict[str, dict]] = None,
+    ) -> Optional[dict]:
         """
         Main entry point for ingesting a single scraped product.
         
@@ -73,20 +219,21 @@ class ProductIngestionService:
                 - brand: Product brand (optional)
                 - in_stock: Stock availability (optional, default True)
                 - specs: Product specifications dict (optional)
+            retailer_cache: Optional slug -> retailer dict shared across calls,
+                            so repeated slugs are only looked up once
         
         Returns:
             Dict containing the product and price data, or None on failure
         """
         try:
             # Validate required fields
-            required_fields = ["name", "price", "product_url", "retailer_slug", "category"]
-            for field in required_fields:
+            for field in self.REQUIRED_FIELDS:
                 if not scraped_data.get(field):
                     logger.error(f"Missing required field: {field}")
                     return None
             
             # Get retailer
-            retailer = self.retailer_repo.get_by_slug(scraped_data["retailer_slug"])
+            retailer = self._resolve_retailer(scraped_data["retailer_slug"], retailer_cache)
             if not retailer:
                 logger.error(f"Retailer not found: {scraped_data['retailer_slug']}")
                 raise RetailerNotFoundError(
@@ -147,6 +294,9 @@ class ProductIngestionService:
         were NOT included in this batch will be marked as out-of-stock. This 
         handles the case where products disappear from scrape results.
         
+        Items are written with bulk upserts; if a bulk write fails the batch
+        is retried one item at a time.
+        
         Args:
             scraped_items: List of scraped product dictionaries
             retailer_slug: Optional retailer slug for staleness detection.
@@ -161,21 +311,30 @@ class ProductIngestionService:
         
         results = {"success": 0, "failed": 0, "marked_out_of_stock": 0}
         
-        for item in scraped_items:
-            try:
-                result = self.ingest_scraped_product(item)
-                if result:
-                    results["success"] += 1
-                else:
-                    results["failed"] += 1
-            except Exception as e:
-                logger.error(f"Unexpected error ingesting item: {e}")
-                results["failed"] += 1
+        # Retailer slugs repeat across the whole batch; resolve each once
+        retailer_cache: Dict[str, dict] = {}
+        
+        try:
+            results["success"], results["failed"] = self._ingest_items_bulk(
+                scraped_items, retailer_cache
+            )
+        except ProductRepositoryError as e:
+            # Upserts are idempotent, so redoing the batch row by row is safe
+            # and isolates the rows that made the bulk write fail.
+            logger.warning(f"Bulk ingestion failed, retrying item by item: {e}")
+            results["success"], results["failed"] = self._ingest_items_one_by_one(
+                scraped_items, retailer_cache
+            )
+        
+        # Counts, brands and product payloads may have changed
+        if results["success"]:
+            self.product_repo.invalidate_listing_caches()
+            invalidate_product_cache()
         
         # After processing batch, mark stale products as out-of-stock
         if retailer_slug:
             try:
-                retailer = self.retailer_repo.get_by_slug(retailer_slug)
+                retailer = self._resolve_retailer(retailer_slug, retailer_cache)
                 if retailer:
                     stale_count = self.price_repo.mark_stale_as_out_of_stock(
                         retailer_id=retailer["id"],
@@ -198,6 +357,225 @@ class ProductIngestionService:
         logger.info(f"Batch ingestion complete: {results}")
         return results
     
+    def _resolve_retailer(
+        self,
+        slug: str,
+        retailer_cache: Optional[Dict[str, dict]] = None,
+    ) -> Optional[dict]:
+        """Look up a retailer by slug, consulting and filling the cache if given."""
+        if retailer_cache is None:
+            return self.retailer_repo.get_by_slug(slug)
+        if slug not in retailer_cache:
+            retailer_cache[slug] = self.retailer_repo.get_by_slug(slug)
+        return retailer_cache[slug]
+    
+    def _ingest_items_bulk(
+        self,
+        scraped_items: List[Dict[str, Any]],
+        retailer_cache: Dict[str, dict],
+    ) -> Tuple[int, int]:
+        """
+        Ingest items with a fixed number of bulk round trips.
+        
+        Retailers are resolved with one query. Products, prices and specs
+        are then written in a single transaction through the
+        ingest_products_atomic RPC, or, if that function is unavailable,
+        with one bulk upsert per table. When several items share a product
+        slug or product URL, the last one wins, matching what sequential
+        per-item upserts would leave behind.
+        
+        Returns:
+            Tuple of (success_count, failed_count)
+        
+        Raises:
+            ProductRepositoryError: If a bulk product or price write fails
+        """
+        failed = 0
+        valid_items = []
+        for item in scraped_items:
+            missing = next((f for f in self.REQUIRED_FIELDS if not item.get(f)), None)
+            if missing:
+                logger.error(f"Missing required field: {missing}")
+                failed += 1
+                continue
+            valid_items.append(item)
+        
+        if not valid_items:
+            return 0, failed
+        
+        # Resolve all uncached retailer slugs with one query
+        missing_slugs = list(
+            {item["retailer_slug"] for item in valid_items} - retailer_cache.keys()
+        )
+        if missing_slugs:
+            found = {r["slug"]: r for r in self.retailer_repo.get_by_slugs(missing_slugs)}
+            for slug in missing_slugs:
+                retailer_cache[slug] = found.get(slug)
+        
+        # Prepare product rows (deduplicated by slug) and price rows; the
+        # price rows get their product_id once the product is written
+        products_by_slug = {}
+        entries = []
+        for item in valid_items:
+            retailer = retailer_cache[item["retailer_slug"]]
+            if not retailer:
+                logger.error(f"Retailer not found: {item['retailer_slug']}")
+                failed += 1
+                continue
+            product_data = self._prepare_product_data(item)
+            if not product_data["slug"]:
+                logger.error(f"Could not generate slug for product: {item['name']}")
+                failed += 1
+                continue
+            try:
+                price_data = self._prepare_price_data(
+                    product_id=None,
+                    retailer_id=retailer["id"],
+                    scraped_data=item,
+                )
+            except (TypeError, ValueError) as e:
+                logger.error(f"Invalid price for {item['name']}: {e}")
+                failed += 1
+                continue
+            products_by_slug[product_data["slug"]] = product_data
+            entries.append((item, product_data["slug"], price_data))
+        
+        if not entries:
+            return 0, failed
+        
+        saved_urls = None
+        if getattr(self.product_repo, "atomic_ingest_available", False):
+            try:
+                saved_urls = self._write_entries_atomic(entries, products_by_slug)
+            except ProductRepositoryError as e:
+                # Earlier chunks may already be written; the bulk upserts
+                # are idempotent, so the whole batch is written again
+                logger.error(f"Atomic ingestion failed, rewriting the batch with bulk upserts: {e}")
+        if saved_urls is None:
+            saved_urls = self._write_entries_bulk(entries, products_by_slug)
+        
+        success = sum(1 for _, _, price_data in entries if price_data["product_url"] in saved_urls)
+        failed += len(entries) - success
+        return success, failed
+    
+    def _write_entries_atomic(
+        self,
+        entries: List[Tuple[Dict[str, Any], str, dict]],
+        products_by_slug: Dict[str, dict],
+    ) -> Optional[set]:
+        """
+        Write prepared entries with the ingest_products_atomic RPC.
+        
+        Products, prices and specs go to the database in one call and one
+        transaction per chunk.
+        
+        Returns:
+            Set of product URLs whose price rows were written, or None if
+            the function is not installed
+        """
+        rows = [
+            {
+                "product": products_by_slug[slug],
+                "price": price_data,
+                "specs": item.get("specs") or None,
+                "specs_source_url": item.get("specs_source_url"),
+            }
+            for item, slug, price_data in entries
+        ]
+        saved_urls = self.product_repo.ingest_many_atomic(rows)
+        return None if saved_urls is None else set(saved_urls)
+    
+    def _write_entries_bulk(
+        self,
+        entries: List[Tuple[Dict[str, Any], str, dict]],
+        products_by_slug: Dict[str, dict],
+    ) -> set:
+        """
+        Write prepared entries with one bulk upsert per table.
+        
+        Returns:
+            Set of product URLs whose price rows were written
+        
+        Raises:
+            ProductRepositoryError: If the product or price write fails
+        """
+        saved_products = {
+            p["slug"]: p
+            for p in self.product_repo.upsert_many_by_slug(list(products_by_slug.values()))
+        }
+        
+        # Link price and specs rows to products, deduplicated by URL / product
+        prices_by_url = {}
+        specs_by_product = {}
+        for item, slug, price_data in entries:
+            product = saved_products.get(slug)
+            if not product:
+                continue
+            prices_by_url[price_data["product_url"]] = {**price_data, "product_id": product["id"]}
+            
+            specs = item.get("specs")
+            if specs:
+                specs_by_product[product["id"]] = {
+                    "product_id": product["id"],
+                    "specs": specs,
+                    "source_url": item.get("specs_source_url"),
+                }
+        
+        saved_urls = {
+            p["product_url"]
+            for p in self.price_repo.upsert_many_by_url(list(prices_by_url.values()))
+        }
+        
+        if specs_by_product:
+            try:
+                self.specs_repo.upsert_many(list(specs_by_product.values()))
+            except Exception as e:
+                logger.warning(f"Failed to save specs for {len(specs_by_product)} products: {e}")
+        
+        return saved_urls
+    
+    def _ingest_items_one_by_one(
+        self,
+        scraped_items: List[Dict[str, Any]],
+        retailer_cache: Dict[str, dict],
+    ) -> Tuple[int, int]:
+        """
+        Ingest items with one ingest_scraped_product call each.
+        
+        The calls are pure network I/O, so they run on a small thread pool.
+        Retailers are resolved up front, which leaves the shared cache
+        read-only while the workers run.
+        
+        Returns:
+            Tuple of (success_count, failed_count)
+        """
+        if not scraped_items:
+            return 0, 0
+        
+        slugs = {item.get("retailer_slug") for item in scraped_items}
+        missing_slugs = [slug for slug in slugs if slug and slug not in retailer_cache]
+        if missing_slugs:
+            try:
+                found = {r["slug"]: r for r in self.retailer_repo.get_by_slugs(missing_slugs)}
+                for slug in missing_slugs:
+                    retailer_cache[slug] = found.get(slug)
+            except ProductRepositoryError as e:
+                # Workers fall back to resolving slugs themselves
+                logger.warning(f"Failed to preload retailers: {e}")
+                retailer_cache = None
+        
+        def ingest(item):
+            try:
+                return self.ingest_scraped_product(item, retailer_cache) is not None
+            except Exception as e:
+                logger.error(f"Unexpected error ingesting item: {e}")
+                return False
+        
+        workers = min(self.MAX_INGEST_WORKERS, len(scraped_items))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            success = sum(executor.map(ingest, scraped_items))
+        return success, len(scraped_items) - success
+    
     def _prepare_product_data(self, scraped_data: Dict[str, Any]) -> dict:
         """
         Normalize scraped data into product format.
@@ -215,7 +593,7 @@ class ProductIngestionService:
             "name": name,
             "slug": self._generate_product_slug(name),
             "category": category,
-            "category_slug": slugify(category, lowercase=True),
+            "category_slug": slugify_category(category),
             "brand": scraped_data.get("brand", self._extract_brand(name)),
             "image_url": scraped_data.get("image_url"),
             # Note: specs are stored separately in product_specs table, not here
@@ -223,7 +601,7 @@ class ProductIngestionService:
     
     def _prepare_price_data(
         self,
-        product_id: str,
+        product_id: Optional[str],
         retailer_id: str,
         scraped_data: Dict[str, Any],
     ) -> dict:
@@ -231,60 +609,64 @@ class ProductIngestionService:
         Prepare price record data.
         
         Args:
-            product_id: Product UUID
+            product_id: Product UUID, or None to leave product_id out (it
+                        is filled in once the product is written)
             retailer_id: Retailer UUID
             scraped_data: Raw scraped data
             
         Returns:
             Price data dict
         """
-        return {
-            "product_id": product_id,
+        price_data = {
             "retailer_id": retailer_id,
             "price": float(scraped_data["price"]),
             "currency": scraped_data.get("currency", "BDT"),
             "product_url": scraped_data["product_url"],
             "in_stock": scraped_data.get("in_stock", True),
         }
+        if product_id is not None:
+            price_data["product_id"] = product_id
+        return price_data
     
     def _normalize_text(self, text: str) -> str:
         """Clean and normalize text."""
         if not text:
             return ""
+        text = text.strip()
+        # Fast path: the only whitespace left is single spaces (every other
+        # whitespace character is non-printable), so there is nothing to collapse
+        if "  " not in text and text.isprintable():
+            return text
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text.strip())
-        return text
+        return _WHITESPACE_RE.sub(' ', text)
     
     def _generate_product_slug(self, name: str) -> str:
         """Generate URL-friendly slug from product name."""
-        return slugify(name, lowercase=True, max_length=200)
+        return slugify_product_name(name)
     
     def _extract_brand(self, name: str) -> Optional[str]:
         """
         Try to extract brand from product name.
         
-        Common brands are checked first.
-        """
-        known_brands = [
-            "AMD", "Intel", "NVIDIA", "ASUS", "MSI", "Gigabyte",
-            "Corsair", "G.Skill", "Kingston", "Samsung", "Western Digital",
-            "Seagate", "Crucial", "NZXT", "Cooler Master", "be quiet!",
-            "Noctua", "EVGA", "Zotac", "Sapphire", "PowerColor",
-            "ASRock", "Biostar", "Thermaltake", "Seasonic", "Lian Li",
-            "Phanteks", "Fractal Design", "LG", "BenQ", "Dell", "HP",
-            "Acer", "ViewSonic", "Logitech", "Razer", "SteelSeries",
-            "HyperX", "Team", "PNY", "Adata", "Patriot", "Antec",
-            "DeepCool", "Arctic", "XPG", "Toshiba", "WD",
-        ]
+        Common brands are checked first: the leading word is looked up
+        directly, then the whole name is scanned once and the leftmost
+        known brand wins.
+        """
+        parts = name.split(None, 1)
+        if not parts:
+            return None
+        
+        # Most names lead with the brand, so try a hash lookup first
+        brand = _BRAND_BY_UPPER.get(parts[0].upper())
+        if brand:
+            return brand
         
-        name_upper = name.upper()
-        for brand in known_brands:
-            if brand.upper() in name_upper:
-                return brand
+        match = _BRAND_RE.search(name)
+        if match:
+            return _BRAND_BY_UPPER[match.group(0).upper()]
         
         # If no known brand, take first word as brand (common pattern)
-        first_word = name.split()[0] if name.split() else None
-        return first_word
+        return parts[0]
 
 
 class ProductService:
@@ -314,25 +696,22 @@ class ProductService:
         Returns:
             Product dict with 'retailers' list, or None if not found
         """
+        cache_key = ("product", product_id)
+        cached = _get_cached_product(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            product = self.product_repo.get_by_id(product_id)
+            # Product and its prices come back in one embedded query
+            product = self.product_repo.get_with_prices(
+                "id", product_id, self.price_repo.LISTING_COLUMNS
+            )
             if not product:
                 return None
             
-            prices = self.price_repo.get_by_product_id(product_id)
-            
             # Format retailers with prices
-            retailers = []
-            for price in prices:
-                retailer_data = price.get("retailers", {})
-                retailers.append({
-                    "name": retailer_data.get("name", "Unknown"),
-                    "price": float(price["price"]),
-                    "inStock": price.get("in_stock", True),
-                    "url": price["product_url"],
-                })
-            
-            product["retailers"] = retailers
+            product["retailers"] = _format_retailer_entries(product.pop("product_prices", None) or [])
+            _set_cached_product(cache_key, product)
             return product
             
         except ProductRepositoryError as e:
@@ -354,6 +733,11 @@ class ProductService:
         Returns:
             List of products with retailer prices
         """
+        cache_key = ("category", category_slug, limit)
+        cached = _get_cached_product(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             products = self.product_repo.get_by_category(category_slug, limit)
             
@@ -361,31 +745,20 @@ class ProductService:
                 return []
             
             # Batch fetch all prices in a single query (avoids N+1 problem)
-            product_ids = [p["id"] for p in products]
-            all_prices = self.price_repo.get_by_product_ids(product_ids)
+            all_prices = self.price_repo.get_listing_prices_by_product_ids(
+                p["id"] for p in products
+            )
             
             # Group prices by product_id for efficient lookup
-            prices_by_product = {}
-            for price in all_prices:
-                pid = price["product_id"]
-                if pid not in prices_by_product:
-                    prices_by_product[pid] = []
-                prices_by_product[pid].append(price)
+            prices_by_product = _group_prices_by_product(all_prices)
             
             # Attach prices to each product
             for product in products:
-                prices = prices_by_product.get(product["id"], [])
-                retailers = []
-                for price in prices:
-                    retailer_data = price.get("retailers", {})
-                    retailers.append({
-                        "name": retailer_data.get("name", "Unknown"),
-                        "price": float(price["price"]),
-                        "inStock": price.get("in_stock", True),
-                        "url": price["product_url"],
-                    })
-                product["retailers"] = retailers
+                product["retailers"] = _format_retailer_entries(
+                    prices_by_product.get(product["id"], [])
+                )
             
+            _set_cached_product(cache_key, products)
             return products
             
         except ProductRepositoryError as e:
@@ -409,30 +782,18 @@ class ProductService:
                 return []
             
             # Batch fetch all prices in a single query (avoids N+1 problem)
-            product_ids = [p["id"] for p in products]
-            all_prices = self.price_repo.get_by_product_ids(product_ids)
+            all_prices = self.price_repo.get_listing_prices_by_product_ids(
+                p["id"] for p in products
+            )
             
             # Group prices by product_id for efficient lookup
-            prices_by_product = {}
-            for price in all_prices:
-                pid = price["product_id"]
-                if pid not in prices_by_product:
-                    prices_by_product[pid] = []
-                prices_by_product[pid].append(price)
+            prices_by_product = _group_prices_by_product(all_prices)
             
             # Attach prices to each product
             for product in products:
-                prices = prices_by_product.get(product["id"], [])
-                retailers = []
-                for price in prices:
-                    retailer_data = price.get("retailers", {})
-                    retailers.append({
-                        "name": retailer_data.get("name", "Unknown"),
-                        "price": float(price["price"]),
-                        "inStock": price.get("in_stock", True),
-                        "url": price["product_url"],
-                    })
-                product["retailers"] = retailers
+                product["retailers"] = _format_retailer_entries(
+                    prices_by_product.get(product["id"], [])
+                )
             
             return products
             
@@ -453,6 +814,9 @@ class ProductService:
         max_price: Optional[float] = None,
         retailers: Optional[List[str]] = None,
         grouped: bool = False,
+        cursor: Optional[Tuple[Any, str]] = None,
+        include_count: bool = True,
+        compat_filter: Optional[CompatFilter] = None,
     ) -> Dict[str, Any]:
         """
         Get products with server-side pagination, filtering, and sorting.
@@ -463,6 +827,17 @@ class ProductService:
         - For price sorting: fetches all products, sorts by price, then paginates
         - For other sorting: uses database-level pagination for efficiency
         
+        Where the database does the ordering on the queried table (grouped
+        newest/name sorts, exploded price sorts), the pagination metadata
+        includes a 'next_cursor'. Passing it back as *cursor* fetches the
+        next page with keyset pagination, which costs the same at any depth
+        (no total_count is returned in that mode). Elsewhere next_cursor is
+        None and *cursor* is ignored.
+        
+        With include_count=False the count query is skipped and the
+        metadata has no total_count / total_pages; has_next comes from
+        fetching one extra row.
+        
         Args:
             page: Page number (1-indexed)
             page_size: Number of products per page
@@ -471,6 +846,9 @@ class ProductService:
             brand: Optional brand filter
             sort_by: Sort option (newest, name_asc, name_desc, price_asc, price_desc)
             grouped: If True, return products with all retailers grouped (for builder)
+            cursor: Decoded (sort_value, id) cursor from a previous page
+            include_count: Whether to return total_count / total_pages
+            compat_filter: Optional compatibility constraint, applied by the DB
             
         Returns:
             Dict with 'products' list and 'pagination' metadata
@@ -479,19 +857,12 @@ class ProductService:
             if product_ids is not None and len(product_ids) == 0:
                 return {
                     "products": [],
-                    "pagination": {
-                        "page": page,
-                        "page_size": page_size,
-                        "total_count": 0,
-                        "total_pages": 0,
-                        "has_next": False,
-                        "has_prev": False,
-                    },
+                    "pagination": _empty_pagination(page, page_size, include_count),
                 }
             if grouped:
                 # Return products with all retailers grouped under one product
                 # This is used by the system builder
-                return self._get_products_grouped_paginated(
+                result = self._get_products_grouped_paginated(
                     page=page,
                     page_size=page_size,
                     category_slug=category_slug,
@@ -502,11 +873,14 @@ class ProductService:
                     min_price=min_price,
                     max_price=max_price,
                     retailers=retailers,
+                    cursor=cursor,
+                    include_count=include_count,
+                    compat_filter=compat_filter,
                 )
             else:
                 # Return one entry per product-retailer listing (exploded view)
                 # This allows users to compare prices across stores directly in the grid
-                return self._get_product_listings_paginated(
+                result = self._get_product_listings_paginated(
                     page=page,
                     page_size=page_size,
                     category_slug=category_slug,
@@ -517,20 +891,18 @@ class ProductService:
                     min_price=min_price,
                     max_price=max_price,
                     retailers=retailers,
+                    cursor=cursor,
+                    include_count=include_count,
+                    compat_filter=compat_filter,
                 )
+            result["pagination"].setdefault("next_cursor", None)
+            return result
             
         except ProductRepositoryError as e:
             logger.error(f"Failed to get paginated products: {e}")
             return {
                 "products": [],
-                "pagination": {
-                    "page": page,
-                    "page_size": page_size,
-                    "total_count": 0,
-                    "total_pages": 0,
-                    "has_next": False,
-                    "has_prev": False,
-                },
+                "pagination": _empty_pagination(page, page_size, include_count),
             }
     
     def _get_products_grouped_paginated(
@@ -545,6 +917,9 @@ class ProductService:
         min_price: Optional[float],
         max_price: Optional[float],
         retailers: Optional[List[str]],
+        cursor: Optional[Tuple[Any, str]] = None,
+        include_count: bool = True,
+        compat_filter: Optional[CompatFilter] = None,
     ) -> Dict[str, Any]:
         """
         Get products with all retailers grouped under each product.
@@ -552,126 +927,124 @@ class ProductService:
         Each product appears once with all its retailer prices in the 'retailers' array.
         This is useful for system builder where you want to see all prices at once.
         """
-        # Fetch all products matching filters
+        # Price sorts need every product's minimum price before a page can be
+        # cut, so they still load all matches. Other sorts let the DB filter,
+        # order and paginate, and only the page's prices are fetched.
+        sort_by_price = sort_by in ("price_asc", "price_desc")
+        
         result = self.product_repo.get_paginated(
-            page=1,
-            page_size=10000,  # Get all matching products
+            page=1 if sort_by_price else page,
+            page_size=10000 if sort_by_price else page_size,
             category_slug=category_slug,
             search=search,
-            brand=None,  # Don't filter by brand at DB level, we'll do it after
-            sort_by=None,  # We'll sort after adding prices
+            brands=brands,
+            sort_by=None if sort_by_price else sort_by,
             product_ids=product_ids,
+            min_price=min_price,
+            max_price=max_price,
+            retailers=retailers,
+            with_prices_only=True,
+            after=None if sort_by_price else cursor,
+            # Price sorts count the loaded products themselves
+            include_count=include_count and not sort_by_price,
+            compat_filter=compat_filter,
         )
         
         all_products = result["products"]
+        if not sort_by_price:
+            column = self.product_repo.KEYSET_SORTS.get(
+                sort_by, self.product_repo.KEYSET_SORTS["newest"]
+            )[0]
+            _set_next_cursor(result["pagination"], all_products, column)
         
         if not all_products:
+            if not sort_by_price:
+                # Keeps the real total when the page is past the end
+                return {"products": [], "pagination": result["pagination"]}
             return {
                 "products": [],
-                "pagination": {
-                    "page": page,
-                    "page_size": page_size,
-                    "total_count": 0,
-                    "total_pages": 0,
-                    "has_next": False,
-                    "has_prev": False,
-                },
+                "pagination": _empty_pagination(page, page_size, include_count),
             }
         
-        # Batch fetch ALL prices
-        product_ids = [p["id"] for p in all_products]
-        all_prices = self.price_repo.get_by_product_ids(product_ids)
+        # Batch fetch prices, with retailer and price filters applied by the DB
+        all_prices = self.price_repo.get_listing_prices_by_product_ids(
+            (p["id"] for p in all_products),
+            min_price=min_price,
+            max_price=max_price,
+            retailers=retailers,
+        )
         
         # Group prices by product_id
-        prices_by_product = {}
-        for price in all_prices:
-            pid = price["product_id"]
-            if pid not in prices_by_product:
-                prices_by_product[pid] = []
-            prices_by_product[pid].append(price)
+        prices_by_product = _group_prices_by_product(all_prices)
         
         # Build products with all retailers
         products_with_prices = []
         for product in all_products:
-            # Apply brand filter
-            if brands and len(brands) > 0:
-                product_brand = product.get("brand", "")
-                if not product_brand:
-                    continue
-                brand_match = any(brand.lower() == product_brand.lower() for brand in brands)
-                if not brand_match:
-                    continue
-            
             prices = prices_by_product.get(product["id"], [])
             
-            # Build retailers list
+            # Build retailers list, collecting stats in the same pass
             retailers_list = []
             min_product_price = None
+            in_stock_count = 0
             for price in prices:
-                retailer_data = price.get("retailers", {})
-                retailer_slug = retailer_data.get("slug", "")
-                price_value = float(price["price"])
+                entry = _format_retailer_entry(price)
+                retailers_list.append(entry)
                 
-                # Apply retailer filter
-                if retailers and len(retailers) > 0:
-                    if retailer_slug not in retailers:
-                        continue
-                
-                # Apply price filter
-                if min_price is not None and price_value < min_price:
-                    continue
-                if max_price is not None and price_value > max_price:
-                    continue
-                
-                retailers_list.append({
-                    "name": retailer_data.get("name", "Unknown"),
-                    "price": price_value,
-                    "inStock": price.get("in_stock", True),
-                    "url": price["product_url"],
-                })
-                
-                # Track minimum price
-                if min_product_price is None or price_value < min_product_price:
-                    min_product_price = price_value
+                # Track minimum price and stock
+                if min_product_price is None or entry.price < min_product_price:
+                    min_product_price = entry.price
+                if entry.inStock:
+                    in_stock_count += 1
             
             # Skip products with no matching retailers
             if not retailers_list:
                 continue
             
-            # Calculate stats
-            total_retailers = len(retailers_list)
-            in_stock_count = sum(1 for r in retailers_list if r.get("inStock", True))
-            
             product_copy = {
                 **product,
                 "retailers": retailers_list,
-                "total_retailers": total_retailers,
+                "total_retailers": len(retailers_list),
                 "in_stock_count": in_stock_count,
+                # Sort key only; removed before the page is returned
+                "_min_price": min_product_price,
             }
             products_with_prices.append(product_copy)
         
+        if not sort_by_price:
+            # Already ordered and paginated by the DB
+            for product in products_with_prices:
+                del product["_min_price"]
+            return {
+                "products": products_with_prices,
+                "pagination": result["pagination"],
+            }
+        
         # Apply sorting
-        if sort_by == "price_asc":
-            products_with_prices.sort(key=lambda x: min(r["price"] for r in x["retailers"]) if x["retailers"] else float('inf'))
-        elif sort_by == "price_desc":
-            products_with_prices.sort(key=lambda x: min(r["price"] for r in x["retailers"]) if x["retailers"] else 0, reverse=True)
-        elif sort_by == "name_asc":
-            products_with_prices.sort(key=lambda x: x.get("name", "").lower())
-        elif sort_by == "name_desc":
-            products_with_prices.sort(key=lambda x: x.get("name", "").lower(), reverse=True)
-        else:
-            # Default: newest first
-            products_with_prices.sort(key=lambda x: x.get("created_at", ""), reverse=True)
-        
-        # Calculate pagination
-        total_count = len(products_with_prices)
-        total_pages = (total_count + page_size - 1) // page_size if total_count > 0 else 0
+        products_with_prices.sort(
+            key=itemgetter("_min_price"),
+            reverse=sort_by == "price_desc",
+        )
         
         # Apply pagination
         start_idx = (page - 1) * page_size
         end_idx = start_idx + page_size
         paginated_products = products_with_prices[start_idx:end_idx]
+        for product in paginated_products:
+            del product["_min_price"]
         
+        total_count = len(products_with_prices)
+        if not include_count:
+            return {
+                "products": paginated_products,
+                "pagination": {
+                    "page": page,
+                    "page_size": page_size,
+                    "has_next": end_idx < total_count,
+                    "has_prev": page > 1,
+                },
+            }
+        
+        total_pages = (total_count + page_size - 1) // page_size if total_count > 0 else 0
         return {
             "products": paginated_products,
             "pagination": {
@@ -696,6 +1069,9 @@ class ProductService:
         min_price: Optional[float],
         max_price: Optional[float],
         retailers: Optional[List[str]],
+        cursor: Optional[Tuple[Any, str]] = None,
+        include_count: bool = True,
+        compat_filter: Optional[CompatFilter] = None,
     ) -> Dict[str, Any]:
         """
         Get product listings with one entry per retailer.
@@ -723,46 +1099,39 @@ class ProductService:
             min_price=min_price,
             max_price=max_price,
             retailers=retailers,
+            after=cursor,
+            include_count=include_count,
+            compat_filter=compat_filter,
         )
         
         raw_listings = result.get("listings", [])
         pagination = result.get("pagination", {})
+        keyset = self.price_repo.KEYSET_SORTS.get(sort_by)
+        if keyset and pagination:
+            _set_next_cursor(pagination, raw_listings, keyset[0])
         
         if not raw_listings:
             return {
                 "products": [],
-                "pagination": pagination or {
-                    "page": page,
-                    "page_size": page_size,
-                    "total_count": 0,
-                    "total_pages": 0,
-                    "has_next": False,
-                    "has_prev": False,
-                },
+                "pagination": pagination or _empty_pagination(page, page_size, include_count),
             }
         
         # Transform the raw listings to the expected format
         listings = []
         for price in raw_listings:
             product = price.get("products", {})
-            retailer_data = price.get("retailers", {})
             
             if not product:
                 continue
             
-            # Create a listing entry
-            listing = {
-                **product,  # Copy all product fields
-                "listing_id": price["id"],  # Unique ID for this listing
-                "total_retailers": 1,  # Will be calculated if needed
-                "in_stock_count": 1 if price.get("in_stock", True) else 0,
-                "retailers": [{
-                    "name": retailer_data.get("name", "Unknown") if retailer_data else "Unknown",
-                    "price": float(price["price"]),
-                    "inStock": price.get("in_stock", True),
-                    "url": price["product_url"],
-                }],
-            }
+            # Create a listing entry. The nested product dict belongs to this
+            # row alone, so it is extended in place instead of copied.
+            entry = _format_retailer_entry(price)
+            listing = product
+            listing["listing_id"] = price["id"]  # Unique ID for this listing
+            listing["total_retailers"] = 1  # Will be calculated if needed
+            listing["in_stock_count"] = 1 if entry.inStock else 0
+            listing["retailers"] = [entry]
             listings.append(listing)
         
         return {
@@ -828,9 +1197,16 @@ class ProductService:
         Returns:
             Product dict with specs and retailers, or None if not found
         """
+        cache_key = ("slug", category_slug, product_slug)
+        cached = _get_cached_product(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            # Get product by slug
-            product = self.product_repo.get_by_slug(product_slug)
+            # Get product by slug, with its prices and specs embedded
+            product = self.product_repo.get_with_prices(
+                "slug", product_slug, self.price_repo.DETAIL_COLUMNS, with_specs=True
+            )
             if not product:
                 return None
             
@@ -838,12 +1214,14 @@ class ProductService:
             if product.get('category_slug') != category_slug:
                 return None
             
-            # Get specs
-            specs_record = product_specs_repository.get_by_product_id(product['id'])
+            # A unique FK embeds as an object; older PostgREST sends a list
+            specs_record = product.pop('product_specs', None)
+            if isinstance(specs_record, list):
+                specs_record = specs_record[0] if specs_record else None
             product['specs'] = specs_record['specs'] if specs_record else {}
             
-            # Get all retailer prices with URLs
-            prices = self.price_repo.get_by_product_id(product['id'])
+            # All retailer prices with URLs
+            prices = product.pop('product_prices', None) or []
             retailers = []
             for price in prices:
                 retailer_info = price.get('retailers', {})
@@ -851,15 +1229,15 @@ class ProductService:
                     'priceId': price.get('id', ''),
                     'name': retailer_info.get('name', 'Unknown'),
                     'slug': retailer_info.get('slug', ''),
-                    'price': float(price.get('price', 0)),
+                    'price': price.get('price', 0),
                     'inStock': price.get('in_stock', True),
                     'url': price.get('product_url', ''),
                 })
             
-            # Sort by price (lowest first)
-            retailers.sort(key=lambda r: r['price'])
+            # Rows arrive sorted by price (lowest first) from the repository
             product['retailers'] = retailers
             
+            _set_cached_product(cache_key, product)
             return product
             
         except ProductRepositoryError as e:
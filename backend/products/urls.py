@@ -15,6 +15,8 @@ from products.views import (
     ComponentCompatibilityInfoView,
 )
 
+app_name = "products"
+
 urlpatterns = [
     path("", ProductListView.as_view(), name="product-list"),
     path("categories/counts/", CategoryCountsView.as_view(), name="category-counts"),
@@ -9,14 +9,22 @@ Following clean architecture, views are thin controllers that:
 """
 
 import logging
+from django.http import StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import conditional_page
 from rest_framework import status
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
+from products.renderers import OrjsonRenderer
 from products.services import product_service, product_ingestion_service
 from products.serializers import (
     ProductSerializer,
-    ProductListQuerySerializer,
+    parse_product_list_params,
+    serialize_product_list,
+    stream_product_list,
     RetailerSerializer,
     BatchIngestionSerializer,
     IngestionResultSerializer,
@@ -24,8 +32,29 @@ from products.serializers import (
 
 logger = logging.getLogger(__name__)
 
+# Filter sidebar data (retailers, brands, category counts) only changes when
+# products are scraped or edited; browsers may reuse it for this long
+# instead of refetching it on every page navigation
+FILTER_DATA_MAX_AGE = 60
 
-class ProductListView(APIView):
+cache_filter_data = method_decorator(
+    cache_control(public=True, max_age=FILTER_DATA_MAX_AGE), name="get"
+)
+
+# Product pages and filter data only change on scrapes and edits. Responses
+# carry an ETag of their rendered body, so a client revalidating with
+# If-None-Match gets an empty 304 when nothing changed. The hash is taken
+# after rendering, so it is the same on every worker.
+conditional_get = method_decorator(conditional_page, name="dispatch")
+
+
+class ProductAPIView(APIView):
+    """Base view for the products API: JSON is encoded with orjson."""
+    
+    renderer_classes = [OrjsonRenderer, BrowsableAPIRenderer]
+
+
+class ProductListView(ProductAPIView):
     """
     GET /api/products/
     
@@ -34,6 +63,11 @@ class ProductListView(APIView):
     Query Parameters:
         - page: Page number (default: 1)
         - page_size: Items per page (default: 24, max: 100)
+        - cursor: pagination.next_cursor from the previous page; fetches
+          the next page by keyset instead of page number (no total_count)
+        - include_count: 'false' skips the total count (default: true)
+        - stream: 'true' streams the response body product by product;
+          implies include_count=false
         - category: Category slug to filter by
         - cpu_id: Filter motherboards compatible with this CPU
         - motherboard_id: Filter RAM compatible with this motherboard
@@ -45,40 +79,35 @@ class ProductListView(APIView):
     def get(self, request):
         """Get paginated list of products with their prices."""
         # Validate query params
-        query_serializer = ProductListQuerySerializer(data=request.query_params)
-        if not query_serializer.is_valid():
+        params, errors = parse_product_list_params(request.query_params)
+        if errors:
             return Response(
-                query_serializer.errors,
+                errors,
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        params = query_serializer.validated_data
         page = params.get("page", 1)
         page_size = params.get("page_size", 24)
         category = params.get("category")
         search = params.get("search")
-        brand_str = params.get("brand")
+        brands = params.get("brand")  # Already split on commas
         sort = params.get("sort")
         cpu_id = params.get("cpu_id")
         motherboard_id = params.get("motherboard_id")
         compat_mode = params.get("compat_mode") or "strict"
         min_price = params.get("min_price")
         max_price = params.get("max_price")
-        retailers_str = params.get("retailers")
+        retailers = params.get("retailers")  # Already split on commas
         grouped = params.get("grouped", False)
+        cursor = params.get("cursor")
+        stream = params.get("stream", False)
+        # A streamed response should start as soon as the page is fetched
+        include_count = params.get("include_count", True) and not stream
         
-        # Parse comma-separated brands
-        brands = None
-        if brand_str:
-            brands = [b.strip() for b in brand_str.split(",") if b.strip()]
-        
-        # Parse comma-separated retailers
-        retailers = None
-        if retailers_str:
-            retailers = [r.strip() for r in retailers_str.split(",") if r.strip()]
-
-        # Compatibility filtering (CPU -> Motherboards, Motherboard -> RAM)
+        # Compatibility filtering (CPU -> Motherboards, Motherboard -> RAM).
+        # The constraint is joined into the product query itself.
         product_ids = None
+        compat_filter = None
         if cpu_id or motherboard_id:
             if cpu_id and motherboard_id:
                 return Response(
@@ -88,21 +117,14 @@ class ProductListView(APIView):
 
             from products.compatibility_service import compatibility_service
 
-            if cpu_id:
-                result = compatibility_service.get_compatible_motherboards(
-                    cpu_id=cpu_id,
-                    mode=compat_mode,
-                )
-            else:
-                result = compatibility_service.get_compatible_ram(
-                    motherboard_id=motherboard_id,
-                    mode=compat_mode,
-                )
-
-            if compat_mode == "lenient":
-                product_ids = list(set(result.get("compatible", []) + result.get("unknown", [])))
-            else:
-                product_ids = result.get("compatible", [])
+            compat_filter = compatibility_service.get_compat_filter(
+                cpu_id=cpu_id,
+                motherboard_id=motherboard_id,
+                mode=compat_mode,
+            )
+            if compat_filter is None:
+                # Nothing can be compatible
+                product_ids = []
         
         # Use paginated method with server-side filtering and sorting
         result = product_service.get_products_paginated(
@@ -117,18 +139,25 @@ class ProductListView(APIView):
             max_price=max_price,
             retailers=retailers,
             grouped=grouped,
+            cursor=cursor,
+            include_count=include_count,
+            compat_filter=compat_filter,
         )
         
-        # Serialize products
-        serializer = ProductSerializer(result["products"], many=True)
+        if stream:
+            return StreamingHttpResponse(
+                stream_product_list(result["products"], result["pagination"]),
+                content_type="application/json",
+            )
         
         return Response({
-            "products": serializer.data,
+            "products": serialize_product_list(result["products"]),
             "pagination": result["pagination"],
         })
 
 
-class ProductDetailView(APIView):
+@conditional_get
+class ProductDetailView(ProductAPIView):
     """
     GET /api/products/<id>/
     
@@ -149,7 +178,9 @@ class ProductDetailView(APIView):
         return Response(serializer.data)
 
 
-class RetailerListView(APIView):
+@cache_filter_data
+@conditional_get
+class RetailerListView(ProductAPIView):
     """
     GET /api/products/retailers/
     
@@ -163,7 +194,7 @@ class RetailerListView(APIView):
         return Response(serializer.data)
 
 
-class ProductIngestionView(APIView):
+class ProductIngestionView(ProductAPIView):
     """
     POST /api/products/ingest/
     
@@ -191,7 +222,9 @@ class ProductIngestionView(APIView):
         return Response(result_serializer.data, status=status.HTTP_200_OK)
 
 
-class CategoryCountsView(APIView):
+@cache_filter_data
+@conditional_get
+class CategoryCountsView(ProductAPIView):
     """
     GET /api/products/categories/counts/
     
@@ -204,7 +237,9 @@ class CategoryCountsView(APIView):
         return Response(counts)
 
 
-class BrandsListView(APIView):
+@cache_filter_data
+@conditional_get
+class BrandsListView(ProductAPIView):
     """
     GET /api/products/brands/
     
@@ -221,7 +256,8 @@ class BrandsListView(APIView):
         return Response(brands)
 
 
-class ProductBySlugView(APIView):
+@conditional_get
+class ProductBySlugView(ProductAPIView):
     """
     GET /api/products/by-slug/<category>/<slug>/
     
@@ -243,7 +279,7 @@ class ProductBySlugView(APIView):
         return Response(serializer.data)
 
 
-class CompatibleComponentsView(APIView):
+class CompatibleComponentsView(ProductAPIView):
     """
     GET /api/products/compatible/
     
@@ -257,12 +293,16 @@ class CompatibleComponentsView(APIView):
     Returns product IDs only. Frontend fetches full product data separately.
     """
     
+    # Selection param -> compatibility_service lookup, checked in order
+    LOOKUPS = (
+        ('cpu_id', 'get_compatible_motherboards'),  # CPU -> Motherboards
+        ('motherboard_id', 'get_compatible_ram'),  # Motherboard -> RAM
+    )
+    
     def get(self, request):
         """Get compatible component IDs."""
         from products.compatibility_service import compatibility_service
         
-        cpu_id = request.query_params.get('cpu_id')
-        motherboard_id = request.query_params.get('motherboard_id')
         mode = request.query_params.get('mode', 'strict')
         
         # Validate mode
@@ -272,21 +312,11 @@ class CompatibleComponentsView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # CPU -> Motherboards
-        if cpu_id:
-            result = compatibility_service.get_compatible_motherboards(
-                cpu_id=cpu_id,
-                mode=mode,
-            )
-            return Response(result)
-        
-        # Motherboard -> RAM
-        if motherboard_id:
-            result = compatibility_service.get_compatible_ram(
-                motherboard_id=motherboard_id,
-                mode=mode,
-            )
-            return Response(result)
+        for param, lookup in self.LOOKUPS:
+            selected_id = request.query_params.get(param)
+            if selected_id:
+                result = getattr(compatibility_service, lookup)(selected_id, mode=mode)
+                return Response(result)
         
         return Response(
             {"error": "Provide cpu_id or motherboard_id"},
@@ -294,7 +324,7 @@ class CompatibleComponentsView(APIView):
         )
 
 
-class ComponentCompatibilityInfoView(APIView):
+class ComponentCompatibilityInfoView(ProductAPIView):
     """
     GET /api/products/<id>/compatibility/
     
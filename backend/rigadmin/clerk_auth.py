@@ -2,7 +2,8 @@
 Clerk JWT authentication utilities.
 
 This module provides functions to verify Clerk JWT tokens using PyJWT
-with Clerk's public key (PEM format). It extracts the user's email from
+with Clerk's public keys, fetched from its JWKS endpoint or configured as
+a PEM key. It extracts the user's email from
 verified token claims for admin authorization.
 
 Security features:
@@ -12,14 +13,39 @@ Security features:
 - Not-before (nbf) validation
 """
 
+import hashlib
 import logging
+import threading
+import time
+from functools import lru_cache
+from types import SimpleNamespace
 from typing import Optional
 
 import jwt
+from cachetools import TTLCache
+from cryptography.hazmat.primitives.serialization import load_pem_public_key
 from django.conf import settings
+from rest_framework.authentication import BaseAuthentication
 
 logger = logging.getLogger(__name__)
 
+# Settings are fixed for the life of the process; read them once instead of
+# going through LazySettings on every request
+_PUBLIC_KEY_PEM = getattr(settings, "CLERK_PEM_PUBLIC_KEY", None)
+_JWKS_URL = getattr(settings, "CLERK_JWKS_URL", None)
+
+
+def _parse_authorized_parties(parties) -> frozenset:
+    """Normalize CLERK_AUTHORIZED_PARTIES (list or comma-separated string)."""
+    if isinstance(parties, str):
+        parties = parties.split(",")
+    return frozenset(p.strip() for p in parties if p.strip())
+
+
+_AUTHORIZED_PARTIES = _parse_authorized_parties(
+    getattr(settings, "CLERK_AUTHORIZED_PARTIES", [])
+)
+
 
 class ClerkAuthError(Exception):
     """Base exception for Clerk authentication errors."""
@@ -46,6 +72,128 @@ class UnauthorizedPartyError(ClerkAuthError):
     pass
 
 
+@lru_cache(maxsize=1)
+def _load_public_key(pem: str):
+    """
+    Parse a PEM public key into a key object.
+    
+    jwt.decode() re-parses a PEM string on every call; passing it the
+    parsed key skips that.
+    """
+    return load_pem_public_key(pem.encode())
+
+
+def _get_public_key():
+    """Return Clerk's parsed public key, or None if it is not configured."""
+    if not _PUBLIC_KEY_PEM:
+        return None
+    try:
+        return _load_public_key(_PUBLIC_KEY_PEM)
+    except (ValueError, TypeError) as e:
+        logger.error(f"CLERK_PEM_PUBLIC_KEY could not be parsed: {e}")
+        return None
+
+
+@lru_cache(maxsize=1)
+def _get_jwks_client(url: str) -> jwt.PyJWKClient:
+    """
+    Return a JWKS client for Clerk's key set.
+    
+    The client caches the fetched key set for an hour. Unknown kids are
+    handled by _get_signing_key, not by the client.
+    """
+    return jwt.PyJWKClient(url, lifespan=3600)
+
+
+# A token with an unknown kid refetches Clerk's key set at most this often.
+# The kid is read before the signature is checked, so without a limit any
+# forged token would trigger an outbound request.
+JWKS_REFRESH_INTERVAL = 60.0
+_jwks_refreshed_at = None
+_jwks_refresh_lock = threading.Lock()
+
+
+def _get_signing_key(token: str):
+    """
+    Return the key that verifies a token, or None if none is configured.
+    
+    Uses Clerk's JWKS endpoint (CLERK_JWKS_URL) when it is set, picking
+    the key by the token's kid, and the PEM key from settings otherwise.
+    The key set is only fetched again for an unknown kid (i.e. after a key
+    rotation), and at most once per JWKS_REFRESH_INTERVAL.
+    
+    Raises:
+        jwt.PyJWKClientError: The key set could not be fetched or has no
+            key for the token
+        jwt.DecodeError: The token header is malformed
+    """
+    global _jwks_refreshed_at
+    if not _JWKS_URL:
+        return _get_public_key()
+    
+    kid = jwt.get_unverified_header(token).get("kid")
+    client = _get_jwks_client(_JWKS_URL)
+    signing_key = client.match_kid(client.get_signing_keys(), kid)
+    if signing_key is None:
+        with _jwks_refresh_lock:
+            now = time.monotonic()
+            if _jwks_refreshed_at is None or now - _jwks_refreshed_at >= JWKS_REFRESH_INTERVAL:
+                _jwks_refreshed_at = now
+                signing_key = client.match_kid(client.get_signing_keys(refresh=True), kid)
+    if signing_key is None:
+        raise jwt.PyJWKClientError(f'Unable to find a signing key that matches: "{kid}"')
+    return signing_key.key
+
+
+# Claims of tokens whose signature already verified, by token digest. Clerk
+# session tokens live about a minute and are sent with every request of a
+# page, so repeat checks skip the RS256 verification. Entries never outlive
+# the token: expiry is re-checked on every hit.
+_verified_claims = TTLCache(maxsize=4096, ttl=55)
+_verified_claims_lock = threading.Lock()
+
+
+# Only the checks Clerk session tokens need: signature, exp and nbf. Clerk
+# sets no 'aud', and 'iss'/'iat' are not relied on, so PyJWT skips them.
+_DECODE_OPTIONS = {
+    "verify_signature": True,
+    "verify_aud": False,
+    "verify_iss": False,
+    "verify_iat": False,
+    "verify_exp": True,
+    "verify_nbf": True,
+    "require": ["exp", "sub"],
+}
+
+
+def _decode_token(token: str, public_key, leeway: int = 0) -> dict:
+    """
+    Verify a Clerk JWT and return its claims, reusing earlier verifications.
+    
+    Raises:
+        jwt.ExpiredSignatureError: The token has expired
+        jwt.InvalidTokenError: The token is invalid
+    """
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    with _verified_claims_lock:
+        claims = _verified_claims.get(key)
+    if claims is not None:
+        if claims["exp"] + leeway < time.time():
+            raise jwt.ExpiredSignatureError("Signature has expired")
+        return claims
+    
+    claims = jwt.decode(
+        token,
+        public_key,
+        algorithms=["RS256"],
+        leeway=leeway,
+        options=_DECODE_OPTIONS,
+    )
+    with _verified_claims_lock:
+        _verified_claims[key] = claims
+    return claims
+
+
 def get_verified_user_email(request) -> Optional[str]:
     """
     Extract and verify Clerk JWT from request, return user's email.
@@ -92,41 +240,38 @@ def get_verified_user_email_or_raise(request) -> str:
         TokenInvalidError: JWT token is invalid
         UnauthorizedPartyError: azp claim doesn't match allowed parties
     """
+    # Already verified earlier in this request
+    email = getattr(request, "_clerk_email", None)
+    if email is not None:
+        return email
+    
     # Get Authorization header
-    auth_header = request.headers.get("Authorization", "")
+    auth_header = request.META.get("HTTP_AUTHORIZATION", "")
     
     if not auth_header:
         raise TokenMissingError("Authorization header is missing")
     
-    if not auth_header.startswith("Bearer "):
+    # removeprefix returns the header itself when the prefix is absent
+    token = auth_header.removeprefix("Bearer ")
+    if token is auth_header:
         raise TokenMissingError("Authorization header must start with 'Bearer '")
     
-    token = auth_header[7:]  # Remove 'Bearer ' prefix
-    
     if not token:
         raise TokenMissingError("Bearer token is empty")
     
-    # Get public key from settings
-    public_key = getattr(settings, "CLERK_PEM_PUBLIC_KEY", None)
-    if not public_key:
-        logger.error("CLERK_PEM_PUBLIC_KEY is not configured in settings")
+    try:
+        # Get the signing key (JWKS endpoint or PEM key from settings)
+        public_key = _get_signing_key(token)
+    except (jwt.PyJWKClientError, jwt.DecodeError) as e:
+        raise TokenInvalidError(f"Could not get signing key: {e}")
+    if public_key is None:
+        logger.error("Neither CLERK_JWKS_URL nor CLERK_PEM_PUBLIC_KEY is configured in settings")
         raise TokenInvalidError("Server authentication not configured")
     
     try:
         # Verify and decode the token
         # leeway accounts for clock skew between Clerk servers and this server
-        decoded = jwt.decode(
-            token,
-            public_key,
-            algorithms=["RS256"],
-            leeway=60,  # Allow 60 seconds of clock skew
-            options={
-                "verify_aud": False,  # Clerk doesn't use standard 'aud' claim
-                "verify_exp": True,
-                "verify_nbf": True,
-                "require": ["exp", "sub"],
-            }
-        )
+        decoded = _decode_token(token, public_key, leeway=60)
     except jwt.ExpiredSignatureError:
         raise TokenExpiredError("Token has expired")
     except jwt.InvalidTokenError as e:
@@ -135,14 +280,13 @@ def get_verified_user_email_or_raise(request) -> str:
     # Validate authorized parties (azp claim) if present
     azp = decoded.get("azp")
     if azp:
-        authorized_parties = getattr(settings, "CLERK_AUTHORIZED_PARTIES", [])
-        if isinstance(authorized_parties, str):
-            authorized_parties = [p.strip() for p in authorized_parties.split(",")]
-        
-        if authorized_parties and azp not in authorized_parties:
+        if _AUTHORIZED_PARTIES and azp not in _AUTHORIZED_PARTIES:
             logger.warning(f"Unauthorized party: {azp}")
             raise UnauthorizedPartyError(f"Unauthorized party: {azp}")
     
+    # Later lookups on this request (e.g. get_clerk_user_id) reuse the claims
+    request._clerk_claims = decoded
+    
     # Extract email from claims
     # Clerk includes email in 'email' claim for users with verified emails
     email = decoded.get("email")
@@ -155,6 +299,7 @@ def get_verified_user_email_or_raise(request) -> str:
         logger.warning(f"No email found in token claims. Available claims: {list(decoded.keys())}")
         raise TokenInvalidError("Token does not contain email claim")
     
+    request._clerk_email = email
     return email
 
 
@@ -167,25 +312,54 @@ def get_clerk_user_id(request) -> Optional[str]:
         
     Returns:
         The Clerk user ID if token is valid, None otherwise
+    
+    Note:
+        Claims verified by get_verified_user_email() on the same request
+        are reused without decoding the token again.
     """
+    # Already verified earlier in this request
+    claims = getattr(request, "_clerk_claims", None)
+    if claims is not None:
+        return claims.get("sub")
+    
     try:
-        auth_header = request.headers.get("Authorization", "")
-        if not auth_header.startswith("Bearer "):
+        auth_header = request.META.get("HTTP_AUTHORIZATION", "")
+        token = auth_header.removeprefix("Bearer ")
+        if token is auth_header:
             return None
         
-        token = auth_header[7:]
-        public_key = getattr(settings, "CLERK_PEM_PUBLIC_KEY", None)
+        public_key = _get_signing_key(token)
         
-        if not public_key:
+        if public_key is None:
             return None
         
-        decoded = jwt.decode(
-            token,
-            public_key,
-            algorithms=["RS256"],
-            options={"verify_aud": False}
-        )
+        decoded = _decode_token(token, public_key)
         
         return decoded.get("sub")
     except Exception:
         return None
+
+
+class ClerkAuthentication(BaseAuthentication):
+    """
+    DRF authentication backed by the Clerk JWT in the Authorization header.
+    
+    Verifies the token once per request and exposes the result as
+    request.user (with .email and .claims). A missing or invalid token
+    leaves the request unauthenticated instead of failing it, so views
+    keep returning their own error responses.
+    """
+    
+    def authenticate(self, request):
+        email = get_verified_user_email(request)
+        if email is None:
+            return None
+        user = SimpleNamespace(
+            email=email,
+            claims=request._clerk_claims,
+            is_authenticated=True,
+        )
+        return user, None
+    
+    def authenticate_header(self, request):
+        return "Bearer"
@@ -7,9 +7,14 @@ memory_max_speed_mhz).
 """
 
 import logging
+import threading
 from typing import Dict, Any, List, Optional, Tuple
 
+from cachetools import TTLCache
+
 from rigadmin.repositories.supabase import admin_repository
+from products.compatibility_service import invalidate_compat_cache
+from products.repositories.supabase import call_optional_rpc
 from users.repositories.exceptions import RepositoryError
 
 logger = logging.getLogger(__name__)
@@ -21,13 +26,34 @@ REQUIRED_FIELDS = {
     "ram": ["memory_type", "memory_max_speed_mhz"],
 }
 
+# Columns of an admin_missing_compat row returned to the admin list
+MISSING_RECORD_COLUMNS = (
+    "id, product_id, component_type, "
+    "cpu_socket, mobo_socket, memory_type, memory_max_speed_mhz, "
+    "confidence, extraction_source, "
+    "product_name, product_brand, product_category, product_image_url, "
+    "missing_fields"
+)
+
 # Fields that admins are allowed to update per component type
 EDITABLE_FIELDS = {
-    "cpu": {"cpu_socket"},
-    "motherboard": {"mobo_socket", "memory_type"},
-    "ram": {"memory_type", "memory_max_speed_mhz"},
+    "cpu": frozenset({"cpu_socket"}),
+    "motherboard": frozenset({"mobo_socket", "memory_type"}),
+    "ram": frozenset({"memory_type", "memory_max_speed_mhz"}),
 }
 
+# Missing-field counts and record pages, keyed by query. The dashboard polls
+# them and they only change when compat fields are edited; edits through
+# this service clear the cache, scraper writes show up within the TTL.
+_missing_cache = TTLCache(maxsize=256, ttl=30)
+_missing_cache_lock = threading.Lock()
+
+
+def invalidate_missing_cache() -> None:
+    """Drop cached missing-field counts and record pages."""
+    with _missing_cache_lock:
+        _missing_cache.clear()
+
 
 class AdminCompatService:
     """
@@ -37,6 +63,11 @@ class AdminCompatService:
     and allows admins to fill them in.
     """
 
+    # Cleared if the admin_missing_compat_counts function turns out to be missing
+    missing_counts_rpc_available = True
+    # Cleared if the admin_missing_compat view turns out to be missing
+    missing_records_view_available = True
+
     def __init__(self, admin_repo=None):
         self._client = None
         self.admin_repo = admin_repo or admin_repository
@@ -51,8 +82,7 @@ class AdminCompatService:
     # ------------------------------------------------------------------ auth
     def _verify_admin(self, email: str) -> bool:
         try:
-            admin = self.admin_repo.get_by_email(email)
-            return admin is not None
+            return self.admin_repo.is_admin_email(email)
         except RepositoryError:
             return False
 
@@ -74,28 +104,61 @@ class AdminCompatService:
         if not self._verify_admin(admin_email):
             return None, "Not authorized"
 
+        with _missing_cache_lock:
+            cached = _missing_cache.get("counts")
+        if cached is not None:
+            return cached, None
+
         try:
-            counts = {"cpu": 0, "motherboard": 0, "ram": 0}
-
-            for comp_type, fields in REQUIRED_FIELDS.items():
-                # Build an OR filter: any required field is null
-                for field in fields:
-                    result = (
-                        self.client.table("product_compat")
-                        .select("id", count="exact")
-                        .eq("component_type", comp_type)
-                        .is_(field, "null")
-                        .execute()
-                    )
-                    counts[comp_type] = max(counts[comp_type], result.count or 0)
+            counts = None
+            if self.missing_counts_rpc_available:
+                counts = self._get_missing_counts_grouped()
+            if counts is None:
+                counts = self._get_missing_counts_per_type()
 
             counts["total"] = counts["cpu"] + counts["motherboard"] + counts["ram"]
+            with _missing_cache_lock:
+                _missing_cache["counts"] = counts
             return counts, None
 
         except Exception as e:
             logger.error(f"Error fetching missing compat counts: {e}")
             return None, f"Failed to fetch counts: {str(e)}"
 
+    def _get_missing_counts_grouped(self) -> Optional[Dict[str, int]]:
+        """
+        Count records missing a required field, per type, with one RPC.
+
+        Returns:
+            {"cpu", "motherboard", "ram"} counts, or None if the
+            admin_missing_compat_counts function is not installed
+        """
+        result = call_optional_rpc(
+            self, "missing_counts_rpc_available", "admin_missing_compat_counts", {},
+            "counting per type",
+        )
+        if result is None:
+            return None
+
+        row = (result.data or [{}])[0]
+        return {comp_type: row.get(comp_type) or 0 for comp_type in REQUIRED_FIELDS}
+
+    def _get_missing_counts_per_type(self) -> Dict[str, int]:
+        """Count records missing a required field with one query per type."""
+        counts = {}
+        for comp_type, fields in REQUIRED_FIELDS.items():
+            # Any required field is null
+            result = (
+                self.client.table("product_compat")
+                .select("id", count="exact")
+                .eq("component_type", comp_type)
+                .or_(",".join(f"{field}.is.null" for field in fields))
+                .limit(1)
+                .execute()
+            )
+            counts[comp_type] = result.count or 0
+        return counts
+
     # ------------------------------------------------- list missing records
     def get_missing_records(
         self,
@@ -115,84 +178,160 @@ class AdminCompatService:
         if not self._verify_admin(admin_email):
             return None, "Not authorized"
 
-        try:
-            types_to_query = (
-                [component_type] if component_type != "all"
-                else ["cpu", "motherboard", "ram"]
-            )
+        cache_key = ("records", component_type, page, page_size)
+        with _missing_cache_lock:
+            cached = _missing_cache.get(cache_key)
+        if cached is not None:
+            return cached, None
 
-            all_records: List[Dict[str, Any]] = []
-
-            for ctype in types_to_query:
-                fields = REQUIRED_FIELDS.get(ctype, [])
-                if not fields:
-                    continue
-
-                # For each required field, fetch records where it's null
-                for field in fields:
-                    result = (
-                        self.client.table("product_compat")
-                        .select(
-                            "id, product_id, component_type, "
-                            "cpu_socket, mobo_socket, memory_type, memory_max_speed_mhz, "
-                            "confidence, extraction_source, "
-                            "products(name, brand, category, image_url)"
-                        )
-                        .eq("component_type", ctype)
-                        .is_(field, "null")
-                        .execute()
-                    )
-                    if result.data:
-                        all_records.extend(result.data)
-
-            # Deduplicate by product_compat id
-            seen_ids = set()
-            unique_records = []
-            for rec in all_records:
-                if rec["id"] not in seen_ids:
-                    seen_ids.add(rec["id"])
-                    unique_records.append(rec)
-
-            # Enrich with product info + missing_fields
-            enriched = []
-            for rec in unique_records:
-                product_info = rec.pop("products", None) or {}
-                enriched.append({
-                    **rec,
-                    "product_name": product_info.get("name"),
-                    "product_brand": product_info.get("brand"),
-                    "product_category": product_info.get("category"),
-                    "product_image_url": product_info.get("image_url"),
-                    "missing_fields": self._get_missing_fields(rec),
-                })
-
-            # Sort: most missing fields first, then by component_type
-            type_order = {"cpu": 0, "motherboard": 1, "ram": 2}
-            enriched.sort(
-                key=lambda r: (
-                    -len(r["missing_fields"]),
-                    type_order.get(r["component_type"], 9),
+        try:
+            page_data = None
+            if self.missing_records_view_available:
+                page_data = self._get_missing_records_from_view(
+                    component_type, page, page_size
                 )
-            )
-
-            total = len(enriched)
-
-            # Paginate
-            start = (page - 1) * page_size
-            end = start + page_size
-            page_records = enriched[start:end]
+            if page_data is None:
+                page_data = self._get_missing_records_scanned(
+                    component_type, page, page_size
+                )
+            page_records, total = page_data
 
-            return {
+            page_result = {
                 "records": page_records,
                 "total": total,
                 "page": page,
                 "page_size": page_size,
-            }, None
+            }
+            with _missing_cache_lock:
+                _missing_cache[cache_key] = page_result
+            return page_result, None
 
         except Exception as e:
             logger.error(f"Error fetching missing compat records: {e}")
             return None, f"Failed to fetch records: {str(e)}"
 
+    def _get_missing_records_from_view(
+        self,
+        component_type: str,
+        page: int,
+        page_size: int,
+    ) -> Optional[Tuple[List[Dict[str, Any]], int]]:
+        """
+        Fetch one page of records from the admin_missing_compat view.
+
+        The database dedupes, sorts (most missing fields first, then by
+        component_type), paginates and counts.
+
+        Returns:
+            (records, total), or None if the view is not installed
+        """
+        def build_query():
+            query = self.client.table("admin_missing_compat").select(
+                MISSING_RECORD_COLUMNS, count="exact"
+            )
+            if component_type != "all":
+                query = query.eq("component_type", component_type)
+            return query
+
+        start = (page - 1) * page_size
+        try:
+            result = (
+                build_query()
+                .order("missing_count", desc=True)
+                .order("component_type")
+                .order("id")
+                .range(start, start + page_size - 1)
+                .execute()
+            )
+        except Exception as e:
+            code = getattr(e, "code", None)
+            if code == "PGRST103":
+                # Page past the end: PostgREST refuses the range, so fetch
+                # just the total
+                result = build_query().limit(1).execute()
+                return [], result.count or 0
+            # PGRST205 / 42P01: PostgREST could not find the view
+            if code not in ("PGRST205", "42P01"):
+                raise
+            logger.warning("admin_missing_compat view is missing; scanning records")
+            self.missing_records_view_available = False
+            return None
+
+        return result.data or [], result.count or 0
+
+    def _get_missing_records_scanned(
+        self,
+        component_type: str,
+        page: int,
+        page_size: int,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Fetch every record missing a required field with one query, then
+        sort and paginate them in Python.
+
+        Returns:
+            (records, total)
+        """
+        types_to_query = (
+            [component_type] if component_type != "all"
+            else ["cpu", "motherboard", "ram"]
+        )
+
+        # One query for every type: per type, any required field is null
+        missing_filters = [
+            f"and(component_type.eq.{ctype},"
+            f"or({','.join(f'{field}.is.null' for field in REQUIRED_FIELDS[ctype])}))"
+            for ctype in types_to_query
+            if REQUIRED_FIELDS.get(ctype)
+        ]
+        if not missing_filters:
+            return [], 0
+
+        result = (
+            self.client.table("product_compat")
+            .select(
+                "id, product_id, component_type, "
+                "cpu_socket, mobo_socket, memory_type, memory_max_speed_mhz, "
+                "confidence, extraction_source, "
+                "products(name, brand, category, image_url)"
+            )
+            .or_(",".join(missing_filters))
+            .execute()
+        )
+        # Each record matches once, so there is nothing to dedupe
+        records = result.data or []
+
+        # Enrich with product info + missing_fields
+        enriched = []
+        for rec in records:
+            product_info = rec.pop("products", None) or {}
+            enriched.append({
+                **rec,
+                "product_name": product_info.get("name"),
+                "product_brand": product_info.get("brand"),
+                "product_category": product_info.get("category"),
+                "product_image_url": product_info.get("image_url"),
+                "missing_fields": self._get_missing_fields(rec),
+            })
+
+        # Sort: most missing fields first, then by component_type
+        type_order = {"cpu": 0, "motherboard": 1, "ram": 2}
+        enriched.sort(
+            key=lambda r: (
+                -len(r["missing_fields"]),
+                type_order.get(r["component_type"], 9),
+            )
+        )
+
+        total = len(enriched)
+
+        # Paginate
+        start = (page - 1) * page_size
+        end = start + page_size
+        page_records = enriched[start:end]
+
+        return page_records, total
+
     # ------------------------------------------------- update compat record
     def update_compat(
         self,
@@ -227,13 +366,14 @@ class AdminCompatService:
 
             record = result.data
             comp_type = record.get("component_type")
-            allowed = EDITABLE_FIELDS.get(comp_type, set())
+            allowed = EDITABLE_FIELDS.get(comp_type, frozenset())
 
             # Build update payload — only allowed fields
-            update_payload: Dict[str, Any] = {}
-            for field in allowed:
-                if field in data and data[field] is not None:
-                    update_payload[field] = data[field]
+            update_payload: Dict[str, Any] = {
+                field: data[field]
+                for field in allowed & data.keys()
+                if data[field] is not None
+            }
 
             if not update_payload:
                 return None, "No valid fields to update"
@@ -250,6 +390,8 @@ class AdminCompatService:
             )
 
             if updated.data:
+                invalidate_compat_cache()
+                invalidate_missing_cache()
                 logger.info(
                     f"Admin updated compat for product {product_id}: "
                     f"fields={list(update_payload.keys())}"
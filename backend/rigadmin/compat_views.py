@@ -5,22 +5,32 @@ Thin controllers for viewing and fixing missing compatibility data.
 
 SECURITY NOTE:
     All admin endpoints require a valid Clerk JWT token in the Authorization header.
-    User email is extracted from the verified token, not from request body/params.
+    User email is extracted from the verified token, not from request body/params,
+    by ClerkAuthentication and read from request.user.
 """
 
 from rest_framework import status
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
+from products.renderers import OrjsonRenderer
 from rigadmin.compat_service import admin_compat_service
-from rigadmin.clerk_auth import get_verified_user_email
-from rigadmin.compat_serializers import (
-    MissingCompatRecordSerializer,
-    MissingCompatCountSerializer,
-)
+from rigadmin.clerk_auth import ClerkAuthentication
+from rigadmin.compat_serializers import MissingCompatCountSerializer
 
 
-class MissingCompatCountView(APIView):
+class CompatAdminView(APIView):
+    """
+    Base view for the compat admin API: authenticated with Clerk JWTs,
+    JSON encoded with orjson (record pages are up to 100 joined rows).
+    """
+
+    authentication_classes = [ClerkAuthentication]
+    renderer_classes = [OrjsonRenderer, BrowsableAPIRenderer]
+
+
+class MissingCompatCountView(CompatAdminView):
     """
     GET /api/admin/compat/missing/count/
     
@@ -30,7 +40,7 @@ class MissingCompatCountView(APIView):
     """
 
     def get(self, request):
-        admin_email = get_verified_user_email(request)
+        admin_email = getattr(request.user, "email", None)
         if not admin_email:
             return Response(
                 {"error": "Authentication required"},
@@ -50,7 +60,7 @@ class MissingCompatCountView(APIView):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class MissingCompatListView(APIView):
+class MissingCompatListView(CompatAdminView):
     """
     GET /api/admin/compat/missing/?component_type=cpu&page=1&page_size=20
     
@@ -60,7 +70,7 @@ class MissingCompatListView(APIView):
     """
 
     def get(self, request):
-        admin_email = get_verified_user_email(request)
+        admin_email = getattr(request.user, "email", None)
         if not admin_email:
             return Response(
                 {"error": "Authentication required"},
@@ -93,14 +103,12 @@ class MissingCompatListView(APIView):
             )
             return Response({"error": error}, status=http_status)
 
-        # Serialize each record
-        records_serializer = MissingCompatRecordSerializer(
-            result["records"], many=True
-        )
-
+        # Records come from the service already in
+        # MissingCompatRecordSerializer's shape (plain JSON values), so they
+        # are returned as-is instead of going through the serializer
         return Response(
             {
-                "records": records_serializer.data,
+                "records": result["records"],
                 "total": result["total"],
                 "page": result["page"],
                 "page_size": result["page_size"],
@@ -109,7 +117,7 @@ class MissingCompatListView(APIView):
         )
 
 
-class CompatUpdateView(APIView):
+class CompatUpdateView(CompatAdminView):
     """
     PATCH /api/admin/compat/<product_id>/
     
@@ -119,7 +127,7 @@ class CompatUpdateView(APIView):
     """
 
     def patch(self, request, product_id):
-        admin_email = get_verified_user_email(request)
+        admin_email = getattr(request.user, "email", None)
         if not admin_email:
             return Response(
                 {"error": "Authentication required"},
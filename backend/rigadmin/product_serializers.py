@@ -6,31 +6,42 @@ Handles validation for product creation, update, and price management.
 
 from rest_framework import serializers
 
+from products.serializers import FastURLField
+
 
 # ==================== Input Serializers ====================
 
-class AdminProductCreateSerializer(serializers.Serializer):
-    """Input validation for creating a product via admin."""
-    admin_email = serializers.EmailField(required=True)
+class AdminProductBulkItemSerializer(serializers.Serializer):
+    """Input validation for one product to create (as an item of a bulk create)."""
     name = serializers.CharField(required=True, max_length=500)
     category = serializers.CharField(required=True, max_length=100)
     brand = serializers.CharField(required=False, max_length=100, allow_blank=True, allow_null=True)
-    image_url = serializers.URLField(required=False, allow_blank=True, allow_null=True)
+    image_url = FastURLField(required=False, allow_blank=True, allow_null=True)
     specs = serializers.JSONField(required=False, default=dict)
     # Price entry (at least one retailer price)
     retailer_id = serializers.UUIDField(required=True, help_text="Retailer UUID")
     price = serializers.FloatField(required=True, min_value=0)
-    product_url = serializers.URLField(required=True, help_text="Product URL at retailer")
+    product_url = FastURLField(required=True, help_text="Product URL at retailer")
     in_stock = serializers.BooleanField(required=False, default=True)
 
 
+class AdminProductCreateSerializer(AdminProductBulkItemSerializer):
+    """Input validation for creating a product via admin."""
+    admin_email = serializers.EmailField(required=True)
+
+
+class AdminProductBulkCreateSerializer(serializers.Serializer):
+    """Input validation for creating many products at once via admin."""
+    products = AdminProductBulkItemSerializer(many=True, allow_empty=False, max_length=1000)
+
+
 class AdminProductUpdateSerializer(serializers.Serializer):
     """Input validation for updating a product field via admin."""
     admin_email = serializers.EmailField(required=True)
     # All fields optional — only included fields get updated
     name = serializers.CharField(required=False, max_length=500)
     brand = serializers.CharField(required=False, max_length=100, allow_blank=True, allow_null=True)
-    image_url = serializers.URLField(required=False, allow_blank=True, allow_null=True)
+    image_url = FastURLField(required=False, allow_blank=True, allow_null=True)
     category = serializers.CharField(required=False, max_length=100)
 
 
@@ -45,7 +56,20 @@ class AdminPriceUpdateSerializer(serializers.Serializer):
     admin_email = serializers.EmailField(required=True)
     price = serializers.FloatField(required=False, min_value=0)
     in_stock = serializers.BooleanField(required=False)
-    product_url = serializers.URLField(required=False)
+    product_url = FastURLField(required=False)
+
+
+class AdminPriceBulkUpdateItemSerializer(serializers.Serializer):
+    """One price entry of a bulk price update; omitted fields are unchanged."""
+    price_id = serializers.UUIDField(required=True)
+    price = serializers.FloatField(required=False, min_value=0)
+    in_stock = serializers.BooleanField(required=False)
+    product_url = FastURLField(required=False)
+
+
+class AdminPriceBulkUpdateSerializer(serializers.Serializer):
+    """Input validation for updating many retailer prices of a product via admin."""
+    prices = AdminPriceBulkUpdateItemSerializer(many=True, allow_empty=False, max_length=1000)
 
 
 class AdminPriceCreateSerializer(serializers.Serializer):
@@ -53,7 +77,7 @@ class AdminPriceCreateSerializer(serializers.Serializer):
     admin_email = serializers.EmailField(required=True)
     retailer_id = serializers.UUIDField(required=True)
     price = serializers.FloatField(required=True, min_value=0)
-    product_url = serializers.URLField(required=True)
+    product_url = FastURLField(required=True)
     in_stock = serializers.BooleanField(required=False, default=True)
 
 
@@ -75,3 +99,18 @@ class AdminProductOutputSerializer(serializers.Serializer):
     image_url = serializers.URLField(read_only=True, allow_null=True)
     created_at = serializers.DateTimeField(read_only=True)
     updated_at = serializers.DateTimeField(read_only=True)
+
+
+# AdminProductOutputSerializer's fields, in order
+ADMIN_PRODUCT_OUTPUT_FIELDS = tuple(AdminProductOutputSerializer._declared_fields)
+
+
+def serialize_admin_product(product: dict) -> dict:
+    """
+    Render a product row in AdminProductOutputSerializer's output shape.
+
+    Rows come from Supabase with every field already JSON-ready (UUIDs and
+    timestamps as strings), so they are projected directly instead of
+    running each value through a DRF Field.
+    """
+    return {field: product.get(field) for field in ADMIN_PRODUCT_OUTPUT_FIELDS}
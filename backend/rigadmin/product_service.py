@@ -10,11 +10,15 @@ Handles business logic for admin product CRUD operations:
 """
 
 import logging
-from typing import Optional, Dict, Any, Tuple
-
-from slugify import slugify
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Tuple
 
 from rigadmin.repositories.supabase import admin_repository
+from products.services import (
+    invalidate_product_cache,
+    slugify_category,
+    slugify_product_name,
+)
 from products.repositories.supabase import (
     product_repository,
     retailer_repository,
@@ -26,11 +30,30 @@ from products.repositories.exceptions import (
     ProductCreationError,
     ProductUpdateError,
     ProductNotFoundError,
+    RetailerNotFoundError,
 )
 from users.repositories.exceptions import RepositoryError
 
 logger = logging.getLogger(__name__)
 
+# Runs the independent lookups of product creation (retailer, slug and
+# product URL checks) alongside each other
+_lookup_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="admin-lookup")
+
+# Items bulk_create_products writes per transaction
+BULK_CREATE_CHUNK_SIZE = 500
+
+
+def _strip_or_none(value: Optional[str]) -> Optional[str]:
+    """Strip an optional text field; blank or missing values become None."""
+    return (value.strip() or None) if value else None
+
+
+def _is_missing_product_error(error: ProductRepositoryError) -> bool:
+    """Whether a write failed because the product it references is gone."""
+    # 23503: foreign_key_violation
+    return getattr(error.original_error, "code", None) == "23503"
+
 
 class AdminProductService:
     """
@@ -58,8 +81,7 @@ class AdminProductService:
     def _verify_admin(self, email: str) -> bool:
         """Check if the email belongs to an admin."""
         try:
-            admin = self.admin_repo.get_by_email(email)
-            return admin is not None
+            return self.admin_repo.is_admin_email(email)
         except RepositoryError:
             return False
 
@@ -79,91 +101,39 @@ class AdminProductService:
         if not self._verify_admin(data["admin_email"]):
             return None, "Not authorized"
 
-        try:
-            # Validate retailer exists
-            retailer = self.retailer_repo.get_by_id(str(data["retailer_id"]))
-            if not retailer:
-                return None, "Retailer not found"
+        product_data, price_data, specs = self._build_create_rows(data)
 
-            # Build product data
-            name = data["name"].strip()
-            category = data["category"].strip()
-            product_data = {
-                "name": name,
-                "slug": slugify(name, lowercase=True, max_length=200),
-                "category": category,
-                "category_slug": slugify(category, lowercase=True),
-                "brand": (data.get("brand") or "").strip() or None,
-                "image_url": data.get("image_url") or None,
-            }
-
-            # Check if a product with the same slug already exists
-            existing = self.product_repo.get_by_slug(product_data["slug"])
-
-            if existing:
-                # Product exists — check if THIS retailer already has a price entry
-                existing_prices = self.price_repo.get_by_product_id(existing["id"])
-                retailer_id_str = str(data["retailer_id"])
-                already_has_retailer = any(
-                    p.get("retailer_id") == retailer_id_str for p in existing_prices
+        try:
+            # One round trip and one transaction when the RPC is installed
+            result = None
+            if getattr(self.product_repo, "admin_create_rpc_available", False):
+                result = self.product_repo.create_with_price_atomic(
+                    product_data, price_data, specs
                 )
+            if result is None:
+                result = self._create_product_stepwise(product_data, price_data, specs)
 
-                if already_has_retailer:
-                    return None, (
-                        f"This product already exists with a price from the same retailer "
-                        f"(slug: {product_data['slug']})"
-                    )
+            status = result["status"]
+            if status == "retailer_not_found":
+                return None, "Retailer not found"
+            if status == "duplicate_retailer":
+                return None, (
+                    f"This product already exists with a price from the same retailer "
+                    f"(slug: {product_data['slug']})"
+                )
 
-                # Add a new retailer price to the existing product
-                price_data = {
-                    "product_id": existing["id"],
-                    "retailer_id": retailer_id_str,
-                    "price": float(data["price"]),
-                    "currency": "BDT",
-                    "product_url": data["product_url"],
-                    "in_stock": data.get("in_stock", True),
-                }
-                self.price_repo.create(price_data)
-
-                # Update specs if provided (merge with existing)
-                specs = data.get("specs")
-                if specs and isinstance(specs, dict) and len(specs) > 0:
-                    self.specs_repo.upsert(
-                        product_id=existing["id"],
-                        specs=specs,
-                    )
+            # Invalidate caches
+            self.product_repo.invalidate_listing_caches()
+            invalidate_product_cache()
 
+            product = result["product"]
+            if status == "added_to_existing":
                 logger.info(
                     f"Admin added retailer price to existing product: "
-                    f"{existing['name']} (id={existing['id']}, retailer={retailer['name']})"
+                    f"{product['name']} (id={product['id']}, retailer={price_data['retailer_id']})"
                 )
-                existing["_added_to_existing"] = True
-                return existing, None
-
-            # Brand-new product — create it
-            product = self.product_repo.create(product_data)
-
-            # Create initial price entry
-            price_data = {
-                "product_id": product["id"],
-                "retailer_id": str(data["retailer_id"]),
-                "price": float(data["price"]),
-                "currency": "BDT",
-                "product_url": data["product_url"],
-                "in_stock": data.get("in_stock", True),
-            }
-            self.price_repo.create(price_data)
-
-            # Save specs if provided
-            specs = data.get("specs")
-            if specs and isinstance(specs, dict) and len(specs) > 0:
-                self.specs_repo.upsert(
-                    product_id=product["id"],
-                    specs=specs,
-                )
-
-            # Invalidate caches
-            self.product_repo.invalidate_category_counts_cache()
+                product["_added_to_existing"] = True
+                return product, None
 
             logger.info(f"Admin created product: {product['name']} (id={product['id']})")
             return product, None
@@ -172,6 +142,230 @@ class AdminProductService:
             logger.error(f"Failed to create product: {e}")
             return None, f"Failed to create product: {e.message}"
 
+    @staticmethod
+    def _build_create_rows(
+        data: Dict[str, Any],
+    ) -> Tuple[Dict[str, Any], Dict[str, Any], Optional[dict]]:
+        """
+        Build the product, price and specs rows for a new product.
+
+        Returns:
+            (product_data, price_data, specs); price_data has no product_id
+            yet and specs is None when none were given
+        """
+        name = data["name"].strip()
+        category = data["category"].strip()
+        product_data = {
+            "name": name,
+            "slug": slugify_product_name(name),
+            "category": category,
+            "category_slug": slugify_category(category),
+            "brand": _strip_or_none(data.get("brand")),
+            "image_url": data.get("image_url") or None,
+        }
+        # Initial price entry (product_id is filled in once it is known)
+        price_data = {
+            "retailer_id": str(data["retailer_id"]),
+            "price": float(data["price"]),
+            "currency": "BDT",
+            "product_url": data["product_url"],
+            "in_stock": data.get("in_stock", True),
+        }
+        specs = data.get("specs")
+        if not (specs and isinstance(specs, dict)):
+            specs = None
+        return product_data, price_data, specs
+
+    def _create_product_stepwise(
+        self,
+        product_data: Dict[str, Any],
+        price_data: Dict[str, Any],
+        specs: Optional[dict],
+    ) -> Dict[str, Any]:
+        """
+        create_product without the admin_create_product RPC: one repository
+        call per check and write, not in a transaction.
+
+        Returns:
+            {"status", "product"} in the same shape as the RPC
+        """
+        # The retailer and slug lookups are independent, so they run at the
+        # same time
+        retailer_future = _lookup_pool.submit(
+            self.retailer_repo.get_by_id, price_data["retailer_id"]
+        )
+
+        # Check if a product with the same slug already exists
+        existing = self.product_repo.get_by_slug(product_data["slug"])
+
+        # Validate retailer exists
+        if not retailer_future.result():
+            return {"status": "retailer_not_found"}
+
+        if existing:
+            # Product exists — check if THIS retailer already has a price entry
+            existing_prices = self.price_repo.get_by_product_id(
+                existing["id"], columns="retailer_id"
+            )
+            if any(p.get("retailer_id") == price_data["retailer_id"] for p in existing_prices):
+                return {"status": "duplicate_retailer"}
+
+            # Add a new retailer price to the existing product
+            product, status = existing, "added_to_existing"
+        else:
+            # Brand-new product — create it
+            product, status = self.product_repo.create(product_data), "created"
+
+        self.price_repo.create({**price_data, "product_id": product["id"]})
+
+        # Save specs if provided (replacing any existing specs)
+        if specs:
+            self.specs_repo.upsert(product_id=product["id"], specs=specs)
+
+        return {"status": status, "product": product}
+
+    def bulk_create_products(
+        self, admin_email: str, items: List[Dict[str, Any]]
+    ) -> Tuple[Optional[dict], Optional[str]]:
+        """
+        Create many new products, each with an initial retailer price.
+
+        Retailers, slug and product URL collisions are checked with one
+        query each, then the accepted items are written in chunks of
+        BULK_CREATE_CHUNK_SIZE, each in one transaction (one
+        admin_bulk_create_products call). Unlike create_product, an item
+        whose slug already exists is rejected rather than added to that
+        product. If a chunk fails, the chunks already written are deleted
+        again, so a failed call leaves no products behind.
+
+        Args:
+            admin_email: Verified admin email
+            items: Validated items with the create_product fields
+
+        Returns:
+            ({created, failed}, None) where failed lists {index, error} per
+            rejected item, or (None, error_message) on failure.
+        """
+        if not self._verify_admin(admin_email):
+            return None, "Not authorized"
+
+        rows = [self._build_create_rows(item) for item in items]
+        failed = []
+
+        try:
+            # The slug and URL lookups are independent, so they run at the
+            # same time as the retailer lookup
+            slugs_future = _lookup_pool.submit(
+                self.product_repo.get_by_slugs,
+                list({product_data["slug"] for product_data, _, _ in rows}),
+            )
+            urls_future = _lookup_pool.submit(
+                self.price_repo.get_by_product_urls,
+                list({price_data["product_url"] for _, price_data, _ in rows}),
+            )
+            retailer_ids = {r["id"] for r in self.retailer_repo.get_all(active_only=False)}
+            existing_slugs = {p["slug"] for p in slugs_future.result()}
+            existing_urls = {p["product_url"] for p in urls_future.result()}
+        except ProductRepositoryError as e:
+            logger.error(f"Failed to check {len(items)} products for bulk create: {e}")
+            return None, f"Failed to create products: {e.message}"
+
+        # (product_data, price_data, specs) of the items to create
+        new_rows = []
+        new_slugs = set()
+        new_urls = set()
+        for index, (product_data, price_data, specs) in enumerate(rows):
+            slug = product_data["slug"]
+            product_url = price_data["product_url"]
+            if price_data["retailer_id"] not in retailer_ids:
+                failed.append({"index": index, "error": "Retailer not found"})
+            elif slug in existing_slugs or slug in new_slugs:
+                failed.append({
+                    "index": index,
+                    "error": f"A product with this slug already exists (slug: {slug})",
+                })
+            elif product_url in existing_urls or product_url in new_urls:
+                failed.append({
+                    "index": index,
+                    "error": "A listing with this product URL already exists",
+                })
+            else:
+                new_slugs.add(slug)
+                new_urls.add(product_url)
+                new_rows.append((product_data, price_data, specs))
+
+        if not new_rows:
+            return {"created": [], "failed": failed}, None
+
+        created = []
+        try:
+            for i in range(0, len(new_rows), BULK_CREATE_CHUNK_SIZE):
+                chunk = new_rows[i:i + BULK_CREATE_CHUNK_SIZE]
+                products = None
+                if self.product_repo.admin_bulk_create_rpc_available:
+                    products = self.product_repo.create_many_atomic([
+                        {"product": product_data, "price": price_data, "specs": specs}
+                        for product_data, price_data, specs in chunk
+                    ])
+                if products is None:
+                    products = self._bulk_create_chunk_stepwise(chunk)
+                created.extend(products)
+        except ProductRepositoryError as e:
+            logger.error(f"Failed to bulk create {len(new_rows)} products: {e}")
+            self._undo_bulk_create(created)
+            return None, f"Failed to create products: {e.message}"
+        finally:
+            self.product_repo.invalidate_listing_caches()
+            invalidate_product_cache()
+
+        logger.info(
+            f"Admin bulk-created {len(created)} products ({len(failed)} rejected)"
+        )
+        return {"created": created, "failed": failed}, None
+
+    def _bulk_create_chunk_stepwise(
+        self, chunk: List[Tuple[Dict[str, Any], Dict[str, Any], Optional[dict]]]
+    ) -> List[dict]:
+        """
+        One chunk of bulk_create_products without the RPC: one multi-row
+        insert per table. Products whose prices fail to insert are deleted
+        again (specs and prices cascade).
+
+        Returns:
+            The created product records
+        """
+        products = self.product_repo.create_many(
+            [product_data for product_data, _, _ in chunk]
+        )
+        product_ids = {p["slug"]: p["id"] for p in products}
+        try:
+            self.price_repo.create_many([
+                {**price_data, "product_id": product_ids[product_data["slug"]]}
+                for product_data, price_data, _ in chunk
+            ])
+            specs_rows = [
+                {"product_id": product_ids[product_data["slug"]], "specs": specs}
+                for product_data, _, specs in chunk
+                if specs
+            ]
+            if specs_rows:
+                self.specs_repo.upsert_many(specs_rows)
+        except ProductRepositoryError:
+            self._undo_bulk_create(products)
+            raise
+        return products
+
+    def _undo_bulk_create(self, products: List[dict]) -> None:
+        """Delete products written by a bulk create that then failed."""
+        if not products:
+            return
+        try:
+            self.product_repo.delete_many([p["id"] for p in products])
+        except ProductRepositoryError as e:
+            logger.error(
+                f"Failed to remove {len(products)} products of a failed bulk create: {e}"
+            )
+
     # ----------------------------------------------------------- update product
     def update_product(
         self, product_id: str, data: Dict[str, Any]
@@ -185,19 +379,15 @@ class AdminProductService:
             return None, "Not authorized"
 
         try:
-            product = self.product_repo.get_by_id(product_id)
-            if not product:
-                return None, "Product not found"
-
             update_fields: Dict[str, Any] = {}
 
             if "name" in data:
                 name = data["name"].strip()
                 update_fields["name"] = name
-                update_fields["slug"] = slugify(name, lowercase=True, max_length=200)
+                update_fields["slug"] = slugify_product_name(name)
 
             if "brand" in data:
-                update_fields["brand"] = (data["brand"] or "").strip() or None
+                update_fields["brand"] = _strip_or_none(data["brand"])
 
             if "image_url" in data:
                 update_fields["image_url"] = data["image_url"] or None
@@ -205,16 +395,22 @@ class AdminProductService:
             if "category" in data:
                 category = data["category"].strip()
                 update_fields["category"] = category
-                update_fields["category_slug"] = slugify(category, lowercase=True)
+                update_fields["category_slug"] = slugify_category(category)
 
             if not update_fields:
-                return product, None  # nothing to update
+                # Nothing to update
+                product = self.product_repo.get_by_id(product_id)
+                if not product:
+                    return None, "Product not found"
+                return product, None
 
+            # The update returns no row if the product does not exist
             updated = self.product_repo.update(product_id, update_fields)
             if not updated:
-                return None, "Failed to update product"
+                return None, "Product not found"
 
-            self.product_repo.invalidate_category_counts_cache()
+            self.product_repo.invalidate_listing_caches()
+            invalidate_product_cache()
 
             logger.info(f"Admin updated product {product_id}: fields={list(update_fields.keys())}")
             return updated, None
@@ -232,18 +428,17 @@ class AdminProductService:
             return None, "Not authorized"
 
         try:
-            product = self.product_repo.get_by_id(product_id)
-            if not product:
-                return None, "Product not found"
-
             specs_record = self.specs_repo.upsert(
                 product_id=product_id,
                 specs=data["specs"],
             )
+            invalidate_product_cache()
             logger.info(f"Admin updated specs for product {product_id}")
             return specs_record, None
 
         except ProductRepositoryError as e:
+            if _is_missing_product_error(e):
+                return None, "Product not found"
             logger.error(f"Failed to update specs for {product_id}: {e}")
             return None, f"Failed to update specs: {e.message}"
 
@@ -256,14 +451,8 @@ class AdminProductService:
             return None, "Not authorized"
 
         try:
-            product = self.product_repo.get_by_id(product_id)
-            if not product:
-                return None, "Product not found"
-
-            retailer = self.retailer_repo.get_by_id(str(data["retailer_id"]))
-            if not retailer:
-                return None, "Retailer not found"
-
+            # The product and retailer are not looked up first: the insert's
+            # foreign keys reject either one if it is missing
             price_data = {
                 "product_id": product_id,
                 "retailer_id": str(data["retailer_id"]),
@@ -273,9 +462,17 @@ class AdminProductService:
                 "in_stock": data.get("in_stock", True),
             }
             price = self.price_repo.create(price_data)
-            logger.info(f"Admin added price for product {product_id}, retailer {retailer['name']}")
+            self.product_repo.invalidate_listing_caches()
+            invalidate_product_cache()
+            logger.info(
+                f"Admin added price for product {product_id}, retailer {price_data['retailer_id']}"
+            )
             return price, None
 
+        except RetailerNotFoundError:
+            return None, "Retailer not found"
+        except ProductNotFoundError:
+            return None, "Product not found"
         except ProductRepositoryError as e:
             logger.error(f"Failed to add price for {product_id}: {e}")
             return None, f"Failed to add price: {e.message}"
@@ -303,6 +500,7 @@ class AdminProductService:
             if not updated:
                 return None, "Price entry not found"
 
+            invalidate_product_cache()
             logger.info(f"Admin updated price {price_id} for product {product_id}")
             return updated, None
 
@@ -310,6 +508,75 @@ class AdminProductService:
             logger.error(f"Failed to update price {price_id}: {e}")
             return None, f"Failed to update price: {e.message}"
 
+    def bulk_update_prices(
+        self, product_id: str, admin_email: str, rows: List[Dict[str, Any]]
+    ) -> Tuple[Optional[dict], Optional[str]]:
+        """
+        Update many retailer price entries of a product at once.
+
+        Uses one admin_bulk_update_prices RPC call when it is installed,
+        otherwise one update per row.
+
+        Args:
+            product_id: Product UUID the price entries belong to
+            admin_email: Verified admin email
+            rows: Validated rows with price_id and any of price, in_stock,
+                  product_url
+
+        Returns:
+            ({updated, not_found}, None) where not_found lists the price
+            IDs that matched no entry of this product, or
+            (None, error_message) on failure.
+        """
+        if not self._verify_admin(admin_email):
+            return None, "Not authorized"
+
+        updates = []
+        for row in rows:
+            update_fields: Dict[str, Any] = {"price_id": str(row["price_id"])}
+            if "price" in row:
+                update_fields["price"] = float(row["price"])
+            if "in_stock" in row:
+                update_fields["in_stock"] = row["in_stock"]
+            if "product_url" in row:
+                update_fields["product_url"] = row["product_url"]
+            if len(update_fields) == 1:
+                return None, f"No fields to update for price {update_fields['price_id']}"
+            updates.append(update_fields)
+
+        price_ids = [u["price_id"] for u in updates]
+        if len(set(price_ids)) != len(price_ids):
+            return None, "Each price_id may only appear once"
+
+        try:
+            updated = None
+            if getattr(self.price_repo, "bulk_update_rpc_available", False):
+                updated = self.price_repo.update_many(str(product_id), updates)
+            if updated is None:
+                updated = []
+                for u in updates:
+                    price = self.price_repo.update(
+                        u["price_id"],
+                        {k: v for k, v in u.items() if k != "price_id"},
+                        product_id=str(product_id),
+                    )
+                    if price:
+                        updated.append(price)
+
+            updated_ids = {p["id"] for p in updated}
+            not_found = [price_id for price_id in price_ids if price_id not in updated_ids]
+
+            if updated:
+                # Listing counts filtered by price range depend on prices
+                self.product_repo.invalidate_listing_caches()
+                invalidate_product_cache()
+            logger.info(f"Admin updated {len(updated)} prices for product {product_id}")
+            return {"updated": updated, "not_found": not_found}, None
+
+        except ProductRepositoryError as e:
+            logger.error(f"Failed to bulk update prices for {product_id}: {e}")
+            return None, f"Failed to update prices: {e.message}"
+
     # ----------------------------------------------------------- delete
     def delete_product(
         self, product_id: str, admin_email: str
@@ -319,22 +586,13 @@ class AdminProductService:
             return False, "Not authorized"
 
         try:
-            product = self.product_repo.get_by_id(product_id)
+            # Prices, specs and compat rows cascade via their foreign keys
+            product = self.product_repo.delete(product_id)
             if not product:
                 return False, "Product not found"
 
-            # Delete specs first (cascade may or may not handle it)
-            try:
-                self.specs_repo.delete_by_product_id(product_id)
-            except Exception:
-                pass  # specs might not exist
-
-            # Delete the product (prices cascade via FK)
-            from core.infrastructure.supabase.client import get_supabase_client
-            client = get_supabase_client()
-            client.table("products").delete().eq("id", product_id).execute()
-
-            self.product_repo.invalidate_category_counts_cache()
+            self.product_repo.invalidate_listing_caches()
+            invalidate_product_cache()
 
             logger.info(f"Admin deleted product {product_id} ({product['name']})")
             return True, None
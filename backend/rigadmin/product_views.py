@@ -15,7 +15,9 @@ from rest_framework.response import Response
 from rigadmin.product_service import admin_product_service
 from rigadmin.clerk_auth import get_verified_user_email
 from rigadmin.product_serializers import (
-    AdminProductOutputSerializer,
+    AdminPriceBulkUpdateSerializer,
+    AdminProductBulkCreateSerializer,
+    serialize_admin_product,
 )
 
 
@@ -64,13 +66,53 @@ class AdminProductCreateView(APIView):
             return Response({"error": error}, status=http_status)
 
         added_to_existing = product.pop("_added_to_existing", False)
-        output = AdminProductOutputSerializer(product)
-        response_data = output.data
+        response_data = serialize_admin_product(product)
         if added_to_existing:
             response_data["added_to_existing"] = True
         return Response(response_data, status=status.HTTP_201_CREATED)
 
 
+class AdminProductBulkCreateView(APIView):
+    """
+    POST /api/admin/products/bulk/ — Create many products at once.
+    
+    Body: {"products": [<create fields>, ...]} (up to 1000 items). Items
+    that cannot be created are listed in "failed" by their index.
+    
+    Requires: Authorization: Bearer <clerk_token>
+    """
+
+    def post(self, request):
+        admin_email = get_verified_user_email(request)
+        if not admin_email:
+            return Response(
+                {"error": "Authentication required"},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+
+        serializer = AdminProductBulkCreateSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        result, error = admin_product_service.bulk_create_products(
+            admin_email, serializer.validated_data["products"]
+        )
+        if error:
+            http_status = (
+                status.HTTP_403_FORBIDDEN if "authorized" in error.lower()
+                else status.HTTP_400_BAD_REQUEST
+            )
+            return Response({"error": error}, status=http_status)
+
+        return Response(
+            {
+                "created": [serialize_admin_product(p) for p in result["created"]],
+                "failed": result["failed"],
+            },
+            status=status.HTTP_201_CREATED if result["created"] else status.HTTP_400_BAD_REQUEST,
+        )
+
+
 class AdminProductUpdateView(APIView):
     """
     PATCH /api/admin/products/<product_id>/ — Update product fields.
@@ -93,6 +135,12 @@ class AdminProductUpdateView(APIView):
             if field in request.data:
                 update_data[field] = request.data[field]
 
+        if len(update_data) == 1:
+            return Response(
+                {"error": "No fields to update"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
         product, error = admin_product_service.update_product(product_id, update_data)
         if error:
             http_status = (
@@ -102,8 +150,7 @@ class AdminProductUpdateView(APIView):
             )
             return Response({"error": error}, status=http_status)
 
-        output = AdminProductOutputSerializer(product)
-        return Response(output.data, status=status.HTTP_200_OK)
+        return Response(serialize_admin_product(product), status=status.HTTP_200_OK)
 
     def delete(self, request, product_id):
         admin_email = get_verified_user_email(request)
@@ -202,6 +249,41 @@ class AdminProductPriceListCreateView(APIView):
         return Response(price, status=status.HTTP_201_CREATED)
 
 
+class AdminProductPriceBulkUpdateView(APIView):
+    """
+    PATCH /api/admin/products/<product_id>/prices/bulk/ — Update many price entries.
+    
+    Body: {"prices": [{"price_id", "price"?, "in_stock"?, "product_url"?}, ...]}.
+    Price IDs that match no entry of the product are listed in "not_found".
+    
+    Requires: Authorization: Bearer <clerk_token>
+    """
+
+    def patch(self, request, product_id):
+        admin_email = get_verified_user_email(request)
+        if not admin_email:
+            return Response(
+                {"error": "Authentication required"},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+
+        serializer = AdminPriceBulkUpdateSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        result, error = admin_product_service.bulk_update_prices(
+            product_id, admin_email, serializer.validated_data["prices"]
+        )
+        if error:
+            http_status = (
+                status.HTTP_403_FORBIDDEN if "authorized" in error.lower()
+                else status.HTTP_400_BAD_REQUEST
+            )
+            return Response({"error": error}, status=http_status)
+
+        return Response(result, status=status.HTTP_200_OK)
+
+
 class AdminProductPriceUpdateView(APIView):
     """
     PATCH /api/admin/products/<product_id>/prices/<price_id>/ — Update a price entry.
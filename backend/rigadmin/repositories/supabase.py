@@ -12,9 +12,12 @@ Follows clean architecture principles:
 
 import logging
 import secrets
+import threading
 from datetime import datetime, timedelta, timezone
 from typing import Optional, List
 
+from cachetools import TTLCache
+
 from users.repositories.exceptions import (
     RepositoryError,
     RecordCreationError,
@@ -23,6 +26,13 @@ from users.repositories.exceptions import (
 
 logger = logging.getLogger(__name__)
 
+# Admin status by email. Every admin API call checks it, usually for the
+# same few emails; entries are short-lived so a removal made by another
+# worker takes effect within a minute, and this worker's own admin writes
+# clear it immediately.
+_admin_status_cache = TTLCache(maxsize=256, ttl=60)
+_admin_status_cache_lock = threading.Lock()
+
 
 class AdminRepository:
     """
@@ -105,6 +115,34 @@ class AdminRepository:
                 original_error=e
             ) from e
     
+    def is_admin_email(self, email: str) -> bool:
+        """
+        Check whether an email belongs to an admin, with a short-lived cache.
+        
+        Args:
+            email: The user's email address
+            
+        Returns:
+            True if the user is an admin
+            
+        Raises:
+            RepositoryError: If the lookup fails (failures are not cached)
+        """
+        with _admin_status_cache_lock:
+            cached = _admin_status_cache.get(email)
+        if cached is not None:
+            return cached
+        
+        is_admin = self.get_by_email(email) is not None
+        with _admin_status_cache_lock:
+            _admin_status_cache[email] = is_admin
+        return is_admin
+    
+    def invalidate_admin_status_cache(self) -> None:
+        """Drop cached admin statuses (called after admins are added or removed)."""
+        with _admin_status_cache_lock:
+            _admin_status_cache.clear()
+    
     def create(self, user_id: str) -> dict:
         """
         Add a user as admin.
@@ -124,6 +162,7 @@ class AdminRepository:
             )
             if response and response.data:
                 logger.info(f"Created admin for user: {user_id}")
+                self.invalidate_admin_status_cache()
                 return response.data[0]
             raise RecordCreationError(f"Insert returned no data for user: {user_id}")
         except RecordCreationError:
@@ -156,6 +195,7 @@ class AdminRepository:
             deleted = len(response.data) > 0 if response and response.data else False
             if deleted:
                 logger.info(f"Removed admin status for user: {user_id}")
+                self.invalidate_admin_status_cache()
             return deleted
         except Exception as e:
             logger.error(f"Failed to delete admin '{user_id}': {e}")
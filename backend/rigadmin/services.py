@@ -46,8 +46,7 @@ class AdminService:
             True if user is an admin, False otherwise
         """
         try:
-            admin = self.admin_repo.get_by_email(email)
-            return admin is not None
+            return self.admin_repo.is_admin_email(email)
         except RepositoryError as e:
             logger.error(f"Error checking admin status: {e}")
             return False
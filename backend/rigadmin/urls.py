@@ -20,9 +20,11 @@ from rigadmin.views import (
 )
 from rigadmin.product_views import (
     AdminProductCreateView,
+    AdminProductBulkCreateView,
     AdminProductUpdateView,
     AdminProductSpecsView,
     AdminProductPriceListCreateView,
+    AdminProductPriceBulkUpdateView,
     AdminProductPriceUpdateView,
 )
 from rigadmin.compat_views import (
@@ -57,14 +59,16 @@ urlpatterns = [
     
     # Admin product management
     path("products/", AdminProductCreateView.as_view(), name="admin-product-create"),
+    path("products/bulk/", AdminProductBulkCreateView.as_view(), name="admin-product-bulk-create"),
     path("products/<str:product_id>/", AdminProductUpdateView.as_view(), name="admin-product-update"),
     path("products/<str:product_id>/specs/", AdminProductSpecsView.as_view(), name="admin-product-specs"),
     path("products/<str:product_id>/prices/", AdminProductPriceListCreateView.as_view(), name="admin-product-prices"),
+    path("products/<str:product_id>/prices/bulk/", AdminProductPriceBulkUpdateView.as_view(), name="admin-product-price-bulk-update"),
     path("products/<str:product_id>/prices/<str:price_id>/", AdminProductPriceUpdateView.as_view(), name="admin-product-price-update"),
     
     # Compatibility management
     path("compat/missing/count/", MissingCompatCountView.as_view(), name="compat-missing-count"),
     path("compat/missing/", MissingCompatListView.as_view(), name="compat-missing-list"),
-    path("compat/<str:product_id>/", CompatUpdateView.as_view(), name="compat-update"),
+    path("compat/<uuid:product_id>/", CompatUpdateView.as_view(), name="compat-update"),
 ]
 
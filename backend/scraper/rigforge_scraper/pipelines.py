@@ -10,6 +10,7 @@ from datetime import datetime, timezone
 
 from itemadapter import ItemAdapter
 from scrapy.exceptions import DropItem
+from twisted.internet.threads import deferToThread
 
 logger = logging.getLogger(__name__)
 
@@ -115,6 +116,8 @@ class SupabaseIngestionPipeline:
     
     def __init__(self):
         self.ingestion_service = None
+        # Retailer lookups shared across items for the lifetime of the spider
+        self.retailer_cache = {}
         self.items_saved = 0
         self.items_failed = 0
     
@@ -149,8 +152,14 @@ class SupabaseIngestionPipeline:
         )
     
     def process_item(self, item, spider):
-        """Save item to Supabase database."""
-        from itemadapter import ItemAdapter
+        """
+        Save item to Supabase database.
+        
+        The blocking ingestion call runs on the reactor's thread pool and a
+        Deferred is returned, so Scrapy keeps several items' database round
+        trips in flight instead of waiting on each one in turn. Later
+        pipelines still see the item only after it has been saved.
+        """
         adapter = ItemAdapter(item)
         
         # Convert to dict for ingestion service
@@ -167,21 +176,36 @@ class SupabaseIngestionPipeline:
             "specs_source_url": adapter.get("specs_source_url"),
         }
         
-        try:
-            result = self.ingestion_service.ingest_scraped_product(scraped_data)
-            if result:
-                self.items_saved += 1
-                logger.debug(f"Saved to DB: {scraped_data['name']}")
-                
-                # Store product_id in item for compatibility pipeline
-                adapter['_product_id'] = result['product']['id']
-            else:
-                self.items_failed += 1
-                logger.warning(f"Failed to save: {scraped_data['name']}")
-        except Exception as e:
+        d = deferToThread(
+            self.ingestion_service.ingest_scraped_product,
+            scraped_data,
+            retailer_cache=self.retailer_cache,
+        )
+        d.addCallbacks(
+            self._on_ingested,
+            self._on_ingest_error,
+            callbackArgs=(item, scraped_data["name"]),
+            errbackArgs=(item,),
+        )
+        return d
+    
+    def _on_ingested(self, result, item, name):
+        """Record the outcome of one ingestion (runs on the reactor thread)."""
+        if result:
+            self.items_saved += 1
+            logger.debug(f"Saved to DB: {name}")
+            
+            # Store product_id in item for compatibility pipeline
+            ItemAdapter(item)['_product_id'] = result['product']['id']
+        else:
             self.items_failed += 1
-            logger.error(f"Error saving to DB: {e}")
-        
+            logger.warning(f"Failed to save: {name}")
+        return item
+    
+    def _on_ingest_error(self, failure, item):
+        """Count an unexpected ingestion error without dropping the item."""
+        self.items_failed += 1
+        logger.error(f"Error saving to DB: {failure.value}")
         return item
 
 
@@ -81,6 +81,8 @@ class BaseRetailerSpider(scrapy.Spider):
         "Colorful", "Inno3D", "Palit", "Patriot", "Silicon Power",
         "Transcend", "Lexar", "PNY", "Addlink", "Netac", "Hikvision",
     ]
+    # (brand, BRAND) pairs, uppercased once instead of on every lookup
+    _known_brands_upper = tuple((brand, brand.upper()) for brand in known_brands)
     
     # Playwright configuration (override in subclass for JS-heavy sites)
     use_playwright = False
@@ -221,12 +223,12 @@ class BaseRetailerSpider(scrapy.Spider):
             return None
         
         name_upper = name.upper()
-        for brand in self.known_brands:
-            if brand.upper() in name_upper:
+        for brand, brand_upper in self._known_brands_upper:
+            if brand_upper in name_upper:
                 return brand
         
         # Fallback: use first word as brand
-        parts = name.split()
+        parts = name.split(None, 1)
         return parts[0] if parts else None
     
     def get_category(self, url_or_text: str) -> str:
@@ -55,6 +55,42 @@ def item_scraped_handler(item, response, spider):
     collected_items.append(dict(item))
 
 
+def build_settings(uses_playwright, save_to_db):
+    """
+    Build Scrapy settings for a run.
+    
+    Args:
+        uses_playwright: Whether any spider in the run needs Playwright
+        save_to_db: If True, enable the database pipelines
+    """
+    settings = get_project_settings()
+    
+    # Disable Playwright for spiders that don't need it
+    # This prevents unnecessary browser launches and saves resources
+    if not uses_playwright:
+        # Remove Playwright download handlers, use default Scrapy handlers
+        settings["DOWNLOAD_HANDLERS"] = {}
+    
+    # Enable database pipeline if --save flag is used
+    if save_to_db:
+        current_pipelines = dict(settings.get("ITEM_PIPELINES", {}))
+        current_pipelines["rigforge_scraper.pipelines.SupabaseIngestionPipeline"] = 300
+        current_pipelines["rigforge_scraper.pipelines.CompatibilityExtractionPipeline"] = 400
+        settings["ITEM_PIPELINES"] = current_pipelines
+    
+    return settings
+
+
+def build_spider_kwargs(category=None, limit=None):
+    """Build the spider arguments shared by single and multi-retailer runs."""
+    spider_kwargs = {}
+    if category:
+        spider_kwargs["category"] = category
+    if limit:
+        spider_kwargs["limit"] = limit
+    return spider_kwargs
+
+
 def run_spider(spider_name, category=None, limit=None, save_to_db=False, output=None):
     """
     Run a spider with the given options.
@@ -77,32 +113,11 @@ def run_spider(spider_name, category=None, limit=None, save_to_db=False, output=
     display_name = config.get("display_name", spider_name)
     uses_playwright = config.get("use_playwright", False)
     
-    # Get Scrapy settings
-    settings = get_project_settings()
-    
-    # Disable Playwright for spiders that don't need it
-    # This prevents unnecessary browser launches and saves resources
-    if not uses_playwright:
-        # Remove Playwright download handlers, use default Scrapy handlers
-        settings["DOWNLOAD_HANDLERS"] = {}
-    
-    # Enable database pipeline if --save flag is used
-    if save_to_db:
-        current_pipelines = dict(settings.get("ITEM_PIPELINES", {}))
-        current_pipelines["rigforge_scraper.pipelines.SupabaseIngestionPipeline"] = 300
-        current_pipelines["rigforge_scraper.pipelines.CompatibilityExtractionPipeline"] = 400
-        settings["ITEM_PIPELINES"] = current_pipelines
-
-    
     # Create crawler process
-    process = CrawlerProcess(settings)
+    process = CrawlerProcess(build_settings(uses_playwright, save_to_db))
     
     # Prepare spider arguments
-    spider_kwargs = {}
-    if category:
-        spider_kwargs["category"] = category
-    if limit:
-        spider_kwargs["limit"] = limit
+    spider_kwargs = build_spider_kwargs(category, limit)
     
     # Get the spider class dynamically from registry
     spider_cls = get_spider_class(spider_name)
@@ -158,7 +173,12 @@ def run_spider(spider_name, category=None, limit=None, save_to_db=False, output=
 
 def run_multiple_spiders(retailers_to_run, category=None, limit=None, save_to_db=False, output=None):
     """
-    Run multiple spiders sequentially.
+    Run multiple spiders concurrently in one crawler process.
+    
+    All crawlers are scheduled before the reactor starts, so retailers are
+    scraped in parallel rather than one after another (a Twisted reactor
+    cannot be restarted, so a sequential loop of CrawlerProcess runs only
+    ever completes the first spider).
     
     Args:
         retailers_to_run: Dict of retailer configs to run
@@ -170,25 +190,32 @@ def run_multiple_spiders(retailers_to_run, category=None, limit=None, save_to_db
     Returns:
         Dict mapping retailer names to their collected items
     """
-    all_results = {}
+    all_results = {slug: [] for slug in retailers_to_run}
     
     print(f"\n{'='*60}")
     print(f"Running {len(retailers_to_run)} retailers")
     print(f"{'='*60}")
     
+    uses_playwright = any(
+        config.get("use_playwright", False) for config in retailers_to_run.values()
+    )
+    process = CrawlerProcess(build_settings(uses_playwright, save_to_db))
+    spider_kwargs = build_spider_kwargs(category, limit)
+    
     for retailer_slug in retailers_to_run.keys():
         try:
-            items = run_spider(
-                spider_name=retailer_slug,
-                category=category,
-                limit=limit,
-                save_to_db=save_to_db,
-                output=None,  # We'll combine output at the end
-            )
-            all_results[retailer_slug] = items
+            crawler = process.create_crawler(get_spider_class(retailer_slug))
+            
+            def collect(item, response, spider, items=all_results[retailer_slug]):
+                items.append(dict(item))
+            
+            # weak=False keeps the per-retailer closure alive for the whole run
+            crawler.signals.connect(collect, signal=signals.item_scraped, weak=False)
+            process.crawl(crawler, **spider_kwargs)
         except Exception as e:
             print(f"\n❌ Error running {retailer_slug}: {e}")
-            all_results[retailer_slug] = []
+    
+    process.start()
     
     # Save combined output if requested
     if output: